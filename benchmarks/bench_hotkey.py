@@ -0,0 +1,77 @@
+"""Microbenchmark for HotkeyManager's global keyboard handlers.
+
+Feeds synthetic key events straight into the press/release handlers (no OS
+hook involved) and reports the handler cost per event while typing ordinary
+text, and the latency from the last hotkey key going down to
+on_press_callback being called.
+
+    python benchmarks/bench_hotkey.py [--events 200000] [--hotkey "<ctrl>+<shift>"] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pynput import keyboard
+from vocalink.hotkey import HotkeyManager
+
+TEXT = "the quick brown fox jumps over the lazy dog"
+
+def bench_typing(hotkey_str, events):
+    """Returns the mean handler cost in ns per event for keys outside the hotkey."""
+    manager = HotkeyManager(hotkey_str, lambda: None, lambda: None)
+    keys = [keyboard.KeyCode.from_char(char) for char in TEXT]
+    start = time.perf_counter_ns()
+    for i in range(events):
+        key = keys[i % len(keys)]
+        manager._on_press(key)
+        manager._on_release(key)
+    return (time.perf_counter_ns() - start) / (2 * events)
+
+def bench_activation(hotkey_str, rounds):
+    """Returns per-activation latencies in ns from the final key press to on_press_callback."""
+    fired = []
+    manager = HotkeyManager(hotkey_str, lambda: fired.append(time.perf_counter_ns()), lambda: None, debounce_ms=0)
+    keys = sorted(manager.hotkey_keys, key=str)
+    latencies = []
+    for _ in range(rounds):
+        for key in keys[:-1]:
+            manager._on_press(key)
+        start = time.perf_counter_ns()
+        manager._on_press(keys[-1])
+        latencies.append(fired[-1] - start)
+        for key in keys:
+            manager._on_release(key)
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200000, help="Number of non-hotkey press/release pairs to feed.")
+    parser.add_argument("--rounds", type=int, default=10000, help="Number of hotkey activations to time.")
+    parser.add_argument("--hotkey", default="<ctrl>+<shift>")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args()
+
+    per_event_ns = bench_typing(args.hotkey, args.events)
+    latencies = sorted(bench_activation(args.hotkey, args.rounds))
+    results = {
+        "hotkey": args.hotkey,
+        "typing_ns_per_event": per_event_ns,
+        "activation_ns_p50": statistics.median(latencies),
+        "activation_ns_p99": latencies[int(len(latencies) * 0.99) - 1],
+        "activation_ns_max": latencies[-1],
+    }
+    if args.json:
+        print(json.dumps(results, indent=4))
+        return
+    print(f"Hotkey {args.hotkey}")
+    print(f"  non-hotkey key handler: {per_event_ns:8.0f} ns/event")
+    print(f"  hotkey -> on_press_callback: p50 {results['activation_ns_p50']:.0f} ns, "
+          f"p99 {results['activation_ns_p99']:.0f} ns, max {results['activation_ns_max']:.0f} ns")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark of the text injection backends.
+
+Injects sample texts of several lengths with every backend available on this
+platform into the focused window and reports the time each injection call
+takes. Focus an empty text field (e.g. a scratch editor window) before the
+countdown ends; it will receive all the text.
+
+    python benchmarks/bench_injection.py [--lengths 5,20,80,300] [--repeats 5] [--delay 3] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from vocalink.injection import TextInjector
+
+TEXT = "the quick brown fox jumps over the lazy dog "
+
+def bench_backend(backend, length, repeats, pause):
+    """Returns the per-call injection times in ms for texts of the given length."""
+    text = (TEXT * (length // len(TEXT) + 1))[:length]
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        backend.inject(text)
+        times.append((time.perf_counter() - start) * 1000)
+        time.sleep(pause) # Let the target app catch up so runs do not queue behind each other
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", default="5,20,80,300", help="Comma-separated text lengths in characters.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=3.0, help="Seconds to focus the target window before starting.")
+    parser.add_argument("--pause", type=float, default=0.6, help="Seconds between injections.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args()
+
+    injector = TextInjector()
+    print(f"Focus a text field; starting in {args.delay:.0f} s...", file=sys.stderr, flush=True)
+    time.sleep(args.delay)
+    results = []
+    for name, backend in injector.backends.items():
+        for length in (int(n) for n in args.lengths.split(",")):
+            times = bench_backend(backend, length, args.repeats, args.pause)
+            results.append({"backend": name, "chars": length, "median_ms": statistics.median(times), "max_ms": max(times)})
+    if args.json:
+        print(json.dumps(results, indent=4))
+        return
+    print(f"{'backend':<14} {'chars':>6} {'median ms':>10} {'max ms':>8}")
+    for row in results:
+        print(f"{row['backend']:<14} {row['chars']:>6} {row['median_ms']:>10.1f} {row['max_ms']:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark of the capture resampler.
+
+Resamples synthetic audio at common device rates to 16 kHz mono in
+capture-sized chunks and reports the CPU time per second of audio and per
+chunk.
+
+    python benchmarks/bench_resample.py [--rates 44100,48000] [--channels 1,2] [--seconds 10] [--chunk-ms 64] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from vocalink.resample import StreamingResampler
+
+def bench(rate, channels, seconds, chunk_ms):
+    """Returns (ms per audio second, ms per chunk) for resampling rate Hz audio in chunks."""
+    rng = np.random.default_rng(0)
+    samples = (rng.standard_normal(int(rate * seconds) * channels) * 3000).astype(np.int16)
+    chunk = max(int(rate * chunk_ms / 1000), 1) * channels
+    chunks = [samples[i:i + chunk].tobytes() for i in range(0, len(samples), chunk)]
+    resampler = StreamingResampler(rate, channels=channels)
+    start = time.perf_counter()
+    for data in chunks:
+        resampler.process(data)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return elapsed_ms / seconds, elapsed_ms / len(chunks)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rates", default="22050,44100,48000", help="Comma-separated capture rates.")
+    parser.add_argument("--channels", default="1,2", help="Comma-separated channel counts.")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--chunk-ms", type=float, default=64.0, help="Capture chunk length (1024 frames at 16 kHz is 64 ms).")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args()
+
+    results = []
+    for rate in (int(r) for r in args.rates.split(",")):
+        for channels in (int(c) for c in args.channels.split(",")):
+            per_second, per_chunk = bench(rate, channels, args.seconds, args.chunk_ms)
+            results.append({"rate": rate, "channels": channels, "ms_per_audio_second": per_second, "ms_per_chunk": per_chunk})
+    if args.json:
+        print(json.dumps(results, indent=4))
+        return
+    print(f"{'rate':>6} {'ch':>3} {'ms/audio s':>11} {'ms/chunk':>9}")
+    for row in results:
+        print(f"{row['rate']:>6} {row['channels']:>3} {row['ms_per_audio_second']:>11.2f} {row['ms_per_chunk']:>9.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Offline benchmark of Transcriber across model sizes, decoding profiles, compute types and thread counts.
+
+Runs every combination in its own process, using only the models found in the
+local models/ directory (nothing is downloaded), over a corpus of 16 kHz mono
+WAV clips. A clip's reference transcript is read from a .txt file with the same
+name next to it and used to compute the word error rate. Without --corpus the
+built-in synthetic calibration clip is used at several lengths (no WER).
+
+For each combination it reports load time, cold latency (first decode after
+loading), warm latency, real-time factor, peak RSS and WER, and writes all
+results to a JSON file so runs can be compared across versions.
+
+    python benchmarks/bench_transcriber.py [--corpus DIR] [--models tiny,base] [--profiles fastest,balanced,accurate]
+                                          [--compute-types int8,float32] [--threads 1,4] [--repeats 3] [--output results.json]
+
+--compute-types overrides the compute type of each profile; without it the
+profile's own is used.
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import re
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from vocalink.calibration import SAMPLE_RATE, load_clip, machine_fingerprint, peak_rss_mb, reference_clip, wait_for_result
+
+SYNTHETIC_SECONDS = [2, 5, 10, 30]
+
+def load_corpus(corpus_dir):
+    """Returns [(name, audio, reference text or None)] for the WAV clips in corpus_dir, or synthetic clips."""
+    if corpus_dir is None:
+        return [(f"synthetic-{seconds}s", reference_clip(seconds), None) for seconds in SYNTHETIC_SECONDS]
+    clips = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.wav"))):
+        reference_path = os.path.splitext(path)[0] + ".txt"
+        reference = None
+        if os.path.exists(reference_path):
+            with open(reference_path, "r", encoding="utf-8") as f:
+                reference = f.read()
+        clips.append((os.path.basename(path), load_clip(path), reference))
+    if not clips:
+        raise SystemExit(f"No .wav files found in {corpus_dir}")
+    return clips
+
+def _words(text):
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+def word_error_rate(reference, hypothesis):
+    """Returns the word-level edit distance divided by the reference length."""
+    ref, hyp = _words(reference), _words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / max(len(ref), 1)
+
+def load_local_model(model_size, device, compute_type, models_dir, cpu_threads=0, num_workers=1):
+    """Loads a model from models_dir only, either models_dir/<size> or a Hugging Face cache layout."""
+    from faster_whisper import WhisperModel
+    model_path = os.path.join(models_dir, model_size)
+    if not os.path.isdir(model_path):
+        model_path = model_size # Resolved inside download_root without touching the network
+    return WhisperModel(model_path, device=device, compute_type=compute_type, cpu_threads=cpu_threads,
+                        num_workers=num_workers, download_root=models_dir, local_files_only=True)
+
+def run_config(model_size, profile, compute_type, cpu_threads, models_dir, clips, repeats):
+    """Benchmarks one combination in the current process and returns its measurements."""
+    from vocalink.models import ModelManager
+    from vocalink.profiles import get_profile
+    from vocalink.tracing import DictationTrace
+    from vocalink.transcriber import Transcriber
+
+    def loader(size, device="cpu", compute_type="int8", **load_options):
+        return load_local_model(size, device, compute_type, models_dir, **load_options)
+
+    manager = ModelManager(loader=loader)
+    load_start = time.perf_counter()
+    transcriber = Transcriber(configured_model_size=model_size, model_manager=manager, profile=profile,
+                              compute_type=compute_type, cpu_threads=cpu_threads)
+    load_seconds = time.perf_counter() - load_start
+
+    clip_results = []
+    for index, (name, audio, reference) in enumerate(clips):
+        audio_seconds = len(audio) / SAMPLE_RATE
+        decode_ms = []
+        for _ in range(repeats + (1 if index == 0 else 0)):
+            trace = DictationTrace()
+            text = transcriber.transcribe(audio, trace=trace)
+            decode_ms.append(trace.stages["decode"])
+        result = {"clip": name, "audio_seconds": audio_seconds, "text": text}
+        if index == 0:
+            result["cold_ms"] = load_seconds * 1000 + decode_ms.pop(0) # First decode right after loading
+        result["warm_ms"] = statistics.median(decode_ms)
+        result["rtf"] = result["warm_ms"] / 1000 / audio_seconds
+        result["wer"] = word_error_rate(reference, text) if reference is not None else None
+        clip_results.append(result)
+
+    total_audio = sum(r["audio_seconds"] for r in clip_results)
+    wers = [r["wer"] for r in clip_results if r["wer"] is not None]
+    return {
+        "model_size": model_size,
+        "profile": profile,
+        "compute_type": compute_type or get_profile(profile)["compute_type"],
+        "cpu_threads": cpu_threads,
+        "load_seconds": load_seconds,
+        "cold_ms": clip_results[0]["cold_ms"],
+        "warm_ms_total": sum(r["warm_ms"] for r in clip_results),
+        "rtf": sum(r["warm_ms"] for r in clip_results) / 1000 / total_audio,
+        "wer": sum(wers) / len(wers) if wers else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "clips": clip_results,
+    }
+
+def _run_in_child(args, results):
+    try:
+        results.put(run_config(*args))
+    except Exception as e:
+        model_size, profile, compute_type, cpu_threads = args[:4]
+        results.put({"model_size": model_size, "profile": profile, "compute_type": compute_type, "cpu_threads": cpu_threads,
+                     "error": str(e)})
+
+def run_isolated(*args, timeout=3600):
+    """Runs one combination in a fresh process, so cold start and peak RSS are not shared between runs.
+
+    A child that dies without reporting (out of memory, a crash in CTranslate2)
+    or runs longer than timeout seconds is recorded as a failed run.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=_run_in_child, args=(args, results))
+    process.start()
+    model_size, profile, compute_type, cpu_threads = args[:4]
+    return {"model_size": model_size, "profile": profile, "compute_type": compute_type, "cpu_threads": cpu_threads,
+            **wait_for_result(process, results, timeout)}
+
+def _fmt(value, spec):
+    return "-" if value is None else format(value, spec)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="Directory of 16 kHz mono WAV clips with optional .txt reference transcripts.")
+    parser.add_argument("--models-dir", default=os.path.join(ROOT, "models"), help="Directory holding the local models.")
+    parser.add_argument("--models", default="tiny", help="Comma-separated model sizes.")
+    parser.add_argument("--profiles", default="accurate", help="Comma-separated decoding profiles.")
+    parser.add_argument("--compute-types", default=None, help="Comma-separated CTranslate2 compute types (default: the profile's).")
+    parser.add_argument("--threads", default="0", help="Comma-separated CPU thread counts (0 lets CTranslate2 decide).")
+    parser.add_argument("--repeats", type=int, default=3, help="Warm decodes per clip; the median is reported.")
+    parser.add_argument("--output", help="JSON results file (default: bench_transcriber-<timestamp>.json).")
+    args = parser.parse_args()
+
+    clips = load_corpus(args.corpus)
+    runs = []
+    compute_types = args.compute_types.split(",") if args.compute_types else [None]
+    for model_size in args.models.split(","):
+        for profile in args.profiles.split(","):
+            for compute_type in compute_types:
+                for cpu_threads in (int(n) for n in args.threads.split(",")):
+                    print(f"Benchmarking {model_size} / {profile} / {compute_type or 'profile compute type'} / "
+                          f"{cpu_threads or 'auto'} threads...", flush=True)
+                    runs.append(run_isolated(model_size, profile, compute_type, cpu_threads, args.models_dir, clips, args.repeats))
+
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        vocalink_version = version("vocalink")
+    except PackageNotFoundError:
+        vocalink_version = None
+    report = {
+        "vocalink_version": vocalink_version,
+        "timestamp": time.time(),
+        "machine": machine_fingerprint(),
+        "corpus": args.corpus or "synthetic",
+        "repeats": args.repeats,
+        "runs": runs,
+    }
+    output = args.output or f"bench_transcriber-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+
+    print(f"{'model':<10} {'profile':<10} {'compute':<13} {'threads':>7} {'cold ms':>9} {'warm ms':>9} {'rtf':>7} {'wer':>6} {'rss MB':>8}")
+    for run in runs:
+        label = f"{run['model_size']:<10} {run['profile']:<10} {str(run['compute_type'] or '-'):<13} {run['cpu_threads']:>7}"
+        if "error" in run:
+            print(f"{label} failed: {run['error']}")
+            continue
+        print(f"{label} {run['cold_ms']:>9.0f} "
+              f"{run['warm_ms_total']:>9.0f} {run['rtf']:>7.3f} {_fmt(run['wer'], '>6.1%')} {_fmt(run['peak_rss_mb'], '>8.0f')}")
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import json
+import os
+from vocalink import batch
+
+def test_find_audio_files_expands_directories(tmp_path):
+    """Tests that directories are searched recursively for audio files only."""
+    (tmp_path / "sub").mkdir()
+    for name in ["a.wav", "sub/b.MP3", "notes.txt"]:
+        (tmp_path / name).write_bytes(b"x")
+    files = batch.find_audio_files([str(tmp_path), str(tmp_path / "a.wav")])
+    assert [os.path.relpath(f, tmp_path) for f in files] == ["a.wav", os.path.join("sub", "b.MP3")]
+
+def test_already_transcribed_files_are_skipped(tmp_path):
+    """Tests that only failed, new or modified files are transcribed again."""
+    paths = [str(tmp_path / name) for name in ["done.wav", "failed.wav", "changed.wav", "new.wav"]]
+    for path in paths:
+        with open(path, "wb") as f:
+            f.write(b"x")
+    output = tmp_path / "out.jsonl"
+    records = [
+        {"path": paths[0], **batch.file_signature(paths[0]), "text": "ok"},
+        {"path": paths[1], **batch.file_signature(paths[1]), "error": "boom"},
+        {"path": paths[2], "size": 999, "mtime": 0, "text": "old"},
+    ]
+    output.write_text("".join(json.dumps(r) + "\n" for r in records) + '{"path": "trunc')
+    assert batch.pending_files(paths, batch.load_done(str(output))) == paths[1:]
+
+def test_split_threads_shares_cores_between_workers():
+    """Tests that each worker gets an equal share of the cores and at least one thread."""
+    assert batch.split_threads(4, cpu_count=16) == 4
+    assert batch.split_threads(3, cpu_count=16) == 5
+    assert batch.split_threads(32, cpu_count=16) == 1
+
+def test_transcribe_file_reports_errors(tmp_path, monkeypatch):
+    """Tests that a failing file produces an error record instead of stopping the batch."""
+    class FailingTranscriber:
+        def transcribe(self, audio, word_replacements=None, trace=None):
+            raise RuntimeError("cannot decode")
+    path = tmp_path / "broken.wav"
+    path.write_bytes(b"x")
+    monkeypatch.setattr(batch, "_transcriber", FailingTranscriber())
+    record = batch.transcribe_file(str(path))
+    assert record["error"] == "cannot decode"
+    assert record["size"] == 1
+
+def test_missing_file_is_a_per_file_error(tmp_path):
+    """Tests that a file deleted after it was listed is reported instead of aborting the batch."""
+    path = str(tmp_path / "gone.wav")
+    assert batch.pending_files([path], {}) == [path]
+    record = batch.transcribe_file(path)
+    assert record["path"] == path and "error" in record
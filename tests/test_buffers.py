@@ -0,0 +1,53 @@
+from vocalink.buffers import CaptureBuffer, LevelHistory, RingBuffer
+import numpy as np
+
+def test_write_grows_and_keeps_samples():
+    """Tests that the buffer grows past its initial capacity without losing samples."""
+    buffer = CaptureBuffer(initial_samples=4)
+    buffer.write(np.arange(3, dtype=np.int16))
+    buffer.write(np.arange(3, 10, dtype=np.int16).tobytes())
+    assert len(buffer) == 10
+    assert buffer.capacity >= 10
+    assert list(buffer.view()) == list(range(10))
+
+def test_snapshot_is_a_view():
+    """Tests that snapshots share memory with the buffer and survive later writes."""
+    buffer = CaptureBuffer(initial_samples=8)
+    buffer.write(np.ones(4, dtype=np.int16))
+    snapshot = buffer.view()
+    assert np.shares_memory(snapshot, buffer.view())
+    buffer.write(np.zeros(16, dtype=np.int16))
+    assert list(snapshot) == [1, 1, 1, 1]
+
+def test_max_samples_drops_overflow():
+    """Tests that writes beyond the maximum length are dropped and counted."""
+    buffer = CaptureBuffer(initial_samples=4, max_samples=6)
+    assert buffer.write(np.zeros(5, dtype=np.int16)) == 5
+    assert buffer.write(np.zeros(5, dtype=np.int16)) == 1
+    assert len(buffer) == 6
+    assert buffer.dropped == 4
+
+def test_level_history_is_chronological():
+    """Tests that the level history returns the most recent readings oldest first."""
+    history = LevelHistory(size=3)
+    for level in [0.1, 0.2, 0.3, 0.4]:
+        history.push(level)
+    assert np.allclose(history.snapshot(), [0.2, 0.3, 0.4])
+
+def test_ring_buffer_keeps_most_recent_samples():
+    """Tests that the ring buffer wraps around and returns the newest samples in order."""
+    ring = RingBuffer(5)
+    ring.write(np.arange(3, dtype=np.int16))
+    assert list(ring.snapshot()) == [0, 1, 2]
+    ring.write(np.arange(3, 7, dtype=np.int16).tobytes())
+    assert list(ring.snapshot()) == [2, 3, 4, 5, 6]
+    ring.write(np.arange(10, 20, dtype=np.int16))
+    assert list(ring.snapshot()) == [15, 16, 17, 18, 19]
+
+def test_zero_capacity_ring_buffer_stays_empty():
+    """Tests that a disabled pre-roll (capacity 0) keeps nothing."""
+    ring = RingBuffer(0)
+    ring.write(np.arange(10, dtype=np.int16))
+    ring.write(np.arange(3, dtype=np.int16).tobytes())
+    assert len(ring) == 0 and ring.capacity == 0
+    assert len(ring.snapshot()) == 0
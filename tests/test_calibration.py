@@ -0,0 +1,74 @@
+import numpy as np
+from vocalink import calibration
+
+def test_calibrate_picks_largest_model_within_target(tmp_path, monkeypatch):
+    """Tests that calibration stops at the first model that misses the latency target."""
+    rtfs = {"tiny": 0.1, "base": 0.3, "small": 0.9, "medium": 2.0}
+    measured = []
+
+    def fake_measure(model_size, audio, compute_type="int8", options=None):
+        measured.append(model_size)
+        return {"model_size": model_size, "rtf": rtfs[model_size], "peak_rss_mb": 100.0}
+
+    monkeypatch.setattr(calibration, "measure_isolated", fake_measure)
+    path = str(tmp_path / "calibration.json")
+    result = calibration.calibrate(max_rtf=0.5, audio=calibration.reference_clip(1.0), path=path)
+    assert result["model_size"] == "base"
+    assert measured == ["tiny", "base", "small"]
+    assert calibration.load_calibration(0.5, path)["model_size"] == "base"
+    assert calibration.load_calibration(0.2, path) is None
+
+def test_failed_calibration_is_not_saved(tmp_path, monkeypatch):
+    """Tests that a calibration without a single successful measurement does not pin model_size=auto."""
+    def failing_measure(model_size, audio, compute_type="int8", options=None):
+        return {"model_size": model_size, "error": "download failed"}
+
+    monkeypatch.setattr(calibration, "measure_isolated", failing_measure)
+    path = str(tmp_path / "calibration.json")
+    assert calibration.calibrate(max_rtf=0.5, audio=calibration.reference_clip(1.0), path=path) is None
+    assert calibration.load_calibration(0.5, path) is None
+
+def test_models_are_timed_like_the_app_decodes_on_recorded_speech(tmp_path, monkeypatch):
+    """Tests that calibration uses the profile's decode options and the user's dictations when there are any."""
+    from vocalink.history import DictationHistory
+    calls = []
+
+    def fake_measure(model_size, audio, compute_type="int8", options=None):
+        calls.append((len(audio), compute_type, options))
+        return {"model_size": model_size, "rtf": 0.1, "peak_rss_mb": 100.0}
+
+    monkeypatch.setattr(calibration, "measure_isolated", fake_measure)
+    history = DictationHistory(path=str(tmp_path / "history"))
+    for _ in range(3):
+        history.add(np.full(16000 * 2, 1000, dtype=np.int16), "a two second dictation")
+    calibration.calibrate(candidates=["tiny"], profile="accurate", language="auto", history=history,
+                          path=str(tmp_path / "calibration.json"))
+    length, compute_type, options = calls[0]
+    assert length == 16000 * 6
+    assert compute_type == "int8"
+    assert options["beam_size"] == 5 and options["language"] is None
+
+def test_too_little_recorded_speech_falls_back_to_the_reference_clip(tmp_path):
+    """Tests that a history with only a short dictation is not used as the calibration clip."""
+    from vocalink.history import DictationHistory
+    history = DictationHistory(path=str(tmp_path))
+    history.add(np.zeros(16000, dtype=np.int16), "one second")
+    assert calibration.recorded_speech(history) is None
+
+def _die(model_size, audio, compute_type, options, results):
+    import os
+    os._exit(9) # Like a child killed for running out of memory
+
+def _hang(model_size, audio, compute_type, options, results):
+    import time
+    time.sleep(60)
+
+def test_dead_measurement_process_is_reported():
+    """Tests that a child that exits without a result does not hang the calibration."""
+    result = calibration.measure_isolated("tiny", calibration.reference_clip(0.1), target=_die)
+    assert "exited with code 9" in result["error"]
+
+def test_hung_measurement_process_times_out():
+    """Tests that a measurement that runs too long is stopped."""
+    result = calibration.measure_isolated("tiny", calibration.reference_clip(0.1), timeout=2, target=_hang)
+    assert "timed out" in result["error"]
@@ -0,0 +1,48 @@
+import pytest
+import os
+from vocalink.config import AppConfig, config_diff, save_config
+from vocalink.config_watcher import ConfigWatcher
+
+def touch_later(path):
+    """Moves the modification time forward so the edit is noticed even on coarse clocks."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def test_config_diff_lists_changed_fields():
+    """Tests that only fields with different values are reported."""
+    old = AppConfig()
+    new = AppConfig(hotkey="<alt>+<space>", word_replacements={"a": "b"})
+    assert config_diff(old, new) == {"hotkey": ("<ctrl>+<shift>", "<alt>+<space>"), "word_replacements": ({}, {"a": "b"})}
+    assert config_diff(old, AppConfig()) == {}
+
+def test_watcher_reports_field_level_changes(tmp_path):
+    """Tests that an on-disk edit is validated and reported as a diff."""
+    path = str(tmp_path / "config.json")
+    config = AppConfig()
+    save_config(config, path)
+    reported = []
+    watcher = ConfigWatcher(path, config, lambda new, changes: reported.append(changes))
+    assert watcher.poll() is None
+    save_config(AppConfig(transcription_language="de"), path)
+    touch_later(path)
+    assert watcher.poll() == {"transcription_language": ("en", "de")}
+    assert reported == [{"transcription_language": ("en", "de")}]
+
+def test_watcher_ignores_invalid_edits(tmp_path):
+    """Tests that a half-written file does not reset the configuration."""
+    path = tmp_path / "config.json"
+    save_config(AppConfig(model_size="small"), str(path))
+    watcher = ConfigWatcher(str(path), AppConfig(model_size="small"), lambda new, changes: pytest.fail("reported"))
+    path.write_text('{"model_size": "tin')
+    touch_later(path)
+    assert watcher.poll() is None
+    assert watcher.current.model_size == "small"
+
+def test_watcher_ignores_rewrites_without_changes(tmp_path):
+    """Tests that saving identical settings (e.g. from the settings window) is not reported."""
+    path = str(tmp_path / "config.json")
+    save_config(AppConfig(), path)
+    watcher = ConfigWatcher(path, AppConfig(), lambda new, changes: pytest.fail("reported"))
+    save_config(AppConfig(), path)
+    touch_later(path)
+    assert watcher.poll() is None
@@ -0,0 +1,151 @@
+import threading
+from types import SimpleNamespace
+import pytest
+import numpy as np
+from vocalink.devices import DeviceRegistry, scan_input_devices
+
+class FakePyAudio:
+    """Stands in for pyaudio.PyAudio with a fixed device list."""
+
+    def __init__(self, devices):
+        self.devices = devices # (name, host API index, max input channels, default rate)
+        self.info_calls = 0
+        self.signals = {} # Device index -> int16 samples its stream delivers
+
+    def get_device_count(self):
+        return len(self.devices)
+
+    def get_device_info_by_index(self, index):
+        self.info_calls += 1
+        name, api, channels, rate = self.devices[index]
+        return {"index": index, "name": name, "hostApi": api, "maxInputChannels": channels, "defaultSampleRate": float(rate)}
+
+    def get_default_input_device_info(self):
+        return self.get_device_info_by_index(2)
+
+    def get_host_api_info_by_index(self, index):
+        return {"name": ["MME", "WASAPI"][index]}
+
+    def open(self, input_device_index=None, stream_callback=None, **kwargs):
+        return FakeStream(stream_callback, self.signals.get(input_device_index))
+
+
+class FakeStream:
+    def __init__(self, callback, samples):
+        self.callback = callback
+        self.samples = np.zeros(512, dtype=np.int16) if samples is None else samples
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while self.running:
+            self.callback(self.samples.tobytes(), len(self.samples), None, 0)
+            threading.Event().wait(0.01)
+
+    def stop_stream(self):
+        self.running = False
+
+    def close(self):
+        self.thread.join()
+
+
+DEVICES = [
+    ("Speakers", 0, 0, 48000),
+    ("USB Mic", 0, 1, 48000),
+    ("Headset", 0, 2, 44100),
+    ("USB Mic", 1, 2, 48000),
+    ("USB Mic", 1, 2, 48000),
+]
+
+def test_scan_lists_inputs_with_stable_ids():
+    """Tests that outputs are skipped and duplicate names get distinct IDs."""
+    devices = scan_input_devices(FakePyAudio(DEVICES))
+    assert [device.id for device in devices] == ["MME:USB Mic", "MME:Headset", "WASAPI:USB Mic", "WASAPI:USB Mic#2"]
+    assert devices[1].native_rate == 44100 and devices[1].channels == 2
+
+def test_registry_serves_cached_devices():
+    """Tests that lookups after construction do not enumerate PortAudio again."""
+    pa = FakePyAudio(DEVICES)
+    registry = DeviceRegistry(pa)
+    calls = pa.info_calls
+    registry.labels()
+    registry.resolve("MME:Headset")
+    assert pa.info_calls == calls
+
+def test_resolve_follows_the_device_when_indexes_shift():
+    """Tests that a configured ID maps to the device's new index after another device is removed."""
+    registry = DeviceRegistry(FakePyAudio(DEVICES))
+    assert registry.resolve("MME:Headset") == 2
+    registry.rebind(FakePyAudio(DEVICES[1:]))
+    assert registry.resolve("MME:Headset") == 1
+
+def test_resolve_unplugged_device_uses_default():
+    """Tests that a missing device falls back to the default input instead of a stale index."""
+    registry = DeviceRegistry(FakePyAudio(DEVICES))
+    assert registry.resolve("MME:Webcam") is None
+    assert registry.resolve(None, legacy_index=1) == 1
+    assert registry.resolve(None, legacy_index=0) is None # An output device
+
+def test_labels_disambiguate_duplicate_names():
+    """Tests that only ambiguous names are qualified in the labels."""
+    labels = DeviceRegistry(FakePyAudio(DEVICES)).labels()
+    assert labels["Headset"] == "MME:Headset"
+    assert labels["USB Mic (WASAPI:USB Mic#2)"] == "WASAPI:USB Mic#2"
+
+def test_open_latency_survives_rebind():
+    """Tests that measured open latencies are kept for devices that are still connected."""
+    registry = DeviceRegistry(FakePyAudio(DEVICES))
+    registry.note_open_latency(2, 35.0)
+    registry.rebind(FakePyAudio(DEVICES[1:]))
+    assert registry.get("MME:Headset").open_latency_ms == 35.0
+
+def test_poll_reports_added_and_removed_devices():
+    """Tests that a scan with a different device set is reported to on_change."""
+    changes = []
+    fresh = [{"id": "MME:USB Mic"}, {"id": "MME:Headset"}, {"id": "WASAPI:USB Mic"}, {"id": "MME:Webcam"}]
+    registry = DeviceRegistry(FakePyAudio(DEVICES), on_change=lambda *change: changes.append(change),
+                              scanner=lambda: fresh)
+    assert registry.poll() == (["MME:Webcam"], ["WASAPI:USB Mic#2"])
+    assert changes == [(["MME:Webcam"], ["WASAPI:USB Mic#2"])]
+
+def test_poll_without_changes_is_quiet():
+    """Tests that an unchanged device set does not call on_change."""
+    pa = FakePyAudio(DEVICES)
+    registry = DeviceRegistry(pa, on_change=lambda *change: pytest.fail("unexpected change"),
+                              scanner=lambda: [device.to_dict() for device in scan_input_devices(pa)])
+    assert registry.poll() is None
+
+def test_poll_ignores_the_device_in_use():
+    """Tests that an open device missing from a fresh scan is not reported as removed."""
+    pa = FakePyAudio(DEVICES)
+    fresh = [device.to_dict() for device in scan_input_devices(pa) if device.id != "MME:Headset"] # Busy, so not listed
+    registry = DeviceRegistry(pa, on_change=lambda *change: pytest.fail("unexpected change"),
+                              scanner=lambda: fresh, in_use=lambda: ["MME:Headset"])
+    assert registry.poll() is None
+
+def test_open_default_input_is_reported_in_use():
+    """Tests that a stream on the default input (stream_device None) is skipped by name, not left out."""
+    from vocalink.main import VocalInkApp
+    app = VocalInkApp.__new__(VocalInkApp) # Only the parts _open_device_ids touches
+    app.device_registry = DeviceRegistry(FakePyAudio(DEVICES))
+    app.recorder = SimpleNamespace(stream=object(), stream_device=None)
+    assert app._open_device_ids() == ["MME:Headset"]
+    app.recorder.stream = None
+    assert app._open_device_ids() == []
+
+def test_probe_picks_the_input_with_a_live_signal():
+    """Tests that the auto-probe skips silent inputs and records open latencies."""
+    pytest.importorskip("pyaudio")
+    pa = FakePyAudio(DEVICES)
+    t = np.arange(512) / 48000
+    pa.signals[2] = (3000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+    registry = DeviceRegistry(pa)
+    device = registry.probe(timeout=2.0)
+    assert device.id == "MME:Headset"
+    assert all(device.open_latency_ms is not None for device in registry.devices)
+
+def test_probe_returns_none_when_every_input_is_silent():
+    """Tests that digital silence never counts as a live signal."""
+    pytest.importorskip("pyaudio")
+    assert DeviceRegistry(FakePyAudio(DEVICES)).probe(timeout=0.2) is None
@@ -0,0 +1,86 @@
+import json
+import os
+import time
+import numpy as np
+from vocalink.history import DictationHistory
+
+def samples(seconds, sample_rate=16000):
+    return (np.sin(np.arange(int(seconds * sample_rate)) / 10) * 8000).astype(np.int16)
+
+def test_add_stores_audio_and_transcript(tmp_path):
+    """Tests that an entry round-trips its int16 audio, text and metadata."""
+    history = DictationHistory(path=str(tmp_path))
+    audio = samples(1.0)
+    entry = history.add(audio, "hello world", metadata={"rtf": 0.2})
+    assert entry["text"] == "hello world" and entry["rtf"] == 0.2 and entry["seconds"] == 1.0
+    np.testing.assert_array_equal(history.samples(entry), audio)
+    assert history.audio(entry).dtype == np.float32
+    assert entry["bytes"] < audio.nbytes + 256 # Two bytes per sample plus the .npy header
+
+def test_samples_are_memory_mapped(tmp_path):
+    """Tests that reads map the file instead of loading it."""
+    history = DictationHistory(path=str(tmp_path))
+    entry = history.add(samples(0.5), "text")
+    assert isinstance(history.samples(entry), np.memmap)
+
+def test_entries_survive_a_restart(tmp_path):
+    """Tests that a new instance reads the entries back from the index."""
+    history = DictationHistory(path=str(tmp_path))
+    first = history.add(samples(0.2), "one")
+    second = history.add(samples(0.2), "two")
+    reopened = DictationHistory(path=str(tmp_path))
+    assert [entry["id"] for entry in reopened.entries()] == [first["id"], second["id"]]
+    assert reopened.latest()["text"] == "two"
+
+def test_count_limit_evicts_oldest(tmp_path):
+    """Tests that only the newest max_entries dictations and their files are kept."""
+    history = DictationHistory(path=str(tmp_path), max_entries=3)
+    for i in range(5):
+        history.add(samples(0.1), f"entry {i}")
+    assert [entry["text"] for entry in history.entries()] == ["entry 2", "entry 3", "entry 4"]
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".npy")]) == 3
+
+def test_size_limit_bounds_disk_use(tmp_path):
+    """Tests that the total audio size stays under max_mb."""
+    history = DictationHistory(path=str(tmp_path), max_entries=1000, max_mb=0.1) # About three 1 s recordings
+    for i in range(10):
+        history.add(samples(1.0), f"entry {i}")
+    assert history.total_bytes <= 0.1 * 1024 * 1024
+    assert history.latest()["text"] == "entry 9"
+
+def test_oversize_entry_is_not_archived(tmp_path):
+    """Tests that a recording larger than max_mb is skipped instead of evicting itself and every older entry."""
+    history = DictationHistory(path=str(tmp_path), max_mb=0.1)
+    kept = history.add(samples(0.5), "short")
+    assert history.add(samples(5.0), "too long") is None
+    assert [entry["id"] for entry in history.entries()] == [kept["id"]]
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".npy")] == [kept["file"]]
+
+def test_old_entries_expire(tmp_path):
+    """Tests that entries older than max_age_days are dropped when the history is opened."""
+    history = DictationHistory(path=str(tmp_path))
+    history.add(samples(0.1), "old")
+    lines = [json.loads(line) for line in (tmp_path / "index.jsonl").read_text().splitlines()]
+    lines[0]["timestamp"] = time.time() - 40 * 86400
+    (tmp_path / "index.jsonl").write_text(json.dumps(lines[0]) + "\n")
+    reopened = DictationHistory(path=str(tmp_path), max_age_days=30)
+    assert reopened.entries() == []
+    assert not any(name.endswith(".npy") for name in os.listdir(tmp_path))
+
+def test_index_is_compacted(tmp_path):
+    """Tests that evicted entries do not make the index grow without bound."""
+    history = DictationHistory(path=str(tmp_path), max_entries=2)
+    for i in range(20):
+        history.add(samples(0.05), f"entry {i}")
+    assert len((tmp_path / "index.jsonl").read_text().splitlines()) < 2 * 2
+
+def test_orphans_and_truncated_lines_are_cleaned_up(tmp_path):
+    """Tests that audio without an index line is deleted and a truncated line is skipped."""
+    history = DictationHistory(path=str(tmp_path))
+    entry = history.add(samples(0.1), "kept")
+    np.save(tmp_path / "123.npy", samples(0.1)) # Crashed before its index line was written
+    with open(tmp_path / "index.jsonl", "a") as f:
+        f.write('{"id": 456, "fi')
+    reopened = DictationHistory(path=str(tmp_path))
+    assert [e["id"] for e in reopened.entries()] == [entry["id"]]
+    assert not (tmp_path / "123.npy").exists()
@@ -0,0 +1,105 @@
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+
+hotkey = pytest.importorskip("vocalink.hotkey", exc_type=ImportError) # pynput needs a display or PYNPUT_BACKEND=dummy
+A = hotkey.keyboard.KeyCode.from_char("a")
+B = hotkey.keyboard.KeyCode.from_char("b")
+
+def make_manager(events, debounce_ms=25, on_release=None):
+    return hotkey.HotkeyManager("a+b", lambda: events.append("press"),
+                                on_release or (lambda: events.append("release")), debounce_ms=debounce_ms)
+
+def test_quick_repress_is_ignored():
+    """Tests that a release followed by a press inside the debounce window delivers neither."""
+    events = []
+    manager = make_manager(events, debounce_ms=200)
+    manager._on_press(A)
+    manager._on_press(B)
+    manager._on_release(B)
+    manager._on_press(B)
+    assert events == ["press"]
+    assert manager._release_timer is None
+
+def test_release_is_delivered_after_the_window():
+    """Tests that a real release reaches the callback once the debounce window has passed."""
+    events = []
+    released = threading.Event()
+    manager = make_manager(events, on_release=lambda: (events.append("release"), released.set()))
+    manager._on_press(A)
+    manager._on_press(B)
+    manager._on_release(A)
+    assert released.wait(2)
+    assert events == ["press", "release"]
+
+def test_press_waits_for_a_release_in_progress():
+    """Tests that a press on the hook thread does not run while the timer thread is delivering a release."""
+    events = []
+    releasing, finish = threading.Event(), threading.Event()
+
+    def slow_release():
+        releasing.set()
+        finish.wait(2)
+        events.append("release")
+
+    manager = make_manager(events, debounce_ms=1, on_release=slow_release)
+    manager._on_press(A)
+    manager._on_press(B)
+    manager._on_release(B)
+    assert releasing.wait(2)
+    pressing = threading.Thread(target=manager._on_press, args=(B,))
+    pressing.start()
+    pressing.join(0.1)
+    assert events == ["press"] # Still blocked behind the release
+    finish.set()
+    pressing.join(2)
+    assert events == ["press", "release", "press"]
+
+def test_stop_listening_delivers_a_pending_release():
+    """Tests that stopping with a release still in its debounce window ends the recording."""
+    events = []
+    manager = make_manager(events, debounce_ms=10000)
+    manager._on_press(A)
+    manager._on_press(B)
+    manager._on_release(A)
+    manager.stop_listening()
+    assert events == ["press", "release"]
+
+def test_exit_during_a_blocked_press_does_not_deadlock():
+    """Tests that Exit completes while a press callback is waiting for the app's exit_lock."""
+    from vocalink.main import VocalInkApp
+    app = VocalInkApp.__new__(VocalInkApp) # Only the parts exit_app touches
+    app.exit_lock = threading.Lock()
+    entered, proceed, destroyed = threading.Event(), threading.Event(), threading.Event()
+    events = []
+
+    def on_press():
+        entered.set()
+        proceed.wait(2)
+        with app.exit_lock: # Like start_recording
+            events.append("press")
+
+    def on_release():
+        with app.exit_lock: # Like stop_and_transcribe
+            events.append("release")
+
+    app.hotkey_manager = hotkey.HotkeyManager("a+b", on_press, on_release, debounce_ms=10000)
+    app.config_watcher = app.tray_icon = app.overlay_process = None
+    app.device_registry = app.transcription_worker = SimpleNamespace(stop=lambda timeout=None: None)
+    app.recorder = SimpleNamespace(close=lambda: None)
+    app.cleanup_temp_files = lambda: None
+    app.root = SimpleNamespace(destroy=destroyed.set)
+
+    app.hotkey_manager._on_press(A)
+    pressing = threading.Thread(target=app.hotkey_manager._on_press, args=(B,), daemon=True)
+    pressing.start()
+    assert entered.wait(2)
+    exiting = threading.Thread(target=app.exit_app, daemon=True)
+    exiting.start()
+    time.sleep(0.1) # Let exit_app reach the hotkey lock
+    proceed.set()
+    exiting.join(2)
+    pressing.join(2)
+    assert destroyed.is_set()
+    assert events == ["press"]
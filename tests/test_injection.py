@@ -0,0 +1,67 @@
+import time
+import pytest
+from vocalink.injection import InjectionCostModel, TextInjector
+
+class FakeBackend:
+    """Records injected text and simulates a fixed cost per call and per character."""
+
+    def __init__(self, name, available=True, fail=False, settle_ms=0.0, per_char_ms=0.0):
+        self.name = name
+        self._available = available
+        self.fail = fail
+        self.settle_ms = settle_ms
+        self.per_char_ms = per_char_ms
+        self.injected = []
+
+    def available(self):
+        return self._available
+
+    def inject(self, text):
+        if self.fail:
+            raise OSError("no display")
+        self.injected.append(text)
+        time.sleep(self.per_char_ms * len(text) / 1000)
+
+def test_backend_is_chosen_by_text_length():
+    """Tests that short texts are typed and long texts are pasted with the default priors."""
+    injector = TextInjector(backends=[FakeBackend("clipboard"), FakeBackend("type")])
+    assert injector.choose("hi") == "type"
+    assert injector.choose("x" * 500) == "clipboard"
+
+def test_choice_still_depends_on_length_after_measurements():
+    """Tests that a clipboard paste returning at once does not win every length once its settle time is charged."""
+    clipboard, typing = FakeBackend("clipboard", settle_ms=50.0), FakeBackend("type", per_char_ms=1.0)
+    injector = TextInjector(backends=[clipboard, typing])
+    for _ in range(30): # Enough for the measurements to outweigh the priors
+        injector.inject("x" * 200) # Pasted, in well under a millisecond
+        injector.inject("ok") # Typed
+    assert injector.choose("ok") == "type"
+    assert injector.choose("x" * 500) == "clipboard"
+
+def test_unavailable_backends_are_ignored():
+    """Tests that backends not supported on this platform are never chosen."""
+    injector = TextInjector(backends=[FakeBackend("clipboard"), FakeBackend("type_batched", available=False)])
+    assert list(injector.backends) == ["clipboard"]
+
+def test_failing_backend_falls_back_and_is_not_retried():
+    """Tests that a failing backend is marked unreliable and the text still gets injected."""
+    clipboard, typing = FakeBackend("clipboard"), FakeBackend("type", fail=True)
+    injector = TextInjector(backends=[clipboard, typing])
+    assert injector.inject("hi") == "clipboard"
+    assert clipboard.injected == ["hi"]
+    assert injector.choose("hi") == "clipboard"
+
+def test_forced_mode_is_used_while_it_works():
+    """Tests that a configured backend overrides the automatic choice."""
+    injector = TextInjector(mode="clipboard", backends=[FakeBackend("clipboard"), FakeBackend("type")])
+    assert injector.choose("hi") == "clipboard"
+
+def test_cost_model_learns_from_measurements():
+    """Tests that measurements replace the prior estimate."""
+    model = InjectionCostModel(1.0, 6.0)
+    for _ in range(100):
+        model.add(10, 15.0)
+        model.add(50, 35.0)
+    overhead, per_char = model.coefficients()
+    assert overhead == pytest.approx(10.0, abs=0.5)
+    assert per_char == pytest.approx(0.5, abs=0.05)
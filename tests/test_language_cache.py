@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+from vocalink.language_cache import LanguageCache
+from vocalink.models import ModelManager
+from vocalink.transcriber import Transcriber
+
+class FakeModel:
+    """Detects a fixed language and decodes segments with a configurable log-probability."""
+
+    def __init__(self, language="de", probability=0.95, avg_logprob=-0.3):
+        self.language = language
+        self.probability = probability
+        self.avg_logprob = avg_logprob
+        self.calls = []
+
+    def transcribe(self, audio, **options):
+        self.calls.append(options.get("language"))
+        segments = [SimpleNamespace(text=" hallo", avg_logprob=self.avg_logprob)]
+        return iter(segments), SimpleNamespace(language=self.language, language_probability=self.probability)
+
+def auto_transcriber(model, cache=None):
+    return Transcriber("tiny", language="auto", model_manager=ModelManager(loader=lambda size, **options: model),
+                       language_cache=cache)
+
+def test_confident_detection_is_reused():
+    """Tests that later decodes skip detection once a language was detected confidently."""
+    model = FakeModel()
+    transcriber = auto_transcriber(model, LanguageCache())
+    transcriber.transcribe_segments("clip")
+    transcriber.transcribe_segments("clip")
+    assert model.calls == [None, "de"]
+
+def test_unconfident_detection_is_not_cached():
+    """Tests that a low-probability detection is detected again next time."""
+    model = FakeModel(probability=0.4)
+    transcriber = auto_transcriber(model, LanguageCache())
+    transcriber.transcribe_segments("clip")
+    transcriber.transcribe_segments("clip")
+    assert model.calls == [None, None]
+
+def test_low_logprob_triggers_redetection():
+    """Tests that a poor decode in the cached language is redone with detection."""
+    model = FakeModel()
+    transcriber = auto_transcriber(model, LanguageCache())
+    transcriber.transcribe_segments("clip")
+    model.avg_logprob = -2.0
+    model.probability = 0.5 # The new detection is not confident enough to cache
+    transcriber.transcribe_segments("clip")
+    assert model.calls == [None, "de", None]
+    assert transcriber.language_cache.get() is None
+
+def test_cached_language_expires(monkeypatch):
+    """Tests that the cached language is dropped after the timeout."""
+    cache = LanguageCache(ttl_seconds=60)
+    now = [1000.0]
+    monkeypatch.setattr("vocalink.language_cache.time.monotonic", lambda: now[0])
+    cache.update("fr", 0.99)
+    assert cache.get() == "fr"
+    now[0] += 61
+    assert cache.get() is None
+
+def test_fixed_language_bypasses_cache():
+    """Tests that an explicit transcription language is always used as is."""
+    model = FakeModel()
+    transcriber = auto_transcriber(model, LanguageCache())
+    transcriber.language = "en"
+    transcriber.transcribe_segments("clip")
+    assert model.calls == ["en"]
+    assert transcriber.language_cache.get() is None
+
+def test_detection_is_not_shared_without_a_cache():
+    """Tests that a Transcriber without a cache, as used by the server and batch mode, detects on every call."""
+    model = FakeModel()
+    transcriber = auto_transcriber(model)
+    transcriber.transcribe_segments("clip")
+    transcriber.transcribe_segments("clip")
+    assert model.calls == [None, None]
+    assert transcriber.language_cache is None
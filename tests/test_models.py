@@ -0,0 +1,127 @@
+from types import SimpleNamespace
+from vocalink.models import ModelManager
+from vocalink.transcriber import Transcriber
+import threading
+import numpy as np
+
+class FakeLoader:
+    """Records load calls and returns a placeholder model per key."""
+
+    def __init__(self):
+        self.loads = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, model_size, device="cpu", compute_type="int8", **load_options):
+        self.gate.wait(5)
+        self.loads.append(model_size)
+        return f"model-{model_size}"
+
+def test_cached_models_are_not_reloaded():
+    """Tests that switching back to a cached model does not load it again."""
+    loader = FakeLoader()
+    manager = ModelManager(loader=loader)
+    manager.activate("tiny")
+    manager.activate("base")
+    manager.activate("tiny")
+    assert loader.loads == ["tiny", "base"]
+    assert manager.active == "model-tiny"
+
+def test_lru_eviction_respects_budget():
+    """Tests that the least recently used inactive model is evicted first."""
+    manager = ModelManager(memory_budget_mb=250, loader=FakeLoader())
+    manager.activate("tiny")
+    manager.activate("base")
+    assert manager.cached_keys() == [("base", "cpu", "int8")]
+
+def test_background_swap_keeps_old_model_serving():
+    """Tests that the old model stays active until the new one has loaded."""
+    loader = FakeLoader()
+    manager = ModelManager(loader=loader)
+    manager.activate("tiny")
+    loader.gate.clear()
+    ready = threading.Event()
+    manager.activate("small", background=True, on_ready=lambda key: ready.set())
+    assert manager.active == "model-tiny"
+    loader.gate.set()
+    assert ready.wait(5)
+    assert manager.active == "model-small"
+
+def test_language_change_does_not_reload():
+    """Tests that the transcription language is independent of the loaded model."""
+    loader = FakeLoader()
+    transcriber = Transcriber("tiny", language="en", model_manager=ModelManager(loader=loader))
+    transcriber.language = "de"
+    assert transcriber.model == "model-tiny"
+    assert loader.loads == ["tiny"]
+
+def test_profile_switch_only_reloads_when_load_options_change():
+    """Tests that profiles differing only in decode options share one loaded model."""
+    loader = FakeLoader()
+    transcriber = Transcriber("tiny", model_manager=ModelManager(loader=loader), profile="fastest")
+    transcriber.set_profile("balanced", background=False)
+    assert loader.loads == ["tiny"]
+    assert transcriber.decode_options()["beam_size"] == 3
+    transcriber.set_profile("accurate", background=False)
+    assert loader.loads == ["tiny"] # Every profile loads the int8 model
+    assert transcriber.decode_options()["beam_size"] == 5
+
+def test_explicit_threads_override_the_profile():
+    """Tests that cpu_threads passed to the Transcriber reaches the loader."""
+    calls = []
+    manager = ModelManager(loader=lambda size, **options: calls.append(options) or size)
+    Transcriber("tiny", model_manager=manager, profile="fastest", cpu_threads=3)
+    assert calls == [{"device": "cpu", "compute_type": "int8", "cpu_threads": 3, "num_workers": 1}]
+
+def test_failed_initial_load_is_raised_to_waiters():
+    """Tests that a failed background load wakes waiters with the error instead of blocking them forever."""
+    def failing_loader(model_size, device="cpu", compute_type="int8", **load_options):
+        raise OSError("no network")
+
+    manager = ModelManager(loader=failing_loader)
+    errors = []
+    failed = threading.Event()
+    manager.activate("tiny", background=True, on_error=lambda e: (errors.append(e), failed.set()))
+    assert failed.wait(5)
+    try:
+        manager.wait_active(timeout=5)
+        assert False, "wait_active should have raised"
+    except RuntimeError as e:
+        assert "no network" in str(e)
+    assert isinstance(errors[0], OSError)
+    assert not manager.loading
+
+def test_retry_after_failed_load_succeeds():
+    """Tests that a model requested after a failed first load becomes active and clears the error."""
+    calls = []
+
+    def flaky_loader(model_size, device="cpu", compute_type="int8", **load_options):
+        calls.append(model_size)
+        if len(calls) == 1:
+            raise OSError("no network")
+        return f"model-{model_size}"
+
+    manager = ModelManager(loader=flaky_loader)
+    try:
+        manager.activate("tiny")
+        assert False, "a foreground load should raise"
+    except OSError:
+        pass
+    assert manager.load_error is not None
+    manager.activate("base")
+    assert manager.wait_active(timeout=5) == "model-base"
+    assert manager.load_error is None
+
+def test_recorded_audio_reaches_the_model_in_memory():
+    """Tests that a float32 recording is passed to faster-whisper as is, with no WAV file in between."""
+    received = []
+
+    class FakeModel:
+        def transcribe(self, audio, **options):
+            received.append(audio)
+            return iter([SimpleNamespace(text=" hello world")]), None
+
+    transcriber = Transcriber("tiny", model_manager=ModelManager(loader=lambda size, **options: FakeModel()))
+    audio = np.zeros(16000, dtype=np.float32)
+    assert transcriber.transcribe(audio) == "Hello world."
+    assert received[0] is audio
@@ -0,0 +1,28 @@
+import pytest
+import numpy as np
+
+overlay = pytest.importorskip("vocalink.overlay", exc_type=ImportError) # Needs customtkinter
+
+def test_waveform_has_one_row_per_line():
+    """Tests the shape of the computed waveform."""
+    ys = overlay.waveform_points(np.full(64, 0.5), now=1.0, height=35)
+    assert ys.shape == (len(overlay.RecordingOverlay.LINE_OFFSETS), overlay.RecordingOverlay.NUM_POINTS)
+
+def test_waveform_follows_the_level_history():
+    """Tests that louder levels give a larger waveform and silence keeps only a faint ripple."""
+    height = 35
+    silent = np.abs(overlay.waveform_points(np.zeros(64), now=1.0, height=height) - height / 2).max()
+    loud = np.abs(overlay.waveform_points(np.ones(64), now=1.0, height=height) - height / 2).max()
+    assert loud > 5 * silent
+    assert loud <= height / 2 * 1.6 # Sum of the three sines peaks at 1.6 times the amplitude
+
+def test_waveform_is_shaped_along_the_history():
+    """Tests that a level history that is loud only at the end raises only the right side of the waveform."""
+    levels = np.concatenate([np.zeros(32), np.ones(32)])
+    ys = overlay.waveform_points(levels, now=1.0, height=35) - 35 / 2
+    points = overlay.RecordingOverlay.NUM_POINTS
+    assert np.abs(ys[:, points * 3 // 4:]).max() > 3 * np.abs(ys[:, :points // 4]).max()
+
+def test_empty_history_is_silent():
+    """Tests that an empty history resamples to zeros."""
+    np.testing.assert_array_equal(overlay.resample_levels([], 10), np.zeros(10))
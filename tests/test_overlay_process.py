@@ -0,0 +1,121 @@
+import importlib.util
+import subprocess
+import threading
+import time
+import pytest
+from vocalink import overlay_process
+from vocalink.overlay_process import OverlayProcess
+
+@pytest.fixture
+def spawns(monkeypatch):
+    """Counts the overlay processes started."""
+    started = []
+    popen = subprocess.Popen
+
+    def counting_popen(*args, **kwargs):
+        started.append(args)
+        return popen(*args, **kwargs)
+    monkeypatch.setattr(overlay_process.subprocess, "Popen", counting_popen)
+    return started
+
+def test_missing_pyside_is_detected_without_spawning(monkeypatch, spawns):
+    """Tests that the overlay is marked unavailable when PySide6 is not installed."""
+    monkeypatch.setattr(overlay_process.importlib.util, "find_spec", lambda name: None)
+    overlay = OverlayProcess()
+    try:
+        with pytest.raises(RuntimeError):
+            overlay.start()
+        overlay.show()
+        overlay.hide()
+        assert not overlay.available
+        assert spawns == []
+    finally:
+        overlay.close()
+
+def test_failed_start_is_not_retried_per_command(monkeypatch, spawns):
+    """Tests that a process that exits before its ready line is started once, not on every show/hide."""
+    if importlib.util.find_spec("PySide6") is not None:
+        pytest.skip("PySide6 is installed, so the overlay would start")
+    monkeypatch.setattr(overlay_process.importlib.util, "find_spec", lambda name: object()) # Let it try anyway
+    overlay = OverlayProcess()
+    try:
+        with pytest.raises(RuntimeError):
+            overlay.start()
+        for _ in range(3):
+            overlay.show()
+            overlay.hide()
+        assert len(spawns) == 1
+        assert overlay.process is None
+    finally:
+        overlay.close()
+
+class FakeProcess:
+    """A running (returncode None) or exited overlay process that records the commands it receives."""
+
+    def __init__(self, returncode=None):
+        self.returncode = returncode
+        self.commands = []
+        self.stdin = self
+
+    def poll(self):
+        return self.returncode
+
+    def write(self, data):
+        self.commands.append(data.strip())
+
+    def flush(self):
+        pass
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+def test_crashed_overlay_is_restarted_in_the_background(monkeypatch):
+    """Tests that show() on a dead overlay returns at once and the restart runs on another thread."""
+    callers, release, restarted = [], threading.Event(), threading.Event()
+
+    def slow_start(self):
+        callers.append(threading.current_thread())
+        release.wait(5) # Like waiting for the ready line
+        self.process = FakeProcess()
+        restarted.set()
+    monkeypatch.setattr(OverlayProcess, "start", slow_start)
+    overlay = OverlayProcess()
+    try:
+        overlay.process = FakeProcess(returncode=1) # Crashed
+        began = time.perf_counter()
+        overlay.show()
+        overlay.hide()
+        assert time.perf_counter() - began < 1.0
+        release.set()
+        assert restarted.wait(5)
+        assert callers[0] is not threading.current_thread()
+        overlay.show()
+        assert overlay.process.commands == ["show"]
+        assert overlay.restarts == 1
+    finally:
+        overlay.close()
+
+def test_overlay_that_keeps_crashing_is_given_up(monkeypatch):
+    """Tests that a second crash after the one restart disables the overlay and reports it once."""
+    starts, unavailable = [], []
+
+    def start(self):
+        starts.append(1)
+        self.process = FakeProcess(returncode=1) # Comes up and dies again
+    monkeypatch.setattr(OverlayProcess, "start", start)
+    overlay = OverlayProcess(on_unavailable=lambda: unavailable.append(1))
+    try:
+        overlay.process = FakeProcess(returncode=1)
+        overlay.show()
+        for _ in range(50):
+            if starts and not overlay._restarting:
+                break
+            threading.Event().wait(0.01)
+        for _ in range(3):
+            overlay.show()
+            overlay.hide()
+        assert starts == [1]
+        assert unavailable == [1]
+        assert not overlay.available
+    finally:
+        overlay.close()
@@ -0,0 +1,62 @@
+import threading
+import time
+import wave
+import numpy as np
+import pytest
+
+audio = pytest.importorskip("vocalink.audio", exc_type=ImportError) # Needs PyAudio
+
+def test_no_chunk_reaches_the_listener_after_stop():
+    """Tests that a warm-stream chunk in flight during stop_recording is delivered before it returns, and later ones are not."""
+    recorder = audio.AudioRecorder(native_rate=False)
+    chunk = np.ones(1024, dtype=np.int16).tobytes()
+    received, entered, finish = [], threading.Event(), threading.Event()
+
+    def listener(data):
+        entered.set()
+        finish.wait(2)
+        received.append(data)
+
+    recorder.warm = True # As if open_warm_stream() had run; chunks are fed by hand below
+    recorder.start_recording(on_chunk=listener)
+    callback = threading.Thread(target=recorder._on_audio, args=(chunk, 1024, None, 0))
+    callback.start()
+    assert entered.wait(2)
+    stopped = []
+    stopping = threading.Thread(target=lambda: stopped.append(recorder.stop_recording()))
+    stopping.start()
+    stopping.join(0.1)
+    assert not stopped # Waits for the chunk being delivered
+    finish.set()
+    stopping.join(2)
+    callback.join(2)
+    assert len(received) == 1
+    recorder._on_audio(chunk, 1024, None, 0) # Goes to the pre-roll now
+    assert len(received) == 1
+    recorder.warm = False
+    recorder.close()
+
+def test_stop_returns_the_recording_in_memory(tmp_path):
+    """Tests that stop_recording hands back float32 audio and only writes a WAV when asked, off the calling thread."""
+    recorder = audio.AudioRecorder(native_rate=False)
+    samples = (np.arange(2048) % 200 - 100).astype(np.int16)
+    recorder.warm = True # Chunks are fed by hand instead of by a stream
+    recorder.start_recording()
+    recorder._on_audio(samples.tobytes(), len(samples), None, 0)
+    path = tmp_path / "last_recording.wav"
+    result = recorder.stop_recording(output_filename=str(path))
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, samples / 32768.0)
+    frames = None
+    for _ in range(100): # Written by a background thread
+        try:
+            with wave.open(str(path), "rb") as wf:
+                frames = wf.getnframes()
+        except (FileNotFoundError, EOFError, wave.Error):
+            pass
+        if frames == len(samples):
+            break
+        time.sleep(0.01)
+    assert frames == len(samples)
+    recorder.warm = False
+    recorder.close()
@@ -0,0 +1,38 @@
+from vocalink.replacements import WordReplacer, compile_replacements
+
+def test_rules_do_not_chain():
+    """Tests that the output of one rule is not rewritten by another."""
+    replace = WordReplacer({"a": "b", "b": "c"})
+    assert replace("a b") == "b c"
+
+def test_longest_key_wins():
+    """Tests that overlapping keys prefer the longest match."""
+    replace = WordReplacer({"new": "old", "new york": "NYC"})
+    assert replace("new york is new") == "NYC is old"
+
+def test_whole_words_and_ignore_case():
+    """Tests the word-boundary and case-insensitive options."""
+    replace = WordReplacer({"teh": "the"}, whole_words=True, ignore_case=True)
+    assert replace("Teh tehran teh") == "the tehran the"
+
+def test_special_characters_are_literal():
+    """Tests that regex metacharacters in keys are matched literally."""
+    assert WordReplacer({"c++": "C plus plus", "a.b": "x"})("c++ and a.b, not acb") == "C plus plus and x, not acb"
+
+def test_compiled_form_is_cached_until_rules_change():
+    """Tests that the compiled replacer is reused until the dictionary changes."""
+    rules = {"gonna": "going to"}
+    first = compile_replacements(rules)
+    assert compile_replacements(dict(rules)) is first
+    assert compile_replacements({"gonna": "going to", "wanna": "want to"}) is not first
+
+def test_ignore_case_matches_unicode_case_variants():
+    """Tests that text matched through Unicode case folding is replaced instead of raising KeyError."""
+    replace = WordReplacer({"sun": "moon", "Straße": "road"}, ignore_case=True)
+    assert replace("\u017fun and STRASSE and STRAẞE") == "moon and STRASSE and road"
+
+def test_long_keys_do_not_hit_the_recursion_limit():
+    """Tests that keys longer than the recursion limit still compile and match."""
+    key = "ab" * 2000
+    replace = WordReplacer({key: "long", key[:10]: "short"})
+    assert replace(key + " " + key[:10]) == "long short"
@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+from vocalink.resample import StreamingResampler
+
+def tone(seconds, frequency, sample_rate, amplitude=8000):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.int16)
+
+def rms(samples):
+    return float(np.sqrt(np.mean(np.square(samples.astype(np.float64)))))
+
+@pytest.mark.parametrize("rate", [48000, 44100, 22050, 8000])
+def test_output_length_matches_rate(rate):
+    """Tests that one second of input becomes one second at 16 kHz."""
+    resampler = StreamingResampler(rate)
+    out = resampler.process(tone(1.0, 440, rate))
+    assert len(out) == resampler.output_length(rate) == 16000
+
+@pytest.mark.parametrize("rate", [48000, 44100])
+def test_chunked_output_matches_whole(rate):
+    """Tests that splitting the input into odd-sized chunks does not change the output."""
+    samples = tone(0.5, 440, rate)
+    whole = StreamingResampler(rate).process(samples)
+    resampler = StreamingResampler(rate)
+    chunked = np.concatenate([resampler.process(samples[i:i + 777].tobytes()) for i in range(0, len(samples), 777)])
+    np.testing.assert_array_equal(chunked, whole)
+
+def test_tone_survives_resampling():
+    """Tests that an in-band tone keeps its level and frequency."""
+    out = StreamingResampler(44100).process(tone(1.0, 1000, 44100))[200:]
+    assert rms(out) == pytest.approx(8000 / np.sqrt(2), rel=0.02)
+    spectrum = np.abs(np.fft.rfft(out))
+    assert np.argmax(spectrum) * 16000 / len(out) == pytest.approx(1000, abs=2)
+
+def test_frequencies_above_nyquist_are_filtered():
+    """Tests that content the 16 kHz output cannot represent is removed instead of aliased."""
+    out = StreamingResampler(48000).process(tone(1.0, 10000, 48000))[200:]
+    assert rms(out) < 0.02 * 8000
+
+def test_stereo_is_downmixed():
+    """Tests that interleaved stereo input is averaged to mono."""
+    left = tone(0.5, 440, 48000)
+    stereo = np.stack([left, np.zeros_like(left)], axis=1).ravel()
+    out = StreamingResampler(48000, channels=2).process(stereo)
+    expected = StreamingResampler(48000).process((left // 2).astype(np.int16))
+    assert len(out) == 8000
+    assert np.abs(out.astype(int) - expected).max() <= 1
+
+def test_matching_format_passes_through():
+    """Tests that 16 kHz mono input is returned untouched."""
+    samples = tone(0.1, 440, 16000)
+    resampler = StreamingResampler(16000)
+    assert resampler.passthrough
+    assert resampler.process(samples) is samples
+
+def test_full_scale_input_is_clipped():
+    """Tests that filter overshoot on a full-scale square wave does not wrap around."""
+    square = np.where(tone(0.2, 300, 48000) >= 0, 32767, -32768).astype(np.int16)
+    out = StreamingResampler(48000).process(square)
+    assert out.max() == 32767 and out.min() == -32768
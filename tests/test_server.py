@@ -0,0 +1,95 @@
+import pytest
+import io
+import socket
+import subprocess
+import sys
+import threading
+import wave
+from types import SimpleNamespace
+import numpy as np
+from vocalink.server import TranscriptionServer, decode_audio, read_message, send_message
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+
+class FakeTranscriber:
+    """Reports the length of the audio in seconds as its transcript."""
+
+    model_size = "fake"
+
+    def transcribe(self, audio, word_replacements=None, trace=None):
+        with trace.span("decode"):
+            return f"{len(audio) / 16000:g} seconds"
+
+    def transcribe_segments(self, audio, **options):
+        words = [SimpleNamespace(word=f" w{i}", start=i, end=i + 1.0) for i in range(int(len(audio) // 16000))]
+        return [SimpleNamespace(text="".join(w.word for w in words), words=words)]
+
+    def format_text(self, texts, word_replacements=None):
+        return "".join(texts).strip()
+
+@pytest.fixture
+def client(tmp_path):
+    """Starts a server on a temporary socket and returns a connected (rfile, wfile) pair."""
+    server = TranscriptionServer(str(tmp_path / "test.sock"), FakeTranscriber())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(str(tmp_path / "test.sock"))
+    sock.settimeout(5)
+    yield sock.makefile("rb"), sock.makefile("wb")
+    sock.close()
+    server.shutdown()
+    server.server_close()
+
+def pcm(seconds):
+    return np.zeros(int(16000 * seconds), dtype="<i2").tobytes()
+
+def test_ping_and_transcribe_pcm(client):
+    """Tests a one-shot transcription of raw PCM."""
+    rfile, wfile = client
+    send_message(wfile, {"op": "ping"})
+    assert read_message(rfile)[0] == {"ok": True, "model": "fake"}
+    send_message(wfile, {"op": "transcribe", "format": "pcm"}, pcm(2))
+    reply = read_message(rfile)[0]
+    assert reply["text"] == "2 seconds"
+    assert reply["audio_seconds"] == 2
+
+def test_streaming_sends_partials_and_final_text(client):
+    """Tests that a stream reports partial hypotheses before the final transcript."""
+    rfile, wfile = client
+    send_message(wfile, {"op": "stream_start"})
+    assert read_message(rfile)[0] == {"ok": True}
+    send_message(wfile, {"op": "chunk"}, pcm(2))
+    partial = read_message(rfile)[0]
+    assert partial["partial"] is True
+    send_message(wfile, {"op": "stream_end"})
+    while True:
+        reply = read_message(rfile)[0]
+        if reply.get("final"):
+            break
+    assert reply["text"]
+
+def test_errors_are_reported_and_connection_stays_usable(client):
+    """Tests that a bad request gets an error reply instead of closing the connection."""
+    rfile, wfile = client
+    send_message(wfile, {"op": "chunk"}, pcm(0.1))
+    assert "error" in read_message(rfile)[0]
+    send_message(wfile, {"op": "ping"})
+    assert read_message(rfile)[0]["ok"]
+
+def test_decode_wav_downmixes_stereo():
+    """Tests that stereo WAV payloads are mixed down to mono."""
+    data = io.BytesIO()
+    with wave.open(data, "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(np.array([16384, 0] * 100, dtype="<i2").tobytes())
+    audio = decode_audio(data.getvalue(), "wav")
+    assert len(audio) == 100
+    assert audio[0] == pytest.approx(0.25)
+
+def test_serve_does_not_import_gui_modules():
+    """Tests that the headless server module pulls in no GUI toolkit."""
+    code = "import sys, vocalink.server; print(sorted({'tkinter', 'customtkinter', 'pystray', 'pyaudio'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,94 @@
+import threading
+import time
+from types import SimpleNamespace
+from vocalink.streaming import StreamingTranscriber
+import numpy as np
+
+class FakeTranscriber:
+    """Pretends every second of audio contains one spoken word."""
+
+    def __init__(self):
+        self.decoded_lengths = []
+
+    def transcribe_segments(self, audio, **options):
+        self.decoded_lengths.append(len(audio))
+        words = [SimpleNamespace(word=f" w{i}", start=i, end=i + 1.0) for i in range(int(len(audio) // 16000))]
+        return [SimpleNamespace(text="".join(w.word for w in words), words=words)]
+
+    def format_text(self, texts, word_replacements=None):
+        return "".join(texts).strip()
+
+def test_finish_decodes_only_uncommitted_tail():
+    """Tests that committed audio is dropped before the final decode."""
+    transcriber = FakeTranscriber()
+    session = StreamingTranscriber(transcriber, step_seconds=60.0)
+    session.feed(np.zeros(16000 * 3, dtype=np.float32))
+    session._update()
+    session._update()
+    assert session.committed_words
+    session.feed(np.zeros(16000, dtype=np.float32))
+    text = session.finish()
+    assert text
+    assert transcriber.decoded_lengths[-1] < 16000 * 4
+
+def test_partial_callback():
+    """Tests that partial hypotheses are reported through the callback."""
+    partials = []
+    session = StreamingTranscriber(FakeTranscriber(), on_partial=lambda c, t: partials.append((c, t)), step_seconds=60.0)
+    session.feed(np.zeros(16000 * 2, dtype=np.float32))
+    session._update()
+    session.finish()
+    assert partials and partials[0][1]
+
+def test_cancel_skips_the_final_decode():
+    """Tests that a cancelled session stops without decoding its tail."""
+    transcriber = FakeTranscriber()
+    session = StreamingTranscriber(transcriber, step_seconds=60.0)
+    session.feed(np.zeros(16000, dtype=np.float32))
+    session.cancel()
+    session._thread.join(2)
+    assert not session._thread.is_alive()
+    assert transcriber.decoded_lengths == []
+
+def test_cancel_does_not_wait_for_a_decode_in_progress():
+    """Tests that cancel returns while a decode is still running and no partial is reported after it."""
+    decoding, finish = threading.Event(), threading.Event()
+    transcriber = FakeTranscriber()
+    decode = transcriber.transcribe_segments
+
+    def blocking_decode(audio, **options):
+        decoding.set()
+        finish.wait(5)
+        return decode(audio, **options)
+    transcriber.transcribe_segments = blocking_decode
+    partials = []
+    session = StreamingTranscriber(transcriber, on_partial=lambda c, t: partials.append(t), step_seconds=1.0)
+    session.feed(np.zeros(16000 * 2, dtype=np.float32))
+    assert decoding.wait(2)
+    session.cancel()
+    assert session._thread.is_alive() # Returned without joining
+    finish.set()
+    session._thread.join(2)
+    assert not session._thread.is_alive()
+    assert partials == []
+
+def test_trace_decode_covers_every_window_decode():
+    """Tests that a streaming trace's decode stage (and so its RTF) sums all decodes, with the tail kept apart."""
+    from vocalink.tracing import DictationTrace
+    transcriber = FakeTranscriber()
+    decode = transcriber.transcribe_segments
+
+    def slow_decode(audio, **options):
+        time.sleep(0.02)
+        return decode(audio, **options)
+    transcriber.transcribe_segments = slow_decode
+    session = StreamingTranscriber(transcriber, step_seconds=60.0)
+    session.feed(np.zeros(16000 * 3, dtype=np.float32))
+    session._update()
+    session._update()
+    session.feed(np.zeros(16000, dtype=np.float32))
+    trace = DictationTrace()
+    session.finish(trace=trace)
+    assert len(transcriber.decoded_lengths) == 3
+    assert trace.stages["decode"] >= 60.0
+    assert trace.stages["tail_decode"] < trace.stages["decode"]
@@ -0,0 +1,57 @@
+import pytest
+from vocalink.tracing import DictationTrace, TraceLog, percentile, summarize
+from vocalink.worker import TranscriptionWorker
+
+def test_trace_records_spans_events_and_rtf():
+    """Tests that spans, events and the real-time factor end up in the trace record."""
+    trace = DictationTrace()
+    with trace.span("decode"):
+        pass
+    trace.stages["decode"] = 500.0
+    trace.mark("release")
+    trace.add("first_frame", None) # Unknown measurements are skipped
+    trace.attributes["audio_seconds"] = 2.0
+    record = trace.to_dict()
+    assert record["rtf"] == pytest.approx(0.25)
+    assert "first_frame" not in record["stages"]
+    assert record["events"]["release"] >= 0
+    assert trace.since("release") >= 0
+
+def test_trace_log_stays_bounded(tmp_path):
+    """Tests that the log is compacted to the newest entries once it doubles in size."""
+    log = TraceLog(path=str(tmp_path / "traces.jsonl"), max_entries=3)
+    for i in range(7):
+        log.append({"stages": {"decode": float(i)}})
+    decodes = [trace["stages"]["decode"] for trace in log.read()]
+    assert decodes == [3.0, 4.0, 5.0, 6.0]
+    assert [trace["stages"]["decode"] for trace in log.read(last=2)] == [5.0, 6.0]
+
+def test_trace_log_skips_truncated_lines(tmp_path):
+    """Tests that a partially written line does not break reading the log."""
+    path = tmp_path / "traces.jsonl"
+    path.write_text('{"stages": {"paste": 1.0}}\n{"stages": {"pa\n')
+    assert TraceLog(path=str(path)).read() == [{"stages": {"paste": 1.0}}]
+
+def test_summarize_reports_percentiles_per_stage():
+    """Tests that stats are computed per stage, only over traces that have the stage."""
+    traces = [{"stages": {"decode": float(ms), "paste": 10.0}, "rtf": 0.1} for ms in range(1, 101)]
+    traces.append({"stages": {"paste": 10.0}})
+    summary = summarize(traces)
+    assert summary["decode"]["count"] == 100
+    assert summary["decode"]["p50"] == pytest.approx(50.5)
+    assert summary["decode"]["p99"] == pytest.approx(99.01)
+    assert summary["paste"]["count"] == 101
+    assert summary["rtf"]["p95"] == pytest.approx(0.1)
+    assert percentile([], 50) is None
+
+def test_worker_adds_queue_and_decode_spans():
+    """Tests that the worker passes the trace through to the transcriber."""
+    class TracingTranscriber:
+        def transcribe(self, audio, word_replacements=None, trace=None):
+            with trace.span("decode"):
+                return "text"
+    trace = DictationTrace()
+    worker = TranscriptionWorker(TracingTranscriber(), lambda job: None)
+    worker.submit(audio="clip", trace=trace)
+    worker.stop(timeout=5)
+    assert {"queue_wait", "decode"} <= set(trace.stages)
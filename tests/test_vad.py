@@ -0,0 +1,31 @@
+import numpy as np
+from vocalink.vad import EnergyVAD
+
+def tone(seconds, amplitude, sample_rate=16000):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+
+def noise(seconds, amplitude, sample_rate=16000):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(seconds * sample_rate)) * amplitude).astype(np.int16)
+
+def test_leading_and_trailing_silence_is_trimmed():
+    """Tests that the bounds cover the loud part plus the padding."""
+    vad = EnergyVAD(padding_ms=100)
+    samples = np.concatenate([noise(1.0, 20), tone(0.5, 8000), noise(1.0, 20)])
+    start, end = vad.speech_bounds(samples)
+    assert 16000 - 1600 - 480 <= start <= 16000 - 1600 + 480
+    assert 24000 + 1600 - 480 <= end <= 24000 + 1600 + 480
+
+def test_silent_recording_is_rejected():
+    """Tests that background noise alone does not count as speech."""
+    assert EnergyVAD().speech_bounds(noise(2.0, 300)) is None
+
+def test_short_tap_is_rejected():
+    """Tests that recordings shorter than the minimum speech length are rejected outright."""
+    assert EnergyVAD(min_speech_ms=200).speech_bounds(tone(0.1, 8000)) is None
+
+def test_speech_filling_the_recording_is_kept_whole():
+    """Tests that a recording without silence is not shortened."""
+    samples = tone(1.0, 8000)
+    assert EnergyVAD().speech_bounds(samples) == (0, len(samples))
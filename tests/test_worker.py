@@ -0,0 +1,25 @@
+from vocalink.worker import TranscriptionWorker
+import threading
+
+class SlowTranscriber:
+    """Returns the audio as text once allowed to proceed."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def transcribe(self, audio, word_replacements=None, trace=None):
+        self.release.wait(5)
+        return audio
+
+def test_submit_returns_immediately_and_results_keep_order():
+    """Tests that submission does not block and results arrive in submission order."""
+    transcriber = SlowTranscriber()
+    results = []
+    worker = TranscriptionWorker(transcriber, lambda job: results.append(job.text))
+    jobs = [worker.submit(audio=f"clip {i}") for i in range(3)]
+    assert worker.queue_depth == 3
+    transcriber.release.set()
+    worker.stop(timeout=5)
+    assert results == ["clip 0", "clip 1", "clip 2"]
+    assert all(job.wait_ms is not None and job.decode_ms is not None for job in jobs)
+    assert worker.stats()["completed"] == 3
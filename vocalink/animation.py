@@ -1,8 +1,8 @@
 # animation.py  – minimal, centred 7-bar sound overlay  ─────────
 # pip install pyside6 pyaudio
 
-import math, sys, time, array, threading, ctypes, signal
-import pyaudio
+import math, sys, time, array, threading, ctypes, signal, struct, argparse
+from   multiprocessing import shared_memory
 from   PySide6.QtCore    import Qt, QTimer, QRectF, QPoint
 from   PySide6.QtGui     import QColor, QPainter, QGuiApplication
 from   PySide6.QtWidgets import QApplication, QWidget
@@ -40,9 +40,10 @@ def _enable_win_blur(hwnd: int):
         pass
 
 class MicSampler(threading.Thread):
-    """Background thread that continuously measures mic RMS level."""
+    """Background thread that continuously measures mic RMS level (standalone mode)."""
     def __init__(self):
         super().__init__(daemon=True)
+        import pyaudio
         self.level  = 0.0
         self.running= True
         pa          = pyaudio.PyAudio()
@@ -60,8 +61,42 @@ class MicSampler(threading.Thread):
         self.running = False
         self.stream.close()
 
+class SharedLevel:
+    """Mic level published by the main app's AudioRecorder in shared memory."""
+    def __init__(self, name):
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:                       # Python < 3.13 has no track=
+            self.shm = shared_memory.SharedMemory(name=name)
+            try:                                # the owner unlinks it, not us
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+            except Exception:
+                pass
+    @property
+    def level(self):
+        return struct.unpack_from("d", self.shm.buf, 0)[0]
+    def stop(self):
+        self.shm.close()
+
+class CommandReader(threading.Thread):
+    """Reads show/hide/quit commands from the parent over stdin."""
+    def __init__(self, stream):
+        super().__init__(daemon=True)
+        self.stream  = stream
+        self.pending = []
+        self.lock    = threading.Lock()
+    def run(self):
+        for line in self.stream:
+            with self.lock: self.pending.append(line.strip())
+        with self.lock: self.pending.append("quit")   # parent went away
+    def take(self):
+        with self.lock:
+            cmds, self.pending = self.pending, []
+        return cmds
+
 class RecordingOverlay(QWidget):
-    def __init__(self):
+    def __init__(self, mic, commands=None):
         super().__init__(None, Qt.FramelessWindowHint |
                                Qt.WindowStaysOnTopHint | Qt.Tool)
         self.setAttribute(Qt.WA_TranslucentBackground)
@@ -75,11 +110,25 @@ class RecordingOverlay(QWidget):
             _enable_win_blur(int(self.winId()))
 
         self._t0  = time.time()
-        self.mic  = MicSampler(); self.mic.start()
-        self.tmr  = QTimer(self, timeout=self.update, interval=1000//FPS)
+        self.mic  = mic
+        self.cmds = commands
+        self.tmr  = QTimer(self, timeout=self._tick, interval=1000//FPS)
         self.tmr.start()
         signal.signal(signal.SIGINT, lambda *_: self.close())
 
+    # ---------- commands (checked every frame, so show takes <= 1 frame) -----
+    def _tick(self):
+        if self.cmds:
+            for cmd in self.cmds.take():
+                if cmd == "show":
+                    self._t0 = time.time(); self.show()
+                elif cmd == "hide":
+                    self.hide()
+                elif cmd == "quit":
+                    self.close(); return
+        if self.isVisible():
+            self.update()
+
     # ---------- painting ----------------------------------------------------
     def paintEvent(self, _):
         p = QPainter(self)
@@ -114,8 +163,21 @@ class RecordingOverlay(QWidget):
         QApplication.quit(); e.accept()
 
 # ---------------- entry-point ---------------------------------------------
+# Standalone:  python animation.py              (samples the mic itself)
+# From VocalInk: python animation.py --ipc NAME  (stays hidden until "show";
+#                level comes from shared memory NAME, commands from stdin)
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ipc", metavar="SHM_NAME")
+    args = ap.parse_args()
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
-    app = QApplication(sys.argv)
-    RecordingOverlay().show()
+    app = QApplication(sys.argv[:1])
+    if args.ipc:
+        reader  = CommandReader(sys.stdin); reader.start()
+        overlay = RecordingOverlay(SharedLevel(args.ipc), reader)
+        print("ready", flush=True) # Handshake: the parent waits for this before sending commands
+    else:
+        mic     = MicSampler(); mic.start()
+        overlay = RecordingOverlay(mic)
+        overlay.show()
     sys.exit(app.exec())
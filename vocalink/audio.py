@@ -1,79 +1,325 @@
 
 import pyaudio
 import wave
-from collections import deque
+import numpy as np
 import threading
 import time
+from vocalink.buffers import CaptureBuffer, LevelHistory, RingBuffer
+from vocalink.resample import StreamingResampler
 
 class AudioRecorder:
-    """Records audio from a microphone and saves it to a WAV file."""
+    """Records audio from a microphone and hands it over in memory or as a WAV file.
 
-    def __init__(self, chunk_size=1024, channels=1, sample_rate=16000):
-        self.chunk_size = chunk_size
+    By default a stream is opened for each recording. With open_warm_stream()
+    the input stream stays open between recordings and keeps the last
+    preroll_ms of audio in a small ring buffer; starting a recording is then
+    just a flag flip that prepends that pre-roll, so the first syllable spoken
+    as the hotkey goes down is not lost and no device is opened on the press.
+
+    sample_rate and channels describe the audio handed out. With native_rate
+    the device is opened at its own default rate (often 44.1 or 48 kHz) and
+    every chunk is resampled and downmixed once, in the callback, instead of
+    leaving the conversion to the host driver.
+    """
+
+    def __init__(self, chunk_size=1024, channels=1, sample_rate=16000, max_seconds=None, preroll_ms=400, vad=None,
+                 native_rate=True):
+        self.chunk_size = chunk_size # Frames per chunk at sample_rate; scaled to the capture rate
         self.channels = channels
         self.sample_rate = sample_rate
-        self.frames = deque()
+        self.native_rate = native_rate
+        self.capture_rate = sample_rate # Format the device is actually opened with
+        self.capture_channels = channels
+        self.resampler = None
+        self.max_seconds = max_seconds # Longest recording kept; later audio is dropped
+        self.vad = vad # Optional EnergyVAD that trims silence when recording stops
+        self.buffer = self._new_buffer()
         self.recording = False
         self.p = pyaudio.PyAudio()
         self.stream = None
+        self.warm = False # True while a warm stream is open
+        self.warm_device = None
+        self.stream_device = None # PortAudio index the current stream was opened on (None: default input)
+        self.preroll = RingBuffer(int(preroll_ms * sample_rate / 1000) * channels)
+        self._state_lock = threading.Lock() # Guards the switch between pre-roll and recording in the callback
+        self.on_chunk = None
+        self.on_level = None # Called with the 0..1 level of every captured chunk, e.g. to drive the overlay
+        self.level = 0.0 # Level of the most recent chunk
+        self.level_history = LevelHistory() # Recent chunk levels, for waveform displays
+        self.overflows = 0 # Input overflows reported by PortAudio during the current recording
+        self.timings = {} # Latency measurements of the last recording, in milliseconds
+        self._start_time = None
+        self._first_frame_time = None
+
+    def start_recording(self, device_index=None, on_chunk=None):
+        """Starts recording audio from the specified device.
+
+        If given, on_chunk is called with every chunk of int16 PCM bytes as it is captured.
+        Capture runs in PortAudio's callback thread, so no reader thread is needed.
+        """
+        if self.warm and device_index != self.warm_device:
+            self.open_warm_stream(device_index) # Device changed: pay the open once, off later presses
+        self._start_time = time.perf_counter()
+        if self.warm:
+            with self._state_lock:
+                self._reset_recording(on_chunk)
+                preroll = self.preroll.snapshot()
+                self.preroll.clear()
+                self.buffer.write(preroll)
+                self._first_frame_time = self._start_time # Audio is available immediately
+                self.recording = True
+                if on_chunk and len(preroll):
+                    on_chunk(preroll.tobytes()) # Before any live chunk, to keep listeners in order
+            self.timings["stream_open_ms"] = 0.0
+            self.timings["preroll_ms"] = len(preroll) / self.channels / self.sample_rate * 1000
+            return
 
-    def start_recording(self, device_index=None):
-        """Starts recording audio from the specified device."""
-        self.frames.clear()
+        self._reset_recording(on_chunk)
         self.recording = True
-        self.stream = self.p.open(
+        try:
+            self.stream = self._open_stream(device_index)
+        except Exception:
+            self.recording = False
+            raise
+        self.timings["stream_open_ms"] = (time.perf_counter() - self._start_time) * 1000
+
+    def set_preroll_ms(self, preroll_ms):
+        """Resizes the pre-roll kept by the warm stream."""
+        capacity = int(preroll_ms * self.sample_rate / 1000) * self.channels
+        with self._state_lock:
+            if capacity != self.preroll.capacity:
+                self.preroll = RingBuffer(capacity)
+
+    def _reset_recording(self, on_chunk):
+        # Use a fresh buffer so audio handed out from the previous recording stays valid
+        self.buffer = self._new_buffer()
+        self.on_chunk = on_chunk
+        self.overflows = 0
+        self.timings = {}
+        self._first_frame_time = None
+
+    def _open_stream(self, device_index):
+        rate, channels = self._capture_format(device_index)
+        resampler = StreamingResampler(rate, self.sample_rate, channels)
+        if (rate, channels) != (self.capture_rate, self.capture_channels):
+            mode = "no conversion" if resampler.passthrough else f"converting to {self.sample_rate} Hz mono"
+            print(f"Capturing at {rate} Hz, {channels} channel(s); {mode}.", flush=True)
+        self.capture_rate, self.capture_channels, self.resampler = rate, channels, resampler
+        self.stream_device = device_index
+        return self.p.open(
             format=pyaudio.paInt16,
-            channels=self.channels,
-            rate=self.sample_rate,
+            channels=channels,
+            rate=rate,
             input=True,
-            frames_per_buffer=self.chunk_size,
+            frames_per_buffer=max(int(self.chunk_size * rate / self.sample_rate), 1),
             input_device_index=device_index,
+            stream_callback=self._on_audio,
         )
-        threading.Thread(target=self._record_loop, daemon=True).start()
 
-    def _record_loop(self):
-        """Continuously reads audio data from the stream."""
-        while self.recording:
+    def _capture_format(self, device_index):
+        """Returns the (rate, channels) to open the device with: its native rate, mono if it can."""
+        if not self.native_rate or self.channels != 1:
+            return self.sample_rate, self.channels
+        try:
+            if device_index is None:
+                info = self.p.get_default_input_device_info()
+            else:
+                info = self.p.get_device_info_by_index(device_index)
+        except (IOError, OSError):
+            return self.sample_rate, self.channels # No default device; let open() report it
+        rate = int(info["defaultSampleRate"])
+        for channels in dict.fromkeys((1, max(int(info["maxInputChannels"]), 1))):
             try:
-                data = self.stream.read(self.chunk_size)
-                self.frames.append(data)
-            except OSError as e:
-                if e.errno == -9999:
-                    print("PyAudio error -9999: Input overflowed. Retrying...")
-                    time.sleep(0.1)
-                else:
-                    raise
-
-    def stop_recording(self, output_filename="output.wav"):
-        """Stops recording and saves the audio to a file."""
-        if not self.recording:
+                self.p.is_format_supported(rate, input_device=info["index"], input_channels=channels,
+                                           input_format=pyaudio.paInt16)
+                return rate, channels
+            except ValueError:
+                pass
+        return self.sample_rate, self.channels
+
+    def open_warm_stream(self, device_index=None):
+        """Keeps an input stream open between recordings, buffering a short pre-roll."""
+        self.close_warm_stream()
+        self.preroll.clear()
+        self.stream = self._open_stream(device_index)
+        self.warm = True
+        self.warm_device = device_index
+
+    def close_warm_stream(self):
+        """Closes the warm stream, if any; later recordings open their own stream again."""
+        if not self.warm:
             return
-        self.recording = False
-        # Add a small delay to ensure the recording loop has time to exit
-        time.sleep(0.1)
+        self.warm = False
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
         self.stream = None
-        self.save_to_file(output_filename)
 
-    def save_to_file(self, filename):
-        """Saves the recorded audio frames to a WAV file."""
+    def close(self):
+        """Closes any open stream and releases PortAudio."""
+        self.close_warm_stream()
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+        self.recording = False
+        if self.p:
+            self.p.terminate()
+            self.p = None
+
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """PyAudio callback that stores each captured chunk."""
+        resampler = self.resampler
+        if resampler is not None and not resampler.passthrough:
+            resample_start = time.perf_counter()
+            in_data = resampler.process(in_data).tobytes()
+            resample_ms = (time.perf_counter() - resample_start) * 1000
+        else:
+            resample_ms = 0.0
+        with self._state_lock:
+            if not self.recording:
+                self.preroll.write(in_data) # Warm stream between recordings
+                return (None, pyaudio.paContinue)
+            self._store_chunk(in_data, status)
+            if resample_ms:
+                self.timings["resample_ms"] = self.timings.get("resample_ms", 0.0) + resample_ms
+            # Delivered under the lock, so no chunk reaches the listener once stop_recording has returned
+            on_chunk = self.on_chunk
+            if on_chunk:
+                try:
+                    on_chunk(in_data)
+                except Exception as e:
+                    print(f"ERROR: Audio chunk listener failed: {e}", flush=True)
+        return (None, pyaudio.paContinue)
+
+    def _store_chunk(self, in_data, status):
+        if self._first_frame_time is None:
+            self._first_frame_time = time.perf_counter()
+        if status & pyaudio.paInputOverflow:
+            self.overflows += 1
+        self.buffer.write(in_data)
+        self.level = chunk_level(np.frombuffer(in_data, dtype=np.int16))
+        self.level_history.push(self.level)
+        if self.on_level:
+            self.on_level(self.level)
+
+    def stop_recording(self, output_filename=None):
+        """Stops recording and returns the audio as a float32 array.
+
+        With a VAD, leading and trailing silence is trimmed and a recording with
+        too little speech comes back as an empty array. If output_filename is
+        given, the audio is also written to that WAV file on a background thread.
+        """
+        if not self.recording:
+            return None
+        stop_time = time.perf_counter()
+        if self.warm:
+            # The stream keeps running into the pre-roll; the lock waits out an in-flight callback
+            with self._state_lock:
+                self.recording = False
+        else:
+            # Stopping the stream waits for the in-flight callback, so every captured
+            # chunk is in the buffer once it returns; no extra delay is needed.
+            if self.stream:
+                self.stream.stop_stream()
+                self.stream.close()
+            self.stream = None
+            self.recording = False
+        self.level = 0.0
+        self.level_history.clear()
+        if self.on_level:
+            self.on_level(0.0)
+        if self.overflows:
+            print(f"PyAudio reported {self.overflows} input overflow(s) during recording.", flush=True)
+        if self.buffer.dropped:
+            print(f"Recording exceeded {self.max_seconds} s; {self.buffer.dropped} samples were dropped.", flush=True)
+        samples = self.get_samples()
+        if self.vad is not None:
+            samples = self._trim_silence(samples)
+        if output_filename and len(samples):
+            self.save_to_file_async(output_filename, samples)
+        audio = int16_to_float32(samples)
+        if self._first_frame_time is not None:
+            self.timings["start_to_first_frame_ms"] = (self._first_frame_time - self._start_time) * 1000
+        self.timings["stop_to_audio_ready_ms"] = (time.perf_counter() - stop_time) * 1000
+        return audio
+
+    def _trim_silence(self, samples):
+        """Returns the speech part of the samples (a view), or an empty view if there is no speech."""
+        vad_start = time.perf_counter()
+        bounds = self.vad.speech_bounds(samples)
+        trimmed = samples[:0] if bounds is None else samples[bounds[0]:bounds[1]]
+        self.timings["vad_ms"] = (time.perf_counter() - vad_start) * 1000
+        self.timings["trimmed_ms"] = (len(samples) - len(trimmed)) / self.channels / self.sample_rate * 1000
+        return trimmed
+
+    def _new_buffer(self):
+        max_samples = None
+        if self.max_seconds:
+            max_samples = int(self.max_seconds * self.sample_rate * self.channels)
+        return CaptureBuffer(max_samples=max_samples)
+
+    def get_samples(self):
+        """Returns the recorded audio as an int16 array view (no copy)."""
+        return self.buffer.view()
+
+    def get_audio(self):
+        """Returns the recorded audio as a float32 array in [-1, 1], as expected by Whisper."""
+        return int16_to_float32(self.get_samples())
+
+    def save_to_file(self, filename, samples=None):
+        """Saves the recorded audio (or the given int16 samples) to a WAV file."""
+        if samples is None:
+            samples = self.get_samples()
         wf = wave.open(filename, "wb")
         wf.setnchannels(self.channels)
         wf.setsampwidth(self.p.get_sample_size(pyaudio.paInt16))
         wf.setframerate(self.sample_rate)
-        wf.writeframes(b"".join(self.frames))
+        wf.writeframes(memoryview(samples).cast("B"))
         wf.close()
 
+    def save_to_file_async(self, filename, samples=None):
+        """Saves the audio to a WAV file on a background thread and returns the thread."""
+        if samples is None:
+            samples = self.get_samples()
+        thread = threading.Thread(target=self._save_quietly, args=(filename, samples), daemon=True)
+        thread.start()
+        return thread
+
+    def _save_quietly(self, filename, samples):
+        try:
+            self.save_to_file(filename, samples)
+        except OSError as e:
+            print(f"ERROR: Failed to save recording to {filename}: {e}", flush=True)
+
     def list_microphones(self):
-        """Returns a list of available input devices."""
-        mic_list = []
-        for i in range(self.p.get_device_count()):
-            dev = self.p.get_device_info_by_index(i)
-            if dev['maxInputChannels'] > 0:
-                mic_list.append(dev['name'])
-        return mic_list
+        """Returns the names of the available input devices (see devices.DeviceRegistry for a cached list)."""
+        from vocalink.devices import scan_input_devices
+        return [device.name for device in scan_input_devices(self.p)]
+
+    def reinitialize(self):
+        """Restarts PortAudio so that devices plugged in since it started become usable.
+
+        Closes the warm stream; the caller reopens it. Must not be called while recording.
+        """
+        self.close_warm_stream()
+        if self.p:
+            self.p.terminate()
+        self.p = pyaudio.PyAudio()
+        self.capture_rate, self.capture_channels = self.sample_rate, self.channels
 
     def __del__(self):
-        self.p.terminate()
+        if self.p:
+            self.p.terminate()
+
+
+def int16_to_float32(samples):
+    """Converts int16 samples to a float32 array in [-1, 1]."""
+    return samples.astype(np.float32) / 32768.0
+
+def chunk_level(samples):
+    """Returns the RMS level of int16 samples scaled to 0..1 for level meters."""
+    if not len(samples):
+        return 0.0
+    rms = np.sqrt(np.mean(np.square(samples, dtype=np.float32)))
+    return min(float(rms) / 6000, 1.0)
@@ -0,0 +1,150 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+# Batch transcription of existing recordings for `vocalink transcribe`. Files
+# are spread over a pool of processes, each holding its own model, and the CPU
+# cores are split between them so the workers do not oversubscribe the machine.
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".flac", ".m4a", ".ogg", ".opus", ".webm", ".mp4")
+
+def find_audio_files(paths, extensions=AUDIO_EXTENSIONS):
+    """Expands files and directories (recursively) into a sorted list of audio files."""
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.update(os.path.join(root, name) for name in names if name.lower().endswith(extensions))
+        elif os.path.isfile(path):
+            files.add(path)
+        else:
+            print(f"WARNING: {path} does not exist, skipping.", file=sys.stderr, flush=True)
+    return sorted(os.path.abspath(f) for f in files)
+
+def file_signature(path):
+    """Identifies a file version by size and modification time."""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+def load_done(jsonl_path):
+    """Returns {path: signature} for files already transcribed successfully in a JSONL output."""
+    done = {}
+    try:
+        with open(jsonl_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue # Skip a line truncated by an interrupted run
+                if "error" not in record:
+                    done[record["path"]] = {"size": record.get("size"), "mtime": record.get("mtime")}
+    except FileNotFoundError:
+        pass
+    return done
+
+def pending_files(files, done):
+    """Drops files whose current version was already transcribed."""
+    pending = []
+    for path in files:
+        try:
+            if done.get(path) == file_signature(path):
+                continue
+        except OSError:
+            pass # Gone since it was listed; transcribe_file reports it
+        pending.append(path)
+    return pending
+
+def split_threads(workers, cpu_count=None):
+    """Returns the CTranslate2 thread count per worker so that all workers together use every core once."""
+    return max(1, (cpu_count or os.cpu_count() or 1) // max(workers, 1))
+
+
+_transcriber = None
+_word_replacements = None
+
+def _init_worker(model_size, language, profile, cpu_threads, whole_words, ignore_case, word_replacements):
+    """Loads one model per worker process."""
+    global _transcriber, _word_replacements
+    from vocalink.transcriber import Transcriber
+    _transcriber = Transcriber(configured_model_size=model_size, language=language, profile=profile, cpu_threads=cpu_threads)
+    _transcriber.whole_word_replacements = whole_words
+    _transcriber.ignore_case_replacements = ignore_case
+    _word_replacements = word_replacements
+
+def transcribe_file(path):
+    """Transcribes one file in a worker process and returns its result record."""
+    from vocalink.tracing import DictationTrace
+    record = {"path": path}
+    trace = DictationTrace()
+    try:
+        record.update(file_signature(path)) # Raises if the file was deleted or is unreadable since it was listed
+        record["text"] = _transcriber.transcribe(path, word_replacements=_word_replacements, trace=trace)
+        record["decode_ms"] = trace.stages["decode"]
+    except Exception as e:
+        record["error"] = str(e)
+    return record
+
+def main(argv=None):
+    """Entry point for `vocalink transcribe`."""
+    import argparse
+    from vocalink.config import load_config
+    config = load_config()
+    parser = argparse.ArgumentParser(prog="vocalink transcribe", description="Transcribe audio files with a pool of worker processes.")
+    parser.add_argument("paths", nargs="+", help="Audio files or directories (searched recursively).")
+    parser.add_argument("--output", help="Append results to this JSONL file; files already in it are skipped.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per 4 cores).")
+    parser.add_argument("--cpu-threads", type=int, default=None, help="Threads per worker (default: cores / workers).")
+    parser.add_argument("--model", default=None, help="Model size (default: model_size from the config).")
+    parser.add_argument("--profile", default=None, help="Decoding profile (default: decoding_profile from the config).")
+    parser.add_argument("--force", action="store_true", help="Transcribe files even if the output already has them.")
+    args = parser.parse_args(argv)
+
+    files = find_audio_files(args.paths)
+    if args.output and not args.force:
+        skipped = len(files)
+        files = pending_files(files, load_done(args.output))
+        skipped -= len(files)
+        if skipped:
+            print(f"Skipping {skipped} file(s) already in {args.output}.", file=sys.stderr, flush=True)
+    if not files:
+        print("Nothing to transcribe.", file=sys.stderr, flush=True)
+        return
+
+    cpu_count = os.cpu_count() or 1
+    workers = min(args.workers or max(1, cpu_count // 4), len(files))
+    cpu_threads = args.cpu_threads or split_threads(workers, cpu_count)
+    model_size = args.model or config.model_size
+    if model_size == "auto":
+        from vocalink.calibration import calibrated_model_size
+        model_size = calibrated_model_size(config.auto_model_max_rtf, default="base")
+    print(f"Transcribing {len(files)} file(s) with {workers} worker(s) x {cpu_threads} thread(s), model '{model_size}'.",
+          file=sys.stderr, flush=True)
+
+    import multiprocessing
+    output = open(args.output, "a", encoding="utf-8") if args.output else None
+    start = time.perf_counter()
+    failed = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker,
+                                 initargs=(model_size, config.transcription_language, args.profile or config.decoding_profile,
+                                           cpu_threads, config.replacement_whole_words,
+                                           config.replacement_ignore_case, config.word_replacements)) as pool:
+            futures = [pool.submit(transcribe_file, path) for path in files]
+            for future in as_completed(futures):
+                record = future.result()
+                failed += "error" in record
+                if output:
+                    output.write(json.dumps(record) + "\n")
+                    output.flush() # Each finished file survives an interrupted run
+                    print(f"{record['path']}: {record.get('text', 'ERROR: ' + record.get('error', ''))}", flush=True)
+                else:
+                    print(json.dumps(record), flush=True)
+    except BrokenProcessPool:
+        raise SystemExit("ERROR: The worker processes stopped unexpectedly; see the errors above (e.g. the model failed to load).")
+    finally:
+        if output:
+            output.close()
+    print(f"Done: {len(files) - failed} transcribed, {failed} failed in {time.perf_counter() - start:.1f} s.", file=sys.stderr, flush=True)
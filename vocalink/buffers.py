@@ -0,0 +1,128 @@
+import numpy as np
+
+class CaptureBuffer:
+    """Contiguous, growable sample buffer with a write cursor.
+
+    Samples are written into one preallocated NumPy array that doubles in size
+    when it fills up, up to an optional maximum length. Snapshots are views over
+    the written prefix, so consumers get the audio without copying it. The
+    buffer is never rewound: start a new buffer for each recording so that
+    views handed out earlier stay valid.
+    """
+
+    def __init__(self, initial_samples=16000 * 30, max_samples=None, dtype=np.int16):
+        if max_samples is not None:
+            initial_samples = min(initial_samples, max_samples)
+        self._data = np.empty(max(initial_samples, 1), dtype=dtype)
+        self._cursor = 0
+        self.max_samples = max_samples
+        self.dropped = 0  # Samples discarded because the maximum length was reached
+
+    def write(self, samples):
+        """Appends samples (an array or raw bytes) and returns how many were stored."""
+        if isinstance(samples, (bytes, bytearray, memoryview)):
+            samples = np.frombuffer(samples, dtype=self._data.dtype)
+        count = len(samples)
+        if self.max_samples is not None and self._cursor + count > self.max_samples:
+            count = max(self.max_samples - self._cursor, 0)
+            self.dropped += len(samples) - count
+            samples = samples[:count]
+        end = self._cursor + count
+        if end > len(self._data):
+            self._grow(end)
+        self._data[self._cursor:end] = samples
+        self._cursor = end
+        return count
+
+    def _grow(self, needed):
+        """Reallocates the backing array with at least the needed capacity."""
+        capacity = max(needed, len(self._data) * 2)
+        if self.max_samples is not None:
+            capacity = min(capacity, self.max_samples)
+        data = np.empty(capacity, dtype=self._data.dtype)
+        data[:self._cursor] = self._data[:self._cursor]
+        self._data = data
+
+    def view(self):
+        """Returns a read-only view of the samples written so far (O(1), no copy)."""
+        snapshot = self._data[:self._cursor]
+        snapshot.flags.writeable = False
+        return snapshot
+
+    @property
+    def capacity(self):
+        return len(self._data)
+
+    def __len__(self):
+        return self._cursor
+
+
+class LevelHistory:
+    """Fixed-size circular history of recent level readings, for level meters."""
+
+    def __init__(self, size=64):
+        self._levels = np.zeros(size, dtype=np.float32)
+        self._index = 0
+
+    def push(self, level):
+        self._levels[self._index] = level
+        self._index = (self._index + 1) % len(self._levels)
+
+    def snapshot(self):
+        """Returns the history in chronological order, oldest first."""
+        return np.roll(self._levels, -self._index)
+
+    def clear(self):
+        self._levels[:] = 0
+        self._index = 0
+
+
+class RingBuffer:
+    """Bounded circular sample buffer that keeps only the most recent samples.
+
+    A capacity of 0 (e.g. pre-roll disabled) gives a buffer that stays empty.
+    """
+
+    def __init__(self, capacity, dtype=np.int16):
+        self._data = np.zeros(max(capacity, 0), dtype=dtype)
+        self._index = 0 # Next write position
+        self._filled = 0
+
+    def write(self, samples):
+        """Appends samples (an array or raw bytes), overwriting the oldest ones."""
+        if isinstance(samples, (bytes, bytearray, memoryview)):
+            samples = np.frombuffer(samples, dtype=self._data.dtype)
+        capacity = len(self._data)
+        if capacity == 0:
+            return
+        if len(samples) >= capacity:
+            self._data[:] = samples[-capacity:]
+            self._index = 0
+            self._filled = capacity
+            return
+        end = self._index + len(samples)
+        if end <= capacity:
+            self._data[self._index:end] = samples
+        else:
+            split = capacity - self._index
+            self._data[self._index:] = samples[:split]
+            self._data[:end - capacity] = samples[split:]
+        self._index = end % capacity
+        self._filled = min(self._filled + len(samples), capacity)
+
+    def snapshot(self):
+        """Returns a copy of the buffered samples, oldest first."""
+        if self._filled < len(self._data):
+            return self._data[:self._filled].copy()
+        return np.concatenate((self._data[self._index:], self._data[:self._index]))
+
+    def clear(self):
+        self._index = 0
+        self._filled = 0
+
+    @property
+    def capacity(self):
+        return len(self._data)
+
+    def __len__(self):
+        return self._filled
@@ -0,0 +1,272 @@
+import json
+import math
+import multiprocessing
+import os
+import platform
+import queue
+import sys
+import time
+import wave
+import numpy as np
+from vocalink.config import get_app_dir
+from vocalink.profiles import DECODE_OPTIONS, DEFAULT_PROFILE, get_profile
+
+CANDIDATE_MODELS = ["tiny", "base", "small", "medium"]
+CALIBRATION_FILE = "calibration.json"
+REFERENCE_SECONDS = 10.0
+MIN_SPEECH_SECONDS = 3.0 # Less recorded speech than this and the synthetic clip is used instead
+SAMPLE_RATE = 16000
+
+def reference_clip(seconds=REFERENCE_SECONDS, sample_rate=SAMPLE_RATE):
+    """Returns the built-in reference clip as a float32 array.
+
+    The clip is synthesised deterministically (voiced harmonics with moving
+    formants, broken into syllables and pauses) so that every machine decodes
+    exactly the same audio without shipping a recording in the package.
+    Whisper hears it as almost no words, so it understates decode time; it is
+    only used when there is no recorded speech (see recorded_speech).
+    """
+    t = np.arange(int(seconds * sample_rate), dtype=np.float32) / sample_rate
+    pitch = 120 + 20 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    formant = 1 + 0.5 * np.sin(2 * np.pi * 3.1 * t)
+    voiced = sum(np.sin(k * phase) * np.exp(-((k * pitch - 500 * formant) / 400) ** 2) for k in range(1, 20))
+    syllables = np.clip(np.sin(2 * np.pi * 4.0 * t), 0, None) * (np.sin(2 * np.pi * 0.25 * t) > -0.6)
+    audio = voiced * syllables
+    return (0.3 * audio / (np.max(np.abs(audio)) or 1)).astype(np.float32)
+
+def recorded_speech(history, seconds=REFERENCE_SECONDS):
+    """Returns up to seconds of the user's most recent dictations as one float32 clip, or None if there is too little."""
+    clips, total = [], 0
+    for entry in reversed(history.entries()):
+        if entry.get("sample_rate") != SAMPLE_RATE:
+            continue
+        clips.append(history.audio(entry))
+        total += len(clips[-1])
+        if total >= seconds * SAMPLE_RATE:
+            break
+    if total < MIN_SPEECH_SECONDS * SAMPLE_RATE:
+        return None
+    return np.concatenate(clips[::-1])[-int(seconds * SAMPLE_RATE):]
+
+def load_clip(path):
+    """Loads a 16 kHz mono 16-bit WAV file as a float32 array."""
+    with wave.open(path, "rb") as wf:
+        if wf.getframerate() != SAMPLE_RATE or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path} must be a 16 kHz mono 16-bit WAV file.")
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
+
+def peak_rss_mb():
+    """Returns the peak resident set size of the current process in MB, or None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        return _windows_peak_rss_mb()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _windows_peak_rss_mb():
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize / (1024 * 1024)
+    except Exception:
+        pass
+    return None
+
+def machine_fingerprint():
+    """Identifies the hardware a calibration result belongs to."""
+    return {
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def decode_settings(profile=DEFAULT_PROFILE, language="en"):
+    """Returns (compute_type, transcribe options) that time a model the way the app decodes with the profile."""
+    settings = get_profile(profile)
+    options = {key: settings[key] for key in DECODE_OPTIONS}
+    options["language"] = None if language == "auto" else language # None: detect, like the app
+    return settings["compute_type"], options
+
+def measure_model(model_size, audio, compute_type="int8", options=None):
+    """Loads a model, decodes the audio once to warm up and once timed, and returns the measurements.
+
+    options are the WhisperModel.transcribe options to time, normally those of
+    the decoding profile the app will use (see decode_settings).
+    """
+    from faster_whisper import WhisperModel
+    load_start = time.perf_counter()
+    model = WhisperModel(model_size, device="cpu", compute_type=compute_type)
+    load_seconds = time.perf_counter() - load_start
+    options = dict(options if options is not None else decode_settings()[1], vad_filter=False,
+                   condition_on_previous_text=False)
+    list(model.transcribe(audio[:SAMPLE_RATE * 2], **options)[0])
+    decode_start = time.perf_counter()
+    list(model.transcribe(audio, **options)[0])
+    decode_seconds = time.perf_counter() - decode_start
+    return {
+        "model_size": model_size,
+        "load_seconds": load_seconds,
+        "decode_seconds": decode_seconds,
+        "rtf": decode_seconds / (len(audio) / SAMPLE_RATE),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def _measure_in_child(model_size, audio, compute_type, options, results):
+    try:
+        results.put(measure_model(model_size, audio, compute_type, options))
+    except Exception as e:
+        results.put({"model_size": model_size, "error": str(e)})
+
+def measure_isolated(model_size, audio, compute_type="int8", options=None, timeout=1800, target=_measure_in_child):
+    """Measures a model in a fresh process so that its peak RSS is not mixed with other models.
+
+    A child that dies without reporting (e.g. killed for running out of
+    memory) or takes longer than timeout seconds is reported as an error.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=target, args=(model_size, audio, compute_type, options, results))
+    process.start()
+    return {"model_size": model_size, **wait_for_result(process, results, timeout)}
+
+def wait_for_result(process, results, timeout):
+    """Returns the result a child process puts on the results queue, or {"error": ...} if it dies first or times out."""
+    deadline = time.monotonic() + timeout
+    result = None
+    while result is None:
+        try:
+            result = results.get(timeout=1.0)
+        except queue.Empty:
+            if process.exitcode is not None and results.empty():
+                result = {"error": f"measurement process exited with code {process.exitcode}"}
+            elif time.monotonic() > deadline:
+                process.terminate()
+                result = {"error": f"measurement timed out after {timeout} s"}
+    process.join(5)
+    return result
+
+def cached_models(candidates=CANDIDATE_MODELS):
+    """Returns the candidates that are already downloaded, so measuring them needs no network."""
+    from faster_whisper.utils import download_model
+    cached = []
+    for model_size in candidates:
+        try:
+            download_model(model_size, local_files_only=True)
+        except Exception:
+            continue
+        cached.append(model_size)
+    return cached
+
+def calibrate(max_rtf=0.5, candidates=CANDIDATE_MODELS, audio=None, path=None, profile=DEFAULT_PROFILE, language="en",
+              history=None):
+    """Measures each candidate model and picks the largest one whose real-time factor is within max_rtf.
+
+    Models are timed with the decode options of the given profile, on the
+    audio if given, else on the user's recent dictations from the history,
+    else on the synthetic reference clip. Candidates are tried from smallest
+    to largest and calibration stops at the first model that misses the
+    target. The result is saved for later startups; if no model could be
+    measured at all, nothing is saved and None is returned.
+    """
+    source = "the given clip"
+    if audio is None and history is not None:
+        audio = recorded_speech(history)
+        source = "your recent dictations"
+    if audio is None:
+        audio = reference_clip()
+        source = "the synthetic reference clip (an optimistic estimate; dictate a little and calibrate again)"
+    print(f"Calibrating with the '{profile}' profile on {source}.", flush=True)
+    compute_type, options = decode_settings(profile, language)
+    measurements = []
+    selected = None
+    for model_size in candidates:
+        print(f"Calibrating '{model_size}'...", flush=True)
+        result = measure_isolated(model_size, audio, compute_type=compute_type, options=options)
+        measurements.append(result)
+        if "error" in result:
+            print(f"  failed: {result['error']}", flush=True)
+            break
+        print(f"  RTF {result['rtf']:.3f}, peak RSS {_format_mb(result['peak_rss_mb'])}", flush=True)
+        if selected is None or result["rtf"] <= max_rtf:
+            selected = model_size # The smallest model is the fallback even if it misses the target
+        if result["rtf"] > max_rtf:
+            break
+    if selected is None:
+        print("Calibration failed: no model could be measured; nothing was saved.", flush=True)
+        return None
+    calibration = {
+        "model_size": selected,
+        "max_rtf": max_rtf,
+        "profile": profile,
+        "machine": machine_fingerprint(),
+        "measurements": measurements,
+        "created": time.time(),
+    }
+    save_calibration(calibration, path)
+    print(f"Selected model '{selected}' for model_size=auto.", flush=True)
+    return calibration
+
+def calibration_path():
+    return os.path.join(get_app_dir(), CALIBRATION_FILE)
+
+def save_calibration(calibration, path=None):
+    """Writes a calibration result to disk."""
+    with open(path or calibration_path(), "w") as f:
+        json.dump(calibration, f, indent=4)
+
+def load_calibration(max_rtf=None, path=None):
+    """Returns the saved calibration if it was made on this machine (and for this target), else None."""
+    try:
+        with open(path or calibration_path(), "r") as f:
+            calibration = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if calibration.get("machine") != machine_fingerprint():
+        return None
+    if max_rtf is not None and not math.isclose(calibration.get("max_rtf", -1), max_rtf):
+        return None
+    return calibration
+
+def calibrated_model_size(max_rtf=None, default="base"):
+    """Returns the model chosen by the last calibration on this machine, or the default."""
+    calibration = load_calibration(max_rtf)
+    return calibration["model_size"] if calibration else default
+
+def _format_mb(value):
+    return f"{value:.0f} MB" if value is not None else "unknown"
+
+def main(argv=None):
+    """Entry point for `vocalink calibrate`."""
+    import argparse
+    from vocalink.config import load_config
+    config = load_config()
+    parser = argparse.ArgumentParser(prog="vocalink calibrate", description="Pick the largest Whisper model that is fast enough on this machine.")
+    parser.add_argument("--max-rtf", type=float, default=config.auto_model_max_rtf, help="Highest acceptable real-time factor (decode time / audio length).")
+    parser.add_argument("--models", nargs="+", default=CANDIDATE_MODELS, help="Candidate model sizes, smallest first.")
+    parser.add_argument("--profile", default=config.decoding_profile, help="Decoding profile to time the models with.")
+    parser.add_argument("--clip", help="16 kHz mono WAV file to use instead of your recent dictations.")
+    args = parser.parse_args(argv)
+    audio = load_clip(args.clip) if args.clip else None
+    history = None
+    if config.history_enabled:
+        from vocalink.history import DictationHistory
+        history = DictationHistory(max_entries=config.history_max_entries, max_age_days=config.history_max_days,
+                                   max_mb=config.history_max_mb)
+    calibrate(max_rtf=args.max_rtf, candidates=args.models, audio=audio, profile=args.profile,
+              language=config.transcription_language, history=history)
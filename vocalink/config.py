@@ -1,30 +1,73 @@
 
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional
+import os
 
 class AppConfig(BaseModel):
     """Application configuration model."""
     model_config = ConfigDict(protected_namespaces=(), extra='ignore')
 
     model_size: str = Field("auto", description="Whisper model size (auto, tiny, base, small, medium, large).")
-    mic_device: Optional[int] = Field(None, description="Index of the preferred microphone device.")
+    mic_device: Optional[int] = Field(None, description="Legacy PortAudio index of the preferred microphone; used only when mic_device_id is not set.")
+    mic_device_id: Optional[str] = Field(None, description="Stable ID of the preferred microphone (see 'vocalink devices'), 'auto' for the first input with a live signal, or null for the system default.")
+    device_poll_seconds: float = Field(0, description="How often to check for plugged or unplugged microphones, e.g. 60 (0 disables). Each check starts a short-lived helper process.")
     hotkey: str = Field("<ctrl>+<shift>", description="Hotkey combination (e.g., <ctrl>+<shift>).")
+    hotkey_debounce_ms: int = Field(25, description="Ignore a hotkey release that is followed by a press within this many ms (0 disables).")
     theme: str = Field("superhero", description="UI theme for the settings window.")
     auto_launch: bool = Field(False, description="Launch the application on system startup.")
     minimize_to_tray: bool = Field(True, description="Minimize the settings window to the system tray.")
     word_replacements: dict = Field({}, description="Custom dictionary for word replacement.")
+    replacement_whole_words: bool = Field(False, description="Only apply word replacements to whole words.")
+    replacement_ignore_case: bool = Field(False, description="Match word replacement keys case-insensitively.")
     transcription_language: str = Field("en", description="Language for transcription (e.g., 'en', 'es', 'fr').")
+    auto_language_ttl_seconds: int = Field(600, description="With transcription_language 'auto', the desktop app reuses a detected language for this long before detecting again. The server and batch mode detect per request.")
     interface_language: str = Field("en", description="Language for the user interface (e.g., 'en', 'es', 'fr').")
+    decoding_profile: str = Field("accurate", description="Decoding speed/accuracy trade-off: fastest, balanced or accurate.")
+    auto_calibrate: bool = Field(False, description="With model_size=auto, measure the already downloaded models in the background on first launch ('vocalink calibrate' measures every candidate).")
+    auto_model_max_rtf: float = Field(0.5, description="Latency target for model_size=auto: highest acceptable decode time per second of audio.")
+    model_cache_mb: int = Field(2048, description="Memory budget in MB for Whisper models kept loaded for quick switching.")
+    streaming_transcription: bool = Field(False, description="Transcribe incrementally while the hotkey is held.")
+    native_rate_capture: bool = Field(True, description="Open the microphone at its native sample rate and convert to 16 kHz mono in the app.")
+    audio_chunk_size: int = Field(1024, description="Frames per capture buffer; smaller values lower latency at some CPU cost.")
+    warm_stream: bool = Field(False, description="Keep the microphone stream open between recordings so capture starts instantly.")
+    preroll_ms: int = Field(400, description="Audio from just before the hotkey press to prepend when warm_stream is enabled.")
+    trim_silence: bool = Field(True, description="Trim leading and trailing silence when recording stops and skip recordings without speech.")
+    vad_threshold_db: float = Field(-50.0, description="Minimum level in dBFS for audio to count as speech when trimming silence.")
+    min_speech_ms: int = Field(200, description="Recordings with less speech than this are discarded without running the model.")
+    max_recording_seconds: int = Field(600, description="Maximum length of a single recording in seconds; longer audio is dropped.")
+    text_injection: str = Field("auto", description="How text is inserted: auto (fastest for the text length), clipboard, type or type_batched (Windows).")
+    restore_clipboard: bool = Field(True, description="Restore the previous clipboard contents after pasting.")
+    save_recordings: bool = Field(False, description="Also write the last recording to a WAV file in the app data directory.")
+    history_enabled: bool = Field(True, description="Keep recent dictations (audio and text) in the app data directory for replay and re-transcription.")
+    history_max_entries: int = Field(200, description="Most dictations kept in the history; the oldest are deleted first.")
+    history_max_days: int = Field(30, description="Delete dictations from the history after this many days (0 keeps them regardless of age).")
+    history_max_mb: int = Field(200, description="Disk space the dictation history may use, in MB.")
+    watch_config: bool = Field(True, description="Apply edits to the config file while the app is running.")
 
 
+def get_app_dir() -> str:
+    """Returns the per-user VocalInk data directory, creating it if needed."""
+    path = os.path.join(os.path.expanduser("~"), ".config", "vocalink")
+    os.makedirs(path, exist_ok=True)
+    return path
+
 def load_config(path: str = "config.json") -> AppConfig:
     """Loads the application configuration from a JSON file."""
     try:
-        with open(path, "r") as f:
-            return AppConfig.model_validate_json(f.read())
+        return read_config(path)
     except (FileNotFoundError, ValueError):
         return AppConfig()
 
+def read_config(path: str = "config.json") -> AppConfig:
+    """Reads and validates the configuration file, raising on a missing or invalid file."""
+    with open(path, "r") as f:
+        return AppConfig.model_validate_json(f.read())
+
+def config_diff(old: AppConfig, new: AppConfig) -> dict:
+    """Returns {field: (old value, new value)} for every field that differs."""
+    return {name: (getattr(old, name), getattr(new, name))
+            for name in AppConfig.model_fields if getattr(old, name) != getattr(new, name)}
+
 def save_config(config: AppConfig, path: str = "config.json"):
     """Saves the application configuration to a JSON file."""
     with open(path, "w") as f:
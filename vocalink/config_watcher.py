@@ -0,0 +1,63 @@
+import os
+import threading
+from vocalink.config import config_diff, read_config
+
+class ConfigWatcher:
+    """Polls the config file and reports validated, field-level changes.
+
+    A poll costs one os.stat(); the file is only read and validated when its
+    modification time or size changed. An edit that does not validate (for
+    example a file saved half-way) is reported and skipped, so the running
+    configuration is never replaced by defaults. on_change is called on the
+    watcher thread with the new AppConfig and its diff against the last one.
+    """
+
+    def __init__(self, path, current, on_change, interval=1.0):
+        self.path = path
+        self.current = current.model_copy(deep=True)
+        self.on_change = on_change
+        self.interval = interval
+        self._signature = self._stat()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def poll(self):
+        """Checks the file once and returns the diff it reported, or None."""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return None
+        self._signature = signature
+        try:
+            config = read_config(self.path)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Ignoring invalid edit to {self.path}: {e}", flush=True)
+            return None
+        changes = config_diff(self.current, config)
+        if not changes:
+            return None # Touched, or rewritten by our own settings window
+        self.current = config
+        self.on_change(config, changes)
+        return changes
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"ERROR: Config watcher failed: {e}", flush=True)
@@ -0,0 +1,263 @@
+import argparse
+import json
+import multiprocessing
+import threading
+import time
+
+# Input device discovery. PortAudio only enumerates devices when it is
+# initialised, so a running instance never sees hot-plugged microphones; the
+# registry notices them by scanning in a short-lived child process and leaves
+# re-initialising the app's own instance to the caller.
+
+AUTO_DEVICE = "auto" # mic_device_id value that picks the first input with a live signal
+
+class InputDevice:
+    """An input device as PortAudio reports it, plus an ID that survives index changes.
+
+    PortAudio indexes shift whenever a device is added or removed, so devices
+    are identified by host API and name instead; a second device with the same
+    name gets a "#2" suffix, in enumeration order.
+    """
+
+    def __init__(self, index, name, host_api, native_rate, channels, device_id=None):
+        self.index = index
+        self.name = name
+        self.host_api = host_api
+        self.native_rate = native_rate
+        self.channels = channels
+        self.id = device_id or f"{host_api}:{name}"
+        self.open_latency_ms = None # Last measured time to open a stream on it
+
+    def to_dict(self):
+        return {"id": self.id, "index": self.index, "name": self.name, "host_api": self.host_api,
+                "native_rate": self.native_rate, "channels": self.channels, "open_latency_ms": self.open_latency_ms}
+
+    def __repr__(self):
+        return f"InputDevice({self.id!r}, index={self.index})"
+
+
+def scan_input_devices(pa):
+    """Returns the input devices a PyAudio instance knows about."""
+    host_apis = {}
+    devices = []
+    seen = {}
+    for i in range(pa.get_device_count()):
+        info = pa.get_device_info_by_index(i)
+        if info["maxInputChannels"] <= 0:
+            continue
+        api = info["hostApi"]
+        if api not in host_apis:
+            host_apis[api] = pa.get_host_api_info_by_index(api)["name"]
+        device = InputDevice(i, info["name"], host_apis[api], int(info["defaultSampleRate"]), int(info["maxInputChannels"]))
+        seen[device.id] = seen.get(device.id, 0) + 1
+        if seen[device.id] > 1:
+            device.id = f"{device.id}#{seen[device.id]}"
+        devices.append(device)
+    return devices
+
+def _scan_in_child(results):
+    import pyaudio
+    pa = pyaudio.PyAudio()
+    try:
+        results.put([device.to_dict() for device in scan_input_devices(pa)])
+    finally:
+        pa.terminate()
+
+def scan_fresh(timeout=10.0):
+    """Scans the input devices in a fresh process, so devices plugged in since startup are listed."""
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=_scan_in_child, args=(results,), daemon=True)
+    process.start()
+    try:
+        return results.get(timeout=timeout)
+    finally:
+        process.join(timeout)
+
+
+class DeviceRegistry:
+    """Cached list of input devices that resolves the configured microphone by stable ID.
+
+    Devices are enumerated once and served from memory afterwards. With
+    poll_seconds, a background thread rescans in a child process and calls
+    on_change(added_ids, removed_ids) when the set of devices changed; the
+    caller then re-initialises its PortAudio instance and passes it to rebind().
+    Devices returned by in_use() are left out of the comparison: a device held
+    open (e.g. busy under ALSA) can drop out of a fresh enumeration, and
+    reporting it as removed would make the caller reopen it in a loop.
+    """
+
+    def __init__(self, pa, poll_seconds=0, on_change=None, scanner=scan_fresh, in_use=None):
+        self.pa = pa
+        self.poll_seconds = poll_seconds
+        self.on_change = on_change
+        self.scanner = scanner
+        self.in_use = in_use # Returns the IDs of the devices the caller has open
+        self._lock = threading.Lock()
+        self._devices = []
+        self._latencies = {} # Device ID -> open latency in ms, kept across rescans
+        self._stop = threading.Event()
+        self._thread = None
+        self.rebind(pa)
+
+    def rebind(self, pa):
+        """Rescans the devices through a (re-initialised) PyAudio instance."""
+        devices = scan_input_devices(pa)
+        with self._lock:
+            self.pa = pa
+            for device in devices:
+                device.open_latency_ms = self._latencies.get(device.id)
+            self._devices = devices
+            self.updated_at = time.time()
+
+    @property
+    def devices(self):
+        with self._lock:
+            return list(self._devices)
+
+    def get(self, device_id):
+        """Returns the device with the given ID, or None if it is not connected."""
+        return next((device for device in self.devices if device.id == device_id), None)
+
+    def device_id(self, index):
+        """Returns the ID of the device at a PortAudio index, or of the default input for None."""
+        if index is None:
+            try:
+                index = self.pa.get_default_input_device_info()["index"]
+            except (IOError, OSError):
+                return None # No default input
+        return next((device.id for device in self.devices if device.index == index), None)
+
+    def labels(self):
+        """Returns {label: device ID} for display, using the name alone unless it is ambiguous."""
+        devices = self.devices
+        names = [device.name for device in devices]
+        return {(device.name if names.count(device.name) == 1 else f"{device.name} ({device.id})"): device.id
+                for device in devices}
+
+    def resolve(self, device_id=None, legacy_index=None):
+        """Returns the PortAudio index to open for the configured microphone, or None for the default.
+
+        A configured ID that is not connected falls back to the default input
+        instead of whichever device now has its old index.
+        """
+        if device_id:
+            device = self.get(device_id)
+            if device is None:
+                print(f"WARNING: Microphone '{device_id}' is not connected; using the default input.", flush=True)
+                return None
+            return device.index
+        if legacy_index is not None and any(device.index == legacy_index for device in self.devices):
+            return legacy_index # Older configs stored a raw index
+        return None
+
+    def note_open_latency(self, index, latency_ms):
+        """Records how long opening a stream on the device at index took."""
+        with self._lock:
+            for device in self._devices:
+                if device.index == index:
+                    device.open_latency_ms = latency_ms
+                    self._latencies[device.id] = latency_ms
+
+    def probe(self, timeout=1.5, min_level_db=-60.0, candidates=None):
+        """Opens the candidate inputs in parallel and returns the first one with a live signal, or None.
+
+        All streams are opened up front and run concurrently in PortAudio's
+        callback threads, so the probe takes as long as the slowest open plus
+        the time until someone's audio arrives, not the sum over devices.
+        Inputs that deliver only digital silence (e.g. unplugged jacks) never win.
+        """
+        import numpy as np
+        import pyaudio
+        candidates = self.devices if candidates is None else candidates
+        threshold = 32768.0 * 10 ** (min_level_db / 20)
+        found = []
+        live = threading.Event()
+
+        def listener(device):
+            def callback(in_data, frame_count, time_info, status):
+                if not live.is_set():
+                    samples = np.frombuffer(in_data, dtype=np.int16)
+                    if len(samples) and np.sqrt(np.mean(np.square(samples, dtype=np.float32))) >= threshold:
+                        found.append(device)
+                        live.set()
+                return (None, pyaudio.paContinue)
+            return callback
+
+        streams = []
+        try:
+            for device in candidates:
+                start = time.perf_counter()
+                try:
+                    streams.append(self.pa.open(format=pyaudio.paInt16, channels=1, rate=device.native_rate, input=True,
+                                                input_device_index=device.index, stream_callback=listener(device)))
+                except Exception as e:
+                    print(f"Skipping microphone '{device.name}': {e}", flush=True)
+                    continue
+                self.note_open_latency(device.index, (time.perf_counter() - start) * 1000)
+            live.wait(timeout)
+        finally:
+            for stream in streams:
+                try:
+                    stream.stop_stream()
+                    stream.close()
+                except Exception:
+                    pass
+        return found[0] if found else None
+
+    def start(self):
+        """Starts polling for added or removed devices, if poll_seconds is set."""
+        if self.poll_seconds and self._thread is None:
+            self._stop = threading.Event() # A fresh one, so a thread still finishing a scan stays stopped
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops polling; a scan already running finishes in the background."""
+        self._stop.set()
+        self._thread = None
+
+    def poll(self):
+        """Rescans once and returns (added_ids, removed_ids) if the set of devices changed, else None."""
+        ignored = set(self.in_use()) if self.in_use else set()
+        current = {device.id for device in self.devices} - ignored
+        fresh = {device["id"] for device in self.scanner()} - ignored
+        if fresh == current:
+            return None
+        added, removed = sorted(fresh - current), sorted(current - fresh)
+        if self.on_change:
+            self.on_change(added, removed)
+        return added, removed
+
+    def _run(self):
+        stop = self._stop
+        while not stop.wait(self.poll_seconds):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"WARNING: Microphone scan failed: {e}", flush=True)
+
+
+def main(argv=None):
+    """Entry point of `vocalink devices`."""
+    parser = argparse.ArgumentParser(prog="vocalink devices", description="List microphones and their IDs for mic_device_id.")
+    parser.add_argument("--probe", action="store_true", help="Also report which input picks up sound first.")
+    parser.add_argument("--json", action="store_true", help="Print the devices as JSON.")
+    args = parser.parse_args(argv)
+
+    import pyaudio
+    pa = pyaudio.PyAudio()
+    try:
+        registry = DeviceRegistry(pa)
+        live = registry.probe() if args.probe else None
+        devices = registry.devices
+    finally:
+        pa.terminate()
+    if args.json:
+        print(json.dumps({"devices": [device.to_dict() for device in devices], "live": live.id if live else None}, indent=4))
+        return
+    for device in devices:
+        latency = f"{device.open_latency_ms:.0f} ms open" if device.open_latency_ms is not None else ""
+        print(f"{device.index:>3}  {device.id:<50} {device.native_rate:>6} Hz  {device.channels} ch  {latency}")
+    if args.probe:
+        print(f"Live signal: {live.id}" if live else "No input picked up any sound.")
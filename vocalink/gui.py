@@ -1,16 +1,18 @@
 import customtkinter as ctk
 import tkinter as tk
 from vocalink.config import AppConfig, save_config
-from vocalink.audio import AudioRecorder
+from vocalink.devices import AUTO_DEVICE, DeviceRegistry
 from pynput import keyboard
 from vocalink.localization import LocalizationManager
 
 class SettingsWindow(ctk.CTkToplevel):
     """Settings window for the application using CustomTkinter."""
 
-    def __init__(self, parent, config: AppConfig, on_save_callback=None, replay_audio_callback=None, localization_manager=None):
+    def __init__(self, parent, config: AppConfig, on_save_callback=None, replay_audio_callback=None, localization_manager=None,
+                 device_registry=None):
         super().__init__(parent)
         self.config = config
+        self.device_registry = device_registry # The app's cached device list; enumerated here only if not given
         self.on_save_callback = on_save_callback
         self.replay_audio_callback = replay_audio_callback
         self.localization_manager = localization_manager
@@ -252,21 +254,33 @@ class SettingsWindow(ctk.CTkToplevel):
         self.replacements_text.delete("0.0", "end") # Use "0.0" for CTkTextbox
         self.replacements_text.insert("0.0", replacements_str.strip())
 
-        if self.config.mic_device is not None:
-            recorder = AudioRecorder()
-            mics = recorder.list_microphones()
-            if self.config.mic_device < len(mics):
-                self.mic_var.set(mics[self.config.mic_device])
-            else:
-                self.mic_var.set("Default") # Fallback if index is out of range
+        if self.config.mic_device_id == AUTO_DEVICE:
+            self.mic_var.set("Auto-detect")
         else:
-            self.mic_var.set("Default")
+            labels = self.get_microphone_labels()
+            device_id = self.config.mic_device_id
+            if device_id is None and self.config.mic_device is not None: # Legacy index from an older config
+                device_id = next((device.id for device in self.get_device_registry().devices
+                                  if device.index == self.config.mic_device), None)
+            # Fallback to Default if the device is not connected
+            self.mic_var.set(next((label for label, id_ in labels.items() if id_ == device_id), "Default"))
+
+    def get_device_registry(self):
+        if self.device_registry is None:
+            import pyaudio
+            pa = pyaudio.PyAudio()
+            self.device_registry = DeviceRegistry(pa) # Keeps its cached list after PortAudio is released
+            pa.terminate()
+        return self.device_registry
+
+    def get_microphone_labels(self):
+        """Returns {combobox label: device ID} for the connected microphones."""
+        return self.get_device_registry().labels()
 
     def populate_microphones(self):
         """Populates the microphone combobox with available devices."""
-        recorder = AudioRecorder()
-        mics = recorder.list_microphones()
-        self.mic_combobox.configure(values=["Default"] + mics) # Use configure for CTkComboBox
+        mics = list(self.get_microphone_labels())
+        self.mic_combobox.configure(values=["Default", "Auto-detect"] + mics) # Use configure for CTkComboBox
         if not self.mic_var.get(): # Set default if nothing selected
             self.mic_var.set("Default")
 
@@ -376,15 +390,12 @@ class SettingsWindow(ctk.CTkToplevel):
         self.config.minimize_to_tray = self.minimize_to_tray_var.get()
 
         mic_selection = self.mic_var.get()
-        if mic_selection == "Default":
-            self.config.mic_device = None
+        self.config.mic_device = None # Superseded by the stable ID
+        if mic_selection == "Auto-detect":
+            self.config.mic_device_id = AUTO_DEVICE
         else:
-            recorder = AudioRecorder()
-            mics = recorder.list_microphones()
-            try:
-                self.config.mic_device = mics.index(mic_selection)
-            except ValueError:
-                self.config.mic_device = None # Fallback if mic name not found
+            # None for "Default", or if the mic was unplugged meanwhile
+            self.config.mic_device_id = self.get_microphone_labels().get(mic_selection)
 
         save_config(self.config)
         if self.on_save_callback:
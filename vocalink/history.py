@@ -0,0 +1,180 @@
+import json
+import os
+import threading
+import time
+import numpy as np
+from vocalink.config import get_app_dir
+
+HISTORY_DIR = "history"
+INDEX_FILE = "index.jsonl"
+
+class DictationHistory:
+    """Bounded archive of recent dictations: audio, transcript and timings.
+
+    Each recording is stored as a raw int16 .npy file (2 bytes per sample,
+    half the size of the float32 audio and readable with np.load(mmap_mode))
+    and described by one line in an append-only index.jsonl. After every
+    addition the oldest entries are evicted until the history is within
+    max_entries, max_age_days and max_mb; the index is rewritten only once
+    it holds twice as many lines as live entries, like the trace log.
+    """
+
+    def __init__(self, path=None, max_entries=200, max_age_days=30, max_mb=200):
+        self.path = path or os.path.join(get_app_dir(), HISTORY_DIR)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._entries = None # Live entries, oldest first; loaded on first use
+        self._lines = 0 # Lines in the index file, live or not
+        self._last_id = 0
+
+    @property
+    def index_path(self):
+        return os.path.join(self.path, INDEX_FILE)
+
+    def add(self, samples, text, sample_rate=16000, metadata=None):
+        """Stores int16 mono samples with their transcript and returns the new entry.
+
+        Returns None without archiving anything if the recording alone is larger than max_mb.
+        """
+        samples = np.ascontiguousarray(samples, dtype=np.int16)
+        with self._lock:
+            self._load()
+            entry_id = max(int(time.time() * 1000), self._last_id + 1) # Unique even for same-millisecond adds
+            self._last_id = entry_id
+            file_name = f"{entry_id}.npy"
+            np.save(os.path.join(self.path, file_name), samples)
+            size = os.path.getsize(os.path.join(self.path, file_name))
+            if self.max_bytes and size > self.max_bytes:
+                # Size eviction would delete it right away, along with everything older
+                self._remove_file(file_name)
+                print(f"Dictation of {size / 1024 / 1024:.1f} MB is larger than the history limit; not archived.", flush=True)
+                return None
+            entry = {"id": entry_id, "timestamp": entry_id / 1000, "file": file_name, "text": text,
+                     "sample_rate": sample_rate, "seconds": len(samples) / sample_rate,
+                     "bytes": size, **(metadata or {})}
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._lines += 1
+            self._entries.append(entry)
+            self._evict()
+            return entry
+
+    def entries(self, last=None):
+        """Returns the stored entries, oldest first."""
+        with self._lock:
+            self._load()
+            entries = list(self._entries)
+        return entries[-last:] if last else entries
+
+    def latest(self):
+        entries = self.entries(last=1)
+        return entries[0] if entries else None
+
+    def get(self, entry_id):
+        return next((entry for entry in self.entries() if entry["id"] == entry_id), None)
+
+    def samples(self, entry):
+        """Returns the entry's int16 samples memory-mapped from disk (read-only; nothing is read up front)."""
+        return np.load(os.path.join(self.path, entry["file"]), mmap_mode="r")
+
+    def audio(self, entry):
+        """Returns the entry's audio as float32 in [-1, 1], for replay or re-transcription."""
+        return self.samples(entry).astype(np.float32) / 32768.0
+
+    @property
+    def total_bytes(self):
+        return sum(entry["bytes"] for entry in self.entries())
+
+    def _load(self):
+        """Reads the index once, dropping entries whose audio is gone and audio files no entry refers to."""
+        if self._entries is not None:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        entries = {}
+        self._lines = 0
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._lines += 1
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue # Skip a line truncated by a crash
+                    entries[entry["id"]] = entry
+        except FileNotFoundError:
+            pass
+        files = set(name for name in os.listdir(self.path) if name.endswith(".npy"))
+        self._entries = [entry for entry in entries.values() if entry["file"] in files]
+        for name in files - {entry["file"] for entry in self._entries}:
+            self._remove_file(name) # Written just before a crash, or left behind by an interrupted eviction
+        self._last_id = max((entry["id"] for entry in self._entries), default=0)
+        self._evict()
+
+    def _evict(self):
+        cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days else None
+        total = sum(entry["bytes"] for entry in self._entries)
+        evicted = 0
+        for entry in self._entries:
+            over = (self.max_entries and len(self._entries) - evicted > self.max_entries) or \
+                   (self.max_bytes and total > self.max_bytes) or (cutoff is not None and entry["timestamp"] < cutoff)
+            if not over:
+                break # Entries are in age order, so everything after this one is kept too
+            self._remove_file(entry["file"])
+            total -= entry["bytes"]
+            evicted += 1
+        if evicted:
+            del self._entries[:evicted]
+        if self._lines >= 2 * max(len(self._entries), 1):
+            self._compact()
+
+    def _remove_file(self, name):
+        try:
+            os.remove(os.path.join(self.path, name))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"WARNING: Could not delete {name} from the dictation history: {e}", flush=True)
+
+    def _compact(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in self._entries))
+        os.replace(tmp_path, self.index_path)
+        self._lines = len(self._entries)
+
+
+def main(argv=None):
+    """Entry point for `vocalink history`."""
+    import argparse
+    from vocalink.config import load_config
+    config = load_config()
+    parser = argparse.ArgumentParser(prog="vocalink history", description="List or re-transcribe recent dictations.")
+    parser.add_argument("--last", type=int, default=20, help="Show only the most recent N dictations.")
+    parser.add_argument("--json", action="store_true", help="Print the entries as JSON.")
+    parser.add_argument("--retranscribe", type=int, metavar="ID", help="Decode a stored dictation again with the configured model.")
+    parser.add_argument("--model", default=None, help="Model size for --retranscribe (default: model_size from the config).")
+    args = parser.parse_args(argv)
+
+    history = DictationHistory(max_entries=config.history_max_entries, max_age_days=config.history_max_days,
+                               max_mb=config.history_max_mb)
+    if args.retranscribe is not None:
+        entry = history.get(args.retranscribe)
+        if entry is None:
+            raise SystemExit(f"ERROR: No dictation with ID {args.retranscribe} in the history.")
+        from vocalink.transcriber import Transcriber
+        transcriber = Transcriber(configured_model_size=args.model or config.model_size, language=config.transcription_language,
+                                  profile=config.decoding_profile)
+        transcriber.whole_word_replacements = config.replacement_whole_words
+        transcriber.ignore_case_replacements = config.replacement_ignore_case
+        print(transcriber.transcribe(history.audio(entry), word_replacements=config.word_replacements))
+        return
+    entries = history.entries(last=args.last)
+    if args.json:
+        print(json.dumps(entries, indent=4))
+        return
+    for entry in entries:
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["timestamp"]))
+        print(f"{entry['id']}  {stamp}  {entry['seconds']:5.1f} s  {entry['text']}")
+    print(f"{len(history.entries())} dictation(s), {history.total_bytes / 1024 / 1024:.1f} MB in {history.path}")
@@ -1,18 +1,39 @@
 
 from pynput import keyboard
-import pyperclip
+import threading
+
+# Left/right modifier variants mapped to the generic key used in hotkey strings
+_CANONICAL_KEYS = {
+    keyboard.Key.ctrl_l: keyboard.Key.ctrl,
+    keyboard.Key.ctrl_r: keyboard.Key.ctrl,
+    keyboard.Key.shift_l: keyboard.Key.shift,
+    keyboard.Key.shift_r: keyboard.Key.shift,
+    keyboard.Key.alt_l: keyboard.Key.alt,
+    keyboard.Key.alt_r: keyboard.Key.alt,
+}
 
 class HotkeyManager:
-    """Manages global hotkeys for starting and stopping recording."""
+    """Manages global hotkeys for starting and stopping recording.
+
+    The press/release handlers run on the OS keyboard hook thread for every
+    keystroke in the system, so they do no I/O and return after a single dict
+    and set lookup for keys that are not part of the hotkey.
+    """
 
-    def __init__(self, hotkey_str, on_press_callback, on_release_callback):
+    def __init__(self, hotkey_str, on_press_callback, on_release_callback, debounce_ms=25):
         self.hotkey_str = hotkey_str
         self.on_press_callback = on_press_callback
         self.on_release_callback = on_release_callback
         self.listener = None
         self.pressed_keys = set()
-        self.hotkey_keys = self._parse_hotkey_string(hotkey_str)
+        self.hotkey_keys = frozenset(self._parse_hotkey_string(hotkey_str))
         self.hotkey_active = False
+        # A release followed by a press within this window (e.g. OS key repeat) is ignored
+        self.debounce_seconds = debounce_ms / 1000
+        self._release_timer = None
+        # Held while a callback runs, so a debounced release on its timer thread and a press on the
+        # hook thread are delivered one at a time and in order
+        self._callback_lock = threading.Lock()
 
     def _parse_hotkey_string(self, hotkey_str):
         """Parses the hotkey string into a set of pynput key objects."""
@@ -37,44 +58,50 @@ class HotkeyManager:
                 keys.add(keyboard.KeyCode.from_char(part))
         return keys
 
-    def _canonicalize_key(self, key):
-        if isinstance(key, keyboard.Key):
-            if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r:
-                return keyboard.Key.ctrl
-            if key == keyboard.Key.shift_l or key == keyboard.Key.shift_r:
-                return keyboard.Key.shift
-            if key == keyboard.Key.alt_l or key == keyboard.Key.alt_r:
-                return keyboard.Key.alt
-        return key
-
     def _on_press(self, key):
         """Handles key press events."""
-        print(f"Key pressed: {key}", flush=True)
-        canonical_key = self._canonicalize_key(key)
-        if canonical_key in self.hotkey_keys or canonical_key in {keyboard.Key.ctrl, keyboard.Key.shift, keyboard.Key.alt}:
-            self.pressed_keys.add(canonical_key)
-        print(f"Pressed keys: {self.pressed_keys}", flush=True)
-        print(f"Hotkey keys: {self.hotkey_keys}", flush=True)
+        key = _CANONICAL_KEYS.get(key, key)
+        if key not in self.hotkey_keys:
+            return
+        self.pressed_keys.add(key)
 
-        # Check if all hotkey keys are pressed and hotkey was not active
-        if all(k in self.pressed_keys for k in self.hotkey_keys) and not self.hotkey_active:
+        # Only hotkey keys are tracked, so the hotkey is down when every one of them is pressed
+        if len(self.pressed_keys) == len(self.hotkey_keys) and not self.hotkey_active:
             self.hotkey_active = True
-            print("Hotkey activated! Calling on_press_callback.", flush=True)
-            self.on_press_callback()
+            with self._callback_lock:
+                pending, self._release_timer = self._release_timer, None
+                if pending is not None:
+                    # Re-pressed within the debounce window: the release was spurious
+                    pending.cancel()
+                    return
+                self.on_press_callback()
 
     def _on_release(self, key):
         """Handles key release events."""
-        print(f"Key released: {key}", flush=True)
-        canonical_key = self._canonicalize_key(key)
-        if canonical_key in self.pressed_keys:
-            self.pressed_keys.remove(canonical_key)
-        print(f"Pressed keys: {self.pressed_keys}", flush=True)
-        print(f"Hotkey keys: {self.hotkey_keys}", flush=True)
+        key = _CANONICAL_KEYS.get(key, key)
+        if key not in self.hotkey_keys:
+            return
+        self.pressed_keys.discard(key)
 
         # Check if hotkey was active and is no longer fully pressed
-        if self.hotkey_active and not all(k in self.pressed_keys for k in self.hotkey_keys):
+        if self.hotkey_active:
             self.hotkey_active = False
-            print("Hotkey deactivated! Calling on_release_callback.", flush=True)
+            with self._callback_lock:
+                if self.debounce_seconds <= 0:
+                    self.on_release_callback()
+                    return
+                timer = threading.Timer(self.debounce_seconds, self._fire_release)
+                timer.args = (timer,)
+                timer.daemon = True
+                self._release_timer = timer
+                timer.start()
+
+    def _fire_release(self, timer):
+        """Delivers a release that was not cancelled by a quick re-press."""
+        with self._callback_lock:
+            if self._release_timer is not timer:
+                return # Cancelled by a re-press that got the lock first
+            self._release_timer = None
             self.on_release_callback()
 
     def start_listening(self):
@@ -89,13 +116,13 @@ class HotkeyManager:
         """Stops listening for hotkey events."""
         if self.listener:
             self.listener.stop()
+        with self._callback_lock:
+            pending, self._release_timer = self._release_timer, None
+            if pending is not None:
+                pending.cancel()
+                self.on_release_callback() # Don't leave a recording running
 
 def paste_text(text):
-    """Pastes the given text using pyperclip."""
-    pyperclip.copy(text)
-    # Simulate Ctrl+V to paste the text
-    keyboard_controller = keyboard.Controller()
-    keyboard_controller.press(keyboard.Key.ctrl_l)
-    keyboard_controller.press('v')
-    keyboard_controller.release('v')
-    keyboard_controller.release(keyboard.Key.ctrl_l)
+    """Inserts the given text into the focused window with the fastest working injection backend."""
+    from vocalink.injection import default_injector
+    return default_injector().inject(text)
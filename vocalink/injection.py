@@ -0,0 +1,252 @@
+import sys
+import threading
+import time
+from collections import deque
+
+# Text injection backends. pynput and pyperclip are imported lazily, so the
+# selection logic can be used (and tested) without a display.
+
+class ClipboardInjector:
+    """Copies the text to the clipboard, sends the paste shortcut and restores the previous clipboard."""
+
+    name = "clipboard"
+
+    def __init__(self, controller, restore=True, restore_delay=0.5, settle_ms=50.0):
+        self.controller = controller
+        self.restore = restore
+        self.restore_delay = restore_delay # Time the target app gets to read the clipboard
+        # The target app pastes asynchronously after the shortcut, so inject() returns before the text
+        # has arrived; this fixed cost is charged on top of the measured copy and keypress
+        self.settle_ms = settle_ms
+        self._lock = threading.Lock()
+        self._pending_restore = None # (timer, clipboard contents from before our first paste)
+
+    def available(self):
+        return True
+
+    def inject(self, text):
+        import pyperclip
+        from pynput import keyboard
+        previous = self._take_previous() if self.restore else None
+        pyperclip.copy(text)
+        modifier = keyboard.Key.cmd if sys.platform == "darwin" else keyboard.Key.ctrl_l
+        with self.controller.pressed(modifier):
+            self.controller.press("v")
+            self.controller.release("v")
+        if previous is not None and previous != text:
+            timer = threading.Timer(self.restore_delay, self._restore, args=(text,))
+            timer.daemon = True
+            with self._lock:
+                self._pending_restore = (timer, previous)
+            timer.start()
+
+    def _take_previous(self):
+        """Returns the clipboard to restore later, keeping the original one across back-to-back pastes."""
+        import pyperclip
+        with self._lock:
+            pending, self._pending_restore = self._pending_restore, None
+        if pending:
+            pending[0].cancel()
+            return pending[1]
+        try:
+            return pyperclip.paste()
+        except pyperclip.PyperclipException:
+            return None
+
+    def _restore(self, text):
+        import pyperclip
+        with self._lock:
+            pending, self._pending_restore = self._pending_restore, None
+        if pending is None:
+            return # Superseded by a newer paste
+        try:
+            if pyperclip.paste() == text: # Leave it alone if the user copied something meanwhile
+                pyperclip.copy(pending[1])
+        except pyperclip.PyperclipException as e:
+            print(f"WARNING: Could not restore the clipboard: {e}", flush=True)
+
+
+class TypingInjector:
+    """Types the text as individual synthetic key presses."""
+
+    name = "type"
+
+    def __init__(self, controller):
+        self.controller = controller
+
+    def available(self):
+        return True
+
+    def inject(self, text):
+        self.controller.type(text)
+
+
+class BatchedTypingInjector:
+    """Sends the whole text as a single batch of Unicode key events.
+
+    Uses SendInput, which queues every event in one call; other platforms have
+    no equivalent API, so the backend is only available on Windows.
+    """
+
+    name = "type_batched"
+
+    def available(self):
+        return sys.platform == "win32"
+
+    def inject(self, text):
+        _send_unicode_input(text)
+
+
+def _send_unicode_input(text):
+    import ctypes
+    from ctypes import wintypes
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_UNICODE = 0x0004
+
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+    class MOUSEINPUT(ctypes.Structure): # Only here so the union has the size SendInput expects
+        _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+    class INPUT(ctypes.Structure):
+        class _EVENT(ctypes.Union):
+            _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+        _anonymous_ = ("event",)
+        _fields_ = [("type", wintypes.DWORD), ("event", _EVENT)]
+
+    units = memoryview(text.encode("utf-16-le")).cast("H") # SendInput takes UTF-16 code units
+    events = (INPUT * (2 * len(units)))()
+    for i, unit in enumerate(units):
+        for j, flags in enumerate((KEYEVENTF_UNICODE, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP)):
+            event = events[2 * i + j]
+            event.type = INPUT_KEYBOARD
+            event.ki.wScan = unit
+            event.ki.dwFlags = flags
+    sent = ctypes.windll.user32.SendInput(len(events), events, ctypes.sizeof(INPUT))
+    if sent != len(events):
+        raise OSError(f"SendInput delivered {sent} of {len(events)} key events.")
+
+
+# Rough starting costs per backend, in (fixed ms, ms per character); refined from measurements.
+# With these, texts up to about eight characters are typed and longer ones pasted.
+COST_PRIORS = {
+    "clipboard": (50.0, 0.0), # Mostly the asynchronous paste in the target app, see ClipboardInjector.settle_ms
+    "type": (1.0, 6.0),
+    "type_batched": (2.0, 0.2),
+}
+
+class InjectionCostModel:
+    """Predicts injection time as overhead + per-character cost from recent measurements.
+
+    An exponentially weighted least-squares fit over (characters, ms) pairs,
+    seeded with two pseudo-measurements taken from the prior so that it gives
+    sensible answers before any real data, and fades old measurements out.
+    """
+
+    def __init__(self, overhead_ms, per_char_ms, decay=0.95):
+        self.decay = decay
+        self._w = self._sx = self._sy = self._sxx = self._sxy = 0.0
+        for length in (0, 100):
+            self.add(length, overhead_ms + per_char_ms * length)
+
+    def add(self, length, elapsed_ms):
+        self._w = self._w * self.decay + 1
+        self._sx = self._sx * self.decay + length
+        self._sy = self._sy * self.decay + elapsed_ms
+        self._sxx = self._sxx * self.decay + length * length
+        self._sxy = self._sxy * self.decay + length * elapsed_ms
+
+    def coefficients(self):
+        """Returns (overhead_ms, per_char_ms)."""
+        denominator = self._w * self._sxx - self._sx * self._sx
+        per_char = (self._w * self._sxy - self._sx * self._sy) / denominator if denominator > 1e-9 else 0.0
+        per_char = max(per_char, 0.0)
+        return max((self._sy - per_char * self._sx) / self._w, 0.0), per_char
+
+    def estimate(self, length):
+        overhead, per_char = self.coefficients()
+        return overhead + per_char * length
+
+
+class TextInjector:
+    """Injects text into the focused window with the backend expected to be fastest for its length.
+
+    Each backend's measured injection times feed an InjectionCostModel, and
+    every text goes to the backend with the lowest predicted time for its
+    length. A backend whose work finishes after inject() returns declares
+    that time as settle_ms, which is added to each measurement. A backend
+    that raises is marked unreliable for the rest of the session and the text
+    is retried with the next best one.
+    """
+
+    def __init__(self, mode="auto", restore_clipboard=True, backends=None, history_size=200):
+        if backends is None:
+            from pynput import keyboard
+            controller = keyboard.Controller() # One shared controller instead of one per paste
+            backends = [ClipboardInjector(controller, restore=restore_clipboard), TypingInjector(controller),
+                        BatchedTypingInjector()]
+        self.backends = {backend.name: backend for backend in backends if backend.available()}
+        self.mode = mode # "auto" or the name of a backend to always use
+        self.costs = {name: InjectionCostModel(*COST_PRIORS.get(name, (10.0, 1.0))) for name in self.backends}
+        self.failed = set()
+        self.measurements = deque(maxlen=history_size) # (backend, characters, ms)
+        self._lock = threading.Lock()
+
+    def estimate_ms(self, name, length):
+        return self.costs[name].estimate(length)
+
+    def choose(self, text):
+        """Returns the name of the backend to use for the text."""
+        candidates = [name for name in self.backends if name not in self.failed]
+        if not candidates:
+            raise RuntimeError("No text injection backend is working.")
+        if self.mode in candidates:
+            return self.mode
+        with self._lock:
+            return min(candidates, key=lambda name: self.estimate_ms(name, len(text)))
+
+    def inject(self, text):
+        """Injects the text and returns the name of the backend that did it."""
+        name = self.choose(text)
+        backend = self.backends[name]
+        start = time.perf_counter()
+        try:
+            backend.inject(text)
+        except Exception as e:
+            print(f"ERROR: Text injection via '{name}' failed, trying another method: {e}", flush=True)
+            self.failed.add(name)
+            return self.inject(text)
+        elapsed_ms = (time.perf_counter() - start) * 1000 + getattr(backend, "settle_ms", 0.0)
+        self._record(name, len(text), elapsed_ms)
+        return name
+
+    def _record(self, name, length, elapsed_ms):
+        with self._lock:
+            self.measurements.append((name, length, elapsed_ms))
+            self.costs[name].add(length, elapsed_ms)
+
+    def stats(self):
+        """Returns the average measured time per character count for each backend."""
+        with self._lock:
+            measurements = list(self.measurements)
+        stats = {}
+        for name in self.backends:
+            samples = [(length, ms) for backend, length, ms in measurements if backend == name]
+            if samples:
+                stats[name] = {"count": len(samples), "avg_ms": sum(ms for _, ms in samples) / len(samples),
+                               "avg_chars": sum(length for length, _ in samples) / len(samples)}
+        return stats
+
+
+_default_injector = None
+
+def default_injector():
+    """Returns the shared TextInjector used by hotkey.paste_text."""
+    global _default_injector
+    if _default_injector is None:
+        _default_injector = TextInjector()
+    return _default_injector
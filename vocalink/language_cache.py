@@ -0,0 +1,42 @@
+import threading
+import time
+
+class LanguageCache:
+    """Remembers the language Whisper detected for transcription_language="auto".
+
+    A detection is only kept when Whisper is confident about it. Later decodes
+    reuse it and skip the detection pass, until it expires after ttl_seconds or
+    a decode in that language scores a low average log-probability, which
+    usually means the speaker switched languages.
+    """
+
+    def __init__(self, ttl_seconds=600, min_probability=0.8, min_avg_logprob=-1.0):
+        self.ttl_seconds = ttl_seconds
+        self.min_probability = min_probability
+        self.min_avg_logprob = min_avg_logprob
+        self._language = None
+        self._detected_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Returns the cached language, or None if a detection pass is needed."""
+        with self._lock:
+            if self._language is not None and time.monotonic() - self._detected_at > self.ttl_seconds:
+                self._language = None
+            return self._language
+
+    def update(self, language, probability):
+        """Records a detection result; unconfident detections are not cached."""
+        with self._lock:
+            if probability >= self.min_probability:
+                self._language = language
+                self._detected_at = time.monotonic()
+
+    def confirms(self, segments):
+        """Returns False if segments decoded in the cached language look wrong."""
+        logprobs = [segment.avg_logprob for segment in segments if getattr(segment, "avg_logprob", None) is not None]
+        return not logprobs or sum(logprobs) / len(logprobs) >= self.min_avg_logprob
+
+    def clear(self):
+        with self._lock:
+            self._language = None
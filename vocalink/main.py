@@ -1,55 +1,254 @@
 import sys
 import os
-import time
 import threading
-import subprocess # Import subprocess
-import pyaudio # Re-add pyaudio import
+from contextlib import nullcontext
+from vocalink.config import load_config, get_app_dir
+from vocalink.profiling import StartupProfiler
 
+CONFIG_PATH = "config.json" # Same file the settings window saves to; watched for edits while running
 
+# Heavy modules (faster-whisper, customtkinter, pystray, PIL, the GUI) are imported
+# lazily, so the tray icon and hotkey come up before the Whisper model is loaded.
 
-import pystray
-from PIL import Image, ImageDraw
-import wave # Re-add wave import
-from vocalink.config import AppConfig, load_config
-from vocalink.audio import AudioRecorder
-from vocalink.transcriber import Transcriber
-from vocalink.hotkey import HotkeyManager, paste_text
-from vocalink.gui import SettingsWindow
-from vocalink.overlay import RecordingOverlay
-from vocalink.localization import LocalizationManager
-import customtkinter as ctk # Re-add customtkinter import
-
-class VocalInkApp(ctk.CTk):
+class VocalInkApp:
     """Main application class for VocalInk."""
 
-    def __init__(self):
-        super().__init__() # Initialize CTk parent
-        self.withdraw() # Hide the main window
-        self.config = load_config()
-        self.recorder = AudioRecorder()
-        self.transcriber = Transcriber(configured_model_size=self.config.model_size, language=self.config.transcription_language)
-        self.hotkey_manager = HotkeyManager(
-            self.config.hotkey,
-            self.start_recording,
-            self.stop_and_transcribe,
-        )
-        self.tray_icon = self._create_tray_icon()
+    def __init__(self, profiler=None):
+        self.profiler = profiler or StartupProfiler()
+        with self.profiler.phase("load config"):
+            self.config = load_config(CONFIG_PATH)
+            self.applied_config = self.config.model_copy(deep=True) # What the running components were set up with
+            from vocalink.localization import LocalizationManager
+            self.localization_manager = LocalizationManager(self.config.interface_language) # Initialize localization manager
         self.settings_window = None
-        self.overlay = RecordingOverlay(self) # Initialize the overlay
-        self.animation_process = None # Placeholder for the animation process
-        self.last_recorded_audio_path = None # Store path to last recorded audio
-        self.localization_manager = LocalizationManager(self.config.interface_language) # Initialize localization manager
-        self.exit_lock = threading.Lock() # Add a lock for exit synchronization
+        self.overlay = None # Tk recording overlay, used when the overlay process cannot start
+        self.tray_icon = None
+        self.overlay_process = None # Persistent animation.py overlay, fed levels by the recorder
+        self.streaming_session = None # Incremental decoder for the current recording
+        self.current_trace = None # Latency trace of the dictation in progress
+        self.injector = None # Text injection backends, created on the first paste
+        self.last_recorded_audio = None # Keep the last recording in memory for replay
+        self.last_recorded_audio_path = None # Path of the last saved WAV or history entry, if any
+        self.exit_lock = threading.Lock() # Serializes start, stop and exit
+
+        with self.profiler.phase("audio recorder"):
+            from vocalink.audio import AudioRecorder
+            self.recorder = AudioRecorder(chunk_size=self.config.audio_chunk_size, max_seconds=self.config.max_recording_seconds,
+                                          preroll_ms=self.config.preroll_ms, vad=self._create_vad(),
+                                          native_rate=self.config.native_rate_capture)
+            from vocalink.devices import DeviceRegistry
+            # Enumerated once; the settings window and every recording use this cached list
+            self.device_registry = DeviceRegistry(self.recorder.p, poll_seconds=self.config.device_poll_seconds,
+                                                  on_change=self._on_devices_changed, in_use=self._open_device_ids)
+            self.auto_mic_id = None # Input picked by the auto-probe when mic_device_id is "auto"
+            if self.config.warm_stream:
+                try:
+                    self.recorder.open_warm_stream(self._mic_index())
+                except Exception as e:
+                    print(f"WARNING: Could not keep the microphone open, recording will open it per press: {e}", flush=True)
+
+        # The model loads on a background thread; dictations made meanwhile wait in the worker queue.
+        with self.profiler.phase("start model load"):
+            from vocalink.models import ModelManager
+            from vocalink.transcriber import Transcriber
+            from vocalink.worker import TranscriptionWorker
+            self.model_manager = ModelManager(memory_budget_mb=self.config.model_cache_mb)
+            from vocalink.language_cache import LanguageCache
+            self.transcriber = Transcriber(configured_model_size=self.config.model_size, language=self.config.transcription_language,
+                                           model_manager=self.model_manager, background=True, on_ready=self._on_model_ready,
+                                           on_error=self._on_model_error,
+                                           profile=self.config.decoding_profile,
+                                           language_cache=LanguageCache(ttl_seconds=self.config.auto_language_ttl_seconds))
+            self._apply_replacement_options()
+            self.transcription_worker = TranscriptionWorker(self.transcriber, self.on_transcription_done)
+            from vocalink.tracing import TraceLog
+            self.trace_log = TraceLog()
+            self.history = self._create_history()
 
         # Start hotkey listener and tray icon immediately
-        self.hotkey_manager.start_listening()
+        with self.profiler.phase("hotkey listener"):
+            from vocalink.hotkey import HotkeyManager
+            self.hotkey_manager = HotkeyManager(
+                self.config.hotkey,
+                self.start_recording,
+                self.stop_and_transcribe,
+                debounce_ms=self.config.hotkey_debounce_ms,
+            )
+            self.hotkey_manager.start_listening()
         print("Starting tray icon in a separate thread.", flush=True)
-        threading.Thread(target=self.tray_icon.run).start() # Run tray icon in non-daemon thread
+        threading.Thread(target=self._run_tray_icon).start() # Run tray icon in non-daemon thread
+
+        with self.profiler.phase("main window"):
+            import customtkinter as ctk
+            self.root = ctk.CTk()
+            self.root.withdraw() # Hide the main window
+
+        # Start the overlay once, hidden; it is only shown and hidden per dictation
+        self._start_overlay_process()
+
+        self.config_watcher = None
+        if self.config.watch_config:
+            from vocalink.config_watcher import ConfigWatcher
+            self.config_watcher = ConfigWatcher(CONFIG_PATH, self.config, self._on_config_file_changed)
+            self.config_watcher.start()
+
+        self.device_registry.start()
+        from vocalink.devices import AUTO_DEVICE
+        if self.config.mic_device_id == AUTO_DEVICE:
+            self._start_microphone_probe()
+
+        from vocalink.calibration import load_calibration
+        if self.config.model_size == "auto" and self.config.auto_calibrate and \
+                load_calibration(self.config.auto_model_max_rtf) is None:
+            threading.Thread(target=self._calibrate_in_background, daemon=True).start()
+
+    def _mic_index(self):
+        """Returns the PortAudio index of the configured microphone, or None for the default input."""
+        from vocalink.devices import AUTO_DEVICE
+        device_id = self.auto_mic_id if self.config.mic_device_id == AUTO_DEVICE else self.config.mic_device_id
+        return self.device_registry.resolve(device_id, self.config.mic_device)
+
+    def _start_microphone_probe(self):
+        """Picks the first input with a live signal on a background thread, then reopens the stream on it."""
+        def probe():
+            device = self.device_registry.probe()
+            if device is None:
+                print("Microphone auto-detect: no input picked up sound; using the default input.", flush=True)
+                return
+            print(f"Microphone auto-detect: using '{device.name}'.", flush=True)
+            self.auto_mic_id = device.id
+            self.after(0, self._apply_stream_settings)
+        threading.Thread(target=probe, daemon=True).start()
+
+    def _open_device_ids(self):
+        """Returns the ID of the microphone the recorder has open, for the registry to skip when polling."""
+        if self.recorder.stream is None:
+            return []
+        device_id = self.device_registry.device_id(self.recorder.stream_device) # None: the default input
+        return [device_id] if device_id else []
+
+    def _on_devices_changed(self, added, removed):
+        """Called on the registry's polling thread when microphones were plugged in or removed."""
+        for device_id in added:
+            print(f"Microphone connected: {device_id}", flush=True)
+        for device_id in removed:
+            print(f"Microphone disconnected: {device_id}", flush=True)
+        self.after(0, self._reload_devices)
+
+    def _reload_devices(self):
+        if self.recorder.recording:
+            self.after(1000, self._reload_devices) # Restarting PortAudio would cut the recording short
+            return
+        self.recorder.reinitialize()
+        self.device_registry.rebind(self.recorder.p)
+        from vocalink.devices import AUTO_DEVICE
+        if self.config.mic_device_id == AUTO_DEVICE:
+            self._start_microphone_probe()
+        self._apply_stream_settings() # Reopens the warm stream, on the configured mic if it just came back
+
+    def _create_history(self):
+        """Returns the dictation archive, or None if history is disabled."""
+        if not self.config.history_enabled:
+            return None
+        from vocalink.history import DictationHistory
+        return DictationHistory(max_entries=self.config.history_max_entries, max_age_days=self.config.history_max_days,
+                                max_mb=self.config.history_max_mb)
+
+    def _create_vad(self):
+        """Returns the silence trimmer for the recorder, or None if trimming is disabled."""
+        if not self.config.trim_silence:
+            return None
+        from vocalink.vad import EnergyVAD
+        return EnergyVAD(threshold_db=self.config.vad_threshold_db, min_speech_ms=self.config.min_speech_ms)
+
+    def _start_overlay_process(self):
+        """Starts the overlay process on a background thread, so startup does not wait for its handshake."""
+        def start():
+            from vocalink.overlay_process import OverlayProcess
+            overlay_process = None
+            try:
+                overlay_process = OverlayProcess(on_unavailable=lambda: self.after(0, self._on_overlay_unavailable))
+                overlay_process.start()
+            except Exception as e:
+                print(f"WARNING: Could not start the recording overlay: {e}", flush=True)
+                if overlay_process:
+                    overlay_process.close() # Releases the shared memory
+                self.after(0, self._create_tk_overlay)
+                return
+            self.overlay_process = overlay_process
+            self.recorder.on_level = overlay_process.set_level
+        threading.Thread(target=start, daemon=True).start()
+
+    def _on_overlay_unavailable(self):
+        """Switches to the Tk overlay once the overlay process crashed and could not be restarted."""
+        overlay_process, self.overlay_process = self.overlay_process, None
+        if overlay_process is None:
+            return
+        self.recorder.on_level = None
+        overlay_process.close()
+        self._create_tk_overlay()
+
+    def _create_tk_overlay(self):
+        """Falls back to the in-process Tk overlay, drawn from the recorder's level history."""
+        from vocalink.overlay import RecordingOverlay
+        try:
+            overlay = RecordingOverlay(self.root, level_source=self.recorder.level_history.snapshot)
+        except Exception as e:
+            print(f"WARNING: Could not create the fallback recording overlay: {e}", flush=True)
+            return
+        overlay.withdraw()
+        self.overlay = overlay
+
+    def mainloop(self):
+        """Runs the Tk event loop on the calling (main) thread."""
+        self.root.after(0, self.profiler.report)
+        self.root.mainloop()
+
+    def after(self, ms, func):
+        """Schedules func on the Tk main thread."""
+        return self.root.after(ms, func)
+
+    def _calibrate_in_background(self):
+        """Picks a model for model_size=auto on first run and switches to it once measured.
+
+        Only models that are already downloaded are measured, so this never downloads anything.
+        """
+        from vocalink.calibration import calibrate, cached_models
+        try:
+            candidates = cached_models()
+            if not candidates:
+                print("Skipping model calibration: no models downloaded yet (run 'vocalink calibrate').", flush=True)
+                return
+            calibration = calibrate(max_rtf=self.config.auto_model_max_rtf, candidates=candidates,
+                                    profile=self.config.decoding_profile, language=self.config.transcription_language,
+                                    history=self.history)
+        except Exception as e:
+            print(f"ERROR: Model calibration failed: {e}", flush=True)
+            return
+        if calibration and self.config.model_size == "auto":
+            self.transcriber.set_model_size("auto", background=True, on_ready=self._on_model_ready,
+                                            on_error=self._on_model_error)
+
+    def _run_tray_icon(self):
+        """Creates the tray icon and runs its event loop; called on the tray thread."""
+        with self.profiler.phase("tray icon"):
+            self.tray_icon = self._create_tray_icon()
+        self.tray_icon.run(setup=self._on_tray_ready)
+
+    def _on_tray_ready(self, icon):
+        icon.visible = True
+        self.profiler.mark("tray icon visible")
+        if self.model_manager.load_error is not None:
+            self._on_model_error(self.model_manager.load_error) # Failed before the icon was up
+        elif self.model_manager.active is None:
+            self._set_tray_loading(True)
         print("Tray icon thread started.", flush=True)
 
     def _create_tray_icon(self):
         """Creates the system tray icon."""
         import importlib.resources
+        import pystray
+        from PIL import Image, ImageDraw
 
         try:
             # Use importlib.resources to get the path to the asset
@@ -60,6 +259,8 @@ class VocalInkApp(ctk.CTk):
             image = Image.new("RGB", (64, 64), "black")
             dc = ImageDraw.Draw(image)
             dc.rectangle([0, 0, 64, 64], fill="black")
+        self.tray_image = image
+        self.tray_loading_image = image.convert("LA").convert("RGBA") # Greyed-out icon while the model loads
 
         menu = pystray.Menu(
             pystray.MenuItem("Settings", self.open_settings),
@@ -67,34 +268,153 @@ class VocalInkApp(ctk.CTk):
         )
         return pystray.Icon("VocalInk", image, "VocalInk", menu)
 
+    def _set_tray_loading(self, loading):
+        """Switches the tray icon between its normal and 'loading model' state."""
+        if self.tray_icon is None:
+            return
+        self.tray_icon.icon = self.tray_loading_image if loading else self.tray_image
+        self.tray_icon.title = "VocalInk (loading model...)" if loading else "VocalInk"
+
+    def _on_model_error(self, error):
+        """Called on the loader thread when a Whisper model failed to load; shows it in the tray."""
+        if self.tray_icon is None:
+            return
+        self.tray_icon.icon = self.tray_image
+        if self.model_manager.active is None:
+            self.tray_icon.title = f"VocalInk (model failed to load: {error})"[:120] # Tooltips are length-limited
+        else:
+            self.tray_icon.title = "VocalInk (could not switch model; see log)"
+
+    def _on_model_ready(self, key):
+        """Called on the loader thread once a Whisper model is active."""
+        self.profiler.mark(f"model '{key[0]}' ready")
+        self._set_tray_loading(False)
+
     def start_recording(self):
         """Starts the audio recording."""
-        print(self.localization_manager.get_string("started_recording"), flush=True)
-        self.recorder.start_recording(self.config.mic_device)
-        # Launch animation.py as a separate process
-        if self.animation_process is None:
-            self.animation_process = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(__file__), 'animation.py')])
+        with self.exit_lock: # The debounced release arrives on a timer thread
+            from vocalink.tracing import DictationTrace
+            trace = DictationTrace() # Timed from the hotkey press
+            print(self.localization_manager.get_string("started_recording"), flush=True)
+            on_chunk = None
+            if self.config.streaming_transcription:
+                from vocalink.streaming import StreamingTranscriber
+                self.streaming_session = StreamingTranscriber(self.transcriber, on_partial=self.on_partial_transcription)
+                on_chunk = self.streaming_session.feed
+            mic_index = self._mic_index()
+            self.recorder.start_recording(mic_index, on_chunk=on_chunk)
+            trace.add("stream_open", self.recorder.timings.get("stream_open_ms"))
+            if mic_index is not None and not self.recorder.warm:
+                self.device_registry.note_open_latency(mic_index, self.recorder.timings.get("stream_open_ms"))
+            self.current_trace = trace
+            overlay_process = self.overlay_process # Replaced on the Tk thread if the process dies for good
+            if overlay_process:
+                overlay_process.show()
+            elif self.overlay:
+                self.after(0, self.overlay.show_overlay) # Tk widgets are only touched on the Tk thread
 
     def stop_and_transcribe(self):
-        """Stops recording, transcribes the audio, and pastes the text."""
+        """Stops recording and queues the audio for transcription without waiting for it."""
         with self.exit_lock:
+            trace, self.current_trace = self.current_trace, None
+            if trace:
+                trace.mark("release")
+                trace.add("recording", trace.events["release"])
             print(self.localization_manager.get_string("stopped_recording"), flush=True)
-            # Terminate the animation process
-            if self.animation_process:
-                self.animation_process.terminate()
-                self.animation_process = None
-            output_filename = "output.wav"
-            self.recorder.stop_recording(output_filename)
-            self.last_recorded_audio_path = output_filename # Store the path
-            try:
-                transcription = self.transcriber.transcribe(output_filename, word_replacements=self.config.word_replacements)
-                print(f"Transcription: {transcription}")
-                if transcription and not transcription.isspace():
-                    paste_text(transcription)
-                else:
-                    print(self.localization_manager.get_string("no_speech_detected"), flush=True)
-            except Exception as e:
-                print(f"ERROR: Failed to transcribe or paste text: {e}", flush=True)
+            overlay_process = self.overlay_process
+            if overlay_process:
+                overlay_process.hide()
+            elif self.overlay:
+                if trace:
+                    trace.attributes["overlay_frames"] = self.overlay.frame_stats() # Render cost while recording
+                self.after(0, self.overlay.hide_overlay)
+            output_filename = None
+            if self.config.save_recordings:
+                output_filename = os.path.join(get_app_dir(), "last_recording.wav")
+            audio = self.recorder.stop_recording(output_filename)
+            if audio is None:
+                return # Recording was never started
+            print(f"Capture timings: {self.recorder.timings}", flush=True)
+            session, self.streaming_session = self.streaming_session, None
+            if not len(audio):
+                # Accidental tap or no speech: skip the model entirely
+                if session:
+                    session.cancel()
+                print(self.localization_manager.get_string("no_speech_detected"), flush=True)
+                return
+            self.last_recorded_audio = audio
+            if trace:
+                trace.add("first_frame", self.recorder.timings.get("start_to_first_frame_ms"))
+                trace.add("resample", self.recorder.timings.get("resample_ms"))
+                trace.add("audio_ready", self.recorder.timings.get("stop_to_audio_ready_ms"))
+                trace.add("vad", self.recorder.timings.get("vad_ms"))
+                trace.attributes["audio_seconds"] = len(audio) / self.recorder.sample_rate
+                trace.attributes["capture_rate"] = self.recorder.capture_rate
+            self.last_recorded_audio_path = output_filename
+            self.transcription_worker.submit(audio=audio, session=session, word_replacements=self.config.word_replacements,
+                                             trace=trace)
+
+    def on_transcription_done(self, job):
+        """Pastes a finished transcription; called on the worker thread in recording order."""
+        print(f"Job {job.job_id}: waited {job.wait_ms:.0f} ms, decoded in {job.decode_ms:.0f} ms, "
+              f"{self.transcription_worker.queue_depth - 1} more queued.", flush=True)
+        if job.error:
+            print(f"ERROR: Failed to transcribe or paste text: {job.error}", flush=True)
+            self._log_trace(job.trace, error=job.error)
+            return
+        try:
+            print(f"Transcription: {job.text}")
+            if job.text and not job.text.isspace():
+                with job.trace.span("paste") if job.trace else nullcontext():
+                    method = self._get_injector().inject(job.text)
+                if job.trace:
+                    job.trace.attributes["injection"] = method
+            else:
+                print(self.localization_manager.get_string("no_speech_detected"), flush=True)
+        except Exception as e:
+            print(f"ERROR: Failed to transcribe or paste text: {e}", flush=True)
+            self._log_trace(job.trace, error=e)
+            return
+        self._log_trace(job.trace)
+        self._add_to_history(job)
+
+    def _add_to_history(self, job):
+        """Archives a finished dictation; runs on the worker thread, after the paste."""
+        history = self.history
+        if history is None or job.audio is None or not job.text or job.text.isspace():
+            return
+        import numpy as np
+        metadata = {"stages": job.trace.stages, "rtf": job.trace.rtf} if job.trace else None
+        try:
+            entry = history.add((job.audio * 32768).astype(np.int16), job.text, sample_rate=self.recorder.sample_rate,
+                                metadata=metadata)
+        except OSError as e:
+            print(f"WARNING: Could not save the dictation to the history: {e}", flush=True)
+            return
+        if entry is not None and job.audio is self.last_recorded_audio:
+            self.last_recorded_audio_path = os.path.join(history.path, entry["file"])
+
+    def _get_injector(self):
+        if self.injector is None:
+            from vocalink.injection import TextInjector
+            self.injector = TextInjector(mode=self.config.text_injection, restore_clipboard=self.config.restore_clipboard)
+        return self.injector
+
+    def _log_trace(self, trace, error=None):
+        """Finishes a dictation trace and appends it to the trace log for `vocalink stats`."""
+        if trace is None:
+            return
+        trace.add("release_to_paste", trace.since("release"))
+        if error is not None:
+            trace.attributes["error"] = str(error)
+        try:
+            self.trace_log.append(trace)
+        except OSError as e:
+            print(f"WARNING: Could not write the latency trace: {e}", flush=True)
+
+    def on_partial_transcription(self, committed, tentative):
+        """Receives partial hypotheses while streaming transcription is active."""
+        print(f"Partial: {committed} [{tentative}]", flush=True)
 
     def open_settings(self):
         """Schedules opening the settings window on the main thread."""
@@ -105,52 +425,71 @@ class VocalInkApp(ctk.CTk):
         if self.settings_window and self.settings_window.winfo_exists():
             self.settings_window.deiconify()
         else:
-            self.settings_window = SettingsWindow(self, self.config, self.apply_settings, self.play_last_recording, self.localization_manager)
+            from vocalink.gui import SettingsWindow
+            self.settings_window = SettingsWindow(self.root, self.config, self.apply_settings, self.play_last_recording, self.localization_manager,
+                                                  device_registry=self.device_registry)
             self.settings_window.protocol("WM_DELETE_WINDOW", self.settings_window.on_closing)
 
     def play_last_recording(self):
-        """Plays the last recorded audio file."""
-        if not self.last_recorded_audio_path or not os.path.exists(self.last_recorded_audio_path):
-            print(self.localization_manager.get_string("no_last_recording"), flush=True)
-            return
+        """Plays the last recorded audio from memory, or the newest dictation in the history."""
+        path = self.last_recorded_audio_path
+        if self.last_recorded_audio is not None and len(self.last_recorded_audio):
+            samples = (self.last_recorded_audio * 32768).astype("<i2")
+        else:
+            entry = self.history.latest() if self.history else None # E.g. right after a restart
+            if entry is None:
+                print(self.localization_manager.get_string("no_last_recording"), flush=True)
+                return
+            samples = self.history.samples(entry) # Memory-mapped, read as it plays
+            path = os.path.join(self.history.path, entry["file"])
 
-        print(self.localization_manager.get_string("playing_recording", self.last_recorded_audio_path), flush=True)
+        print(self.localization_manager.get_string("playing_recording", path or ""), flush=True)
         try:
-            wf = wave.open(self.last_recorded_audio_path, 'rb')
+            import pyaudio
+            pcm = memoryview(samples).cast("B")
             p = pyaudio.PyAudio()
 
-            stream = p.open(format=p.get_format_from_width(wf.getsampwidth()),
-                            channels=wf.getnchannels(),
-                            rate=wf.getframerate(),
+            stream = p.open(format=pyaudio.paInt16,
+                            channels=self.recorder.channels,
+                            rate=self.recorder.sample_rate,
                             output=True)
 
-            data = wf.readframes(1024)
-            while data:
-                stream.write(data)
-                data = wf.readframes(1024)
+            chunk_bytes = 1024 * 2
+            for start in range(0, len(pcm), chunk_bytes):
+                stream.write(pcm[start:start + chunk_bytes].tobytes())
 
             stream.stop_stream()
             stream.close()
             p.terminate()
-            wf.close()
             print(self.localization_manager.get_string("finished_playing"), flush=True)
         except Exception as e:
             print(self.localization_manager.get_string("error_playing_audio", e), flush=True)
 
     def exit_app(self):
         """Exits the application."""
+        # Outside exit_lock: a hotkey callback holds the hotkey lock while it waits for exit_lock,
+        # and stopping the listener may deliver a pending release, which takes exit_lock itself
+        self.hotkey_manager.stop_listening()
         with self.exit_lock:
-            self.hotkey_manager.stop_listening()
-            self.tray_icon.stop()
-            if self.animation_process:
-                self.animation_process.terminate()
-                self.animation_process = None
+            if self.config_watcher:
+                self.config_watcher.stop()
+            self.device_registry.stop()
+            self.transcription_worker.stop(timeout=5)
+            if self.tray_icon:
+                self.tray_icon.stop()
+            if self.overlay_process:
+                self.overlay_process.close()
+                self.overlay_process = None
             self.recorder.close() # Terminate PyAudio instance
             self.cleanup_temp_files() # Clean up temporary files
-            self.destroy() # Destroy the main CTk window
+            self.root.destroy() # Destroy the main CTk window
+
+    def _apply_replacement_options(self):
+        self.transcriber.whole_word_replacements = self.config.replacement_whole_words
+        self.transcriber.ignore_case_replacements = self.config.replacement_ignore_case
 
     def cleanup_temp_files(self):
-        """Cleans up temporary files like output.wav and log.txt."""
+        """Cleans up temporary files like output.wav and log.txt; the dictation history is kept."""
         temp_files = ["output.wav", "log.txt"]
         for file_name in temp_files:
             file_path = os.path.join(os.path.dirname(__file__), '..', file_name)
@@ -161,33 +500,152 @@ class VocalInkApp(ctk.CTk):
                 except Exception as e:
                     print(f"Error cleaning up {file_name}: {e}", flush=True)
 
+    # Settings that need a component reconfigured when they change, and the method that does it.
+    # Everything else (streaming_transcription, save_recordings, word_replacements, ...) is read at its next use.
+    SETTING_HANDLERS = [
+        ({"model_size", "decoding_profile"}, "_apply_model_settings"),
+        ({"transcription_language", "auto_language_ttl_seconds"}, "_apply_language_settings"),
+        ({"word_replacements", "replacement_whole_words", "replacement_ignore_case"}, "_apply_replacement_settings"),
+        ({"hotkey", "hotkey_debounce_ms"}, "_apply_hotkey_settings"),
+        ({"mic_device", "mic_device_id", "warm_stream", "audio_chunk_size", "native_rate_capture"}, "_apply_stream_settings"),
+        ({"mic_device_id"}, "_apply_auto_detect_settings"),
+        ({"device_poll_seconds"}, "_apply_device_poll_settings"),
+        ({"preroll_ms", "max_recording_seconds"}, "_apply_capture_settings"),
+        ({"trim_silence", "vad_threshold_db", "min_speech_ms"}, "_apply_vad_settings"),
+        ({"text_injection", "restore_clipboard"}, "_apply_injection_settings"),
+        ({"model_cache_mb"}, "_apply_cache_settings"),
+        ({"interface_language"}, "_apply_interface_language"),
+        ({"history_enabled", "history_max_entries", "history_max_days", "history_max_mb"}, "_apply_history_settings"),
+    ]
+
     def apply_settings(self):
-        """Applies the updated settings to the running application components."""
-        # Re-initialize transcriber if model size changed or language changed
-        if self.transcriber.configured_model_size != self.config.model_size or self.transcriber.language != self.config.transcription_language:
-            self.transcriber = Transcriber(configured_model_size=self.config.model_size, language=self.config.transcription_language)
-
-        # Re-initialize hotkey manager if hotkey changed
-        if self.hotkey_manager.hotkey_str != self.config.hotkey:
-            self.hotkey_manager.stop_listening()
-            self.hotkey_manager = HotkeyManager(
-                self.config.hotkey,
-                self.start_recording,
-                self.stop_and_transcribe,
-            )
-            self.hotkey_manager.start_listening()
+        """Reconfigures only the components whose settings changed since they were last applied."""
+        from vocalink.config import config_diff
+        changed = set(config_diff(self.applied_config, self.config))
+        if not changed:
+            return
+        for fields, handler in self.SETTING_HANDLERS:
+            if changed & fields:
+                getattr(self, handler)()
+        self.applied_config = self.config.model_copy(deep=True)
+        if self.config_watcher:
+            self.config_watcher.current = self.config.model_copy(deep=True) # Our own save is not an external edit
+        print(self.localization_manager.get_string("settings_applied"), flush=True)
 
-        # Update the tray icon menu if minimize_to_tray setting changes
-        # This part might need more complex logic if the menu itself needs to change dynamically
-        # For now, we'll assume the tray icon's behavior is handled by the main app's exit logic.
+    def _on_config_file_changed(self, new_config, changes):
+        """Called on the watcher thread when the config file was edited on disk."""
+        print(f"Config file changed: {', '.join(sorted(changes))}", flush=True)
 
-        if self.config.interface_language != self.localization_manager.current_language:
-            self.localization_manager.load_translations(self.config.interface_language)
+        def apply():
+            for name in changes:
+                setattr(self.config, name, getattr(new_config, name)) # In place, so an open settings window sees it
+            self.apply_settings()
+        self.after(0, apply)
 
-        print(self.localization_manager.get_string("settings_applied"), flush=True)
+    def _apply_model_settings(self):
+        # Swap in the background; the current model keeps serving meanwhile
+        if self.transcriber.configured_model_size != self.config.model_size:
+            self._set_tray_loading(True)
+            self.transcriber.set_model_size(self.config.model_size, background=True, on_ready=self._on_model_ready,
+                                            on_error=self._on_model_error)
+        if self.transcriber.profile != self.config.decoding_profile:
+            self._set_tray_loading(True)
+            self.transcriber.set_profile(self.config.decoding_profile, background=True, on_ready=self._on_model_ready,
+                                         on_error=self._on_model_error)
+
+    def _apply_language_settings(self):
+        # Only affects decoding options; never reloads the model
+        self.transcriber.language = self.config.transcription_language
+        self.transcriber.language_cache.ttl_seconds = self.config.auto_language_ttl_seconds
+
+    def _apply_replacement_settings(self):
+        from vocalink.replacements import compile_replacements
+        self._apply_replacement_options()
+        # Compile now rather than on the next dictation
+        compile_replacements(self.config.word_replacements, whole_words=self.config.replacement_whole_words,
+                             ignore_case=self.config.replacement_ignore_case)
+
+    def _apply_hotkey_settings(self):
+        from vocalink.hotkey import HotkeyManager
+        self.hotkey_manager.stop_listening()
+        self.hotkey_manager = HotkeyManager(
+            self.config.hotkey,
+            self.start_recording,
+            self.stop_and_transcribe,
+            debounce_ms=self.config.hotkey_debounce_ms,
+        )
+        self.hotkey_manager.start_listening()
+
+    def _apply_capture_settings(self):
+        # Both are picked up without touching the stream
+        self.recorder.max_seconds = self.config.max_recording_seconds
+        self.recorder.set_preroll_ms(self.config.preroll_ms)
+
+    def _apply_stream_settings(self):
+        self.recorder.chunk_size = self.config.audio_chunk_size
+        self.recorder.native_rate = self.config.native_rate_capture
+        if self.recorder.recording:
+            return # The warm stream is reopened by the next recording if the device changed
+        try:
+            if self.config.warm_stream:
+                self.recorder.open_warm_stream(self._mic_index())
+            else:
+                self.recorder.close_warm_stream()
+        except Exception as e:
+            print(f"WARNING: Could not keep the microphone open, recording will open it per press: {e}", flush=True)
+
+    def _apply_auto_detect_settings(self):
+        from vocalink.devices import AUTO_DEVICE
+        self.auto_mic_id = None
+        if self.config.mic_device_id == AUTO_DEVICE:
+            self._start_microphone_probe()
+
+    def _apply_device_poll_settings(self):
+        self.device_registry.stop()
+        self.device_registry.poll_seconds = self.config.device_poll_seconds
+        self.device_registry.start()
+
+    def _apply_history_settings(self):
+        # Tighter limits take effect with the next dictation; disabling keeps the stored ones
+        self.history = self._create_history()
+
+    def _apply_vad_settings(self):
+        self.recorder.vad = self._create_vad()
+
+    def _apply_injection_settings(self):
+        self.injector = None # Recreated with the new settings on the next paste
+
+    def _apply_cache_settings(self):
+        self.model_manager.memory_budget_mb = self.config.model_cache_mb
+
+    def _apply_interface_language(self):
+        self.localization_manager.load_translations(self.config.interface_language)
+
+# Subcommands of the `vocalink` entry point, mapped to the module whose main() implements them
+COMMANDS = {
+    "calibrate": "vocalink.calibration",
+    "devices": "vocalink.devices",
+    "history": "vocalink.history",
+    "stats": "vocalink.tracing",
+    "serve": "vocalink.server",
+    "transcribe": "vocalink.batch",
+}
 
-def run():
-    app = VocalInkApp()
+def run(argv=None):
+    import multiprocessing
+    multiprocessing.freeze_support() # Device scans and calibration run in spawned processes, also from frozen builds
+    args = sys.argv[1:] if argv is None else argv
+    if args and args[0] in COMMANDS:
+        import importlib
+        importlib.import_module(COMMANDS[args[0]]).main(args[1:])
+        return
+    import argparse
+    parser = argparse.ArgumentParser(prog="vocalink", description="Voice input into any text field using hotkey + Whisper.",
+                                     epilog=f"Commands: {', '.join(COMMANDS)} (run 'vocalink <command> --help').")
+    parser.add_argument("--profile-startup", action="store_true", help="Print per-phase import and initialisation timings.")
+    options = parser.parse_args(args)
+    profiler = StartupProfiler(enabled=options.profile_startup)
+    app = VocalInkApp(profiler)
     try:
         app.mainloop() # Start the CustomTkinter mainloop
     except Exception as e:
@@ -0,0 +1,165 @@
+import threading
+from collections import OrderedDict
+
+# Approximate resident memory of each model with int8 weights, in MB.
+MODEL_MEMORY_MB = {
+    "tiny": 100,
+    "base": 180,
+    "small": 500,
+    "medium": 1400,
+    "large": 2900,
+}
+COMPUTE_TYPE_FACTOR = {"int8": 1, "int8_float16": 1, "int8_float32": 1, "float16": 2, "float32": 4}
+
+def estimate_model_mb(model_size, compute_type="int8"):
+    """Returns a rough memory estimate for a model, used for the cache budget."""
+    base = MODEL_MEMORY_MB.get(model_size.split("-")[0].split(".")[0], 1000)
+    return base * COMPUTE_TYPE_FACTOR.get(compute_type, 2)
+
+def load_whisper_model(model_size, device="cpu", compute_type="int8", cpu_threads=0, num_workers=1):
+    """Loads a faster-whisper model. Imported lazily because CTranslate2 is slow to import.
+
+    cpu_threads=0 lets CTranslate2 pick the thread count; num_workers is the
+    number of transcriptions the model can run in parallel.
+    """
+    from faster_whisper import WhisperModel
+    print(f"Initializing Whisper model '{model_size}'. This may involve a one-time download and will take a moment...", flush=True)
+    # Let WhisperModel handle caching in the default system location.
+    # This ensures the model is only downloaded once.
+    model = WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads,
+                         num_workers=num_workers)
+    print("Model loaded successfully.", flush=True)
+    return model
+
+
+def _model_key(model_size, device, compute_type, load_options):
+    return (model_size, device, compute_type) + tuple(sorted(load_options.items()))
+
+
+class ModelManager:
+    """Keeps loaded Whisper models warm and swaps the active one without blocking.
+
+    Models are cached by (size, device, compute_type), followed by any extra
+    load options passed to the loader, and evicted least recently
+    used first once the estimated total exceeds memory_budget_mb. A model
+    requested with background=True is loaded on its own thread while the
+    currently active model keeps serving, and becomes active only once ready.
+    """
+
+    def __init__(self, memory_budget_mb=2048, loader=load_whisper_model):
+        self.memory_budget_mb = memory_budget_mb
+        self.loader = loader
+        self._models = OrderedDict() # key -> model, least recently used first
+        self._lock = threading.RLock()
+        self._active_key = None
+        self._pending_key = None
+        self._ready = threading.Event() # Set once a model is active, or once the first load failed
+        self.load_error = None # Exception from the last failed load, cleared by the next successful one
+
+    def get(self, model_size, device="cpu", compute_type="int8", **load_options):
+        """Returns a cached model, loading it on the calling thread if necessary."""
+        key = _model_key(model_size, device, compute_type, load_options)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+        model = self.loader(model_size, device=device, compute_type=compute_type, **load_options)
+        with self._lock:
+            self._models[key] = model
+            self._evict()
+        return model
+
+    def activate(self, model_size, device="cpu", compute_type="int8", background=False, on_ready=None, on_error=None,
+                 **load_options):
+        """Makes the given model the active one, optionally loading it in the background.
+
+        If the load fails, on_error is called with the exception; when no model
+        was active yet, wait_active() raises it instead of blocking forever.
+        """
+        key = _model_key(model_size, device, compute_type, load_options)
+        with self._lock:
+            if key == self._active_key:
+                self._pending_key = None
+                if on_ready:
+                    on_ready(key)
+                return
+            self._pending_key = key
+            if self._active_key is None:
+                self._ready.clear() # A retry after a failed first load: wait for it again
+
+        def load():
+            try:
+                self.get(model_size, device, compute_type, **load_options)
+            except Exception as e:
+                print(f"ERROR: Failed to load Whisper model '{model_size}': {e}", flush=True)
+                with self._lock:
+                    if self._pending_key != key:
+                        return # Superseded; the newer request reports its own outcome
+                    self._pending_key = None
+                    self.load_error = e
+                    if self._active_key is None:
+                        self._ready.set() # Wake waiters so they see the error
+                if on_error:
+                    on_error(e)
+                if not background:
+                    raise
+                return
+            with self._lock:
+                if self._pending_key != key:
+                    return # Superseded by a newer request while loading
+                self._active_key = key
+                self._pending_key = None
+                self.load_error = None
+                self._ready.set()
+                self._evict() # The previous model may now be evictable
+            if on_ready:
+                on_ready(key)
+
+        if background:
+            threading.Thread(target=load, daemon=True).start()
+        else:
+            load()
+
+    @property
+    def active_key(self):
+        return self._active_key
+
+    @property
+    def loading(self):
+        """True while a requested model is still being loaded."""
+        return self._pending_key is not None
+
+    @property
+    def active(self):
+        """The active model, or None if no model has finished loading yet."""
+        with self._lock:
+            return self._models.get(self._active_key)
+
+    def wait_active(self, timeout=None):
+        """Blocks until a model is active and returns it; raises RuntimeError if loading it failed."""
+        if not self._ready.wait(timeout):
+            raise TimeoutError("No Whisper model finished loading in time.")
+        with self._lock:
+            model = self._models.get(self._active_key)
+            error = self.load_error
+        if model is None:
+            raise RuntimeError(f"The Whisper model failed to load: {error}") from error
+        return model
+
+    def cached_keys(self):
+        with self._lock:
+            return list(self._models)
+
+    def _evict(self):
+        """Drops least recently used models until the cache fits the memory budget."""
+        while len(self._models) > 1:
+            total = sum(estimate_model_mb(key[0], key[2]) for key in self._models)
+            if total <= self.memory_budget_mb:
+                return
+            for key in self._models:
+                if key not in (self._active_key, self._pending_key):
+                    del self._models[key]
+                    print(f"Evicted Whisper model '{key[0]}' from the cache.", flush=True)
+                    break
+            else:
+                return
@@ -1,17 +1,24 @@
 import customtkinter as ctk
-import math
+import numpy as np
 import time
+from collections import deque
 
 class RecordingOverlay(ctk.CTkToplevel):
     """A sleek, always-on-top, pill-shaped overlay with a live waveform animation."""
 
-    def __init__(self, parent):
+    LINE_OFFSETS = np.array([-0.8, -0.4, 0, 0.4, 0.8]) # 5 slightly offset lines for more depth
+    NUM_POINTS = 60 # Points per waveform line
+
+    def __init__(self, parent, level_source=None):
         super().__init__(parent) # Inherit from CTkToplevel
         self.parent = parent
+        self.level_source = level_source # Callable returning recent mic levels (0..1), oldest first
         self.recording_active = False
         self.alpha = 0.0  # Initial transparency
         self.fade_speed = 0.05  # How fast it fades in/out
         self.animation_speed = 50  # Milliseconds per animation frame
+        self._animation_job = None # Pending after() id of the waveform timer, None when stopped
+        self.frame_times = deque(maxlen=200) # Render time of recent frames in ms
 
         # Configure window properties directly on self (the CTkToplevel)
         self.overrideredirect(True)  # Remove window decorations
@@ -36,7 +43,14 @@ class RecordingOverlay(ctk.CTkToplevel):
         # Initial drawing of the pill shape (with shadow)
         self.shadow_id = self.canvas.create_rounded_rectangle(5, 5, self.width + 5, self.height + 5, radius=25, fill="#000000", outline="") # Deeper shadow
         self.pill_id = self.canvas.create_rounded_rectangle(0, 0, self.width, self.height, radius=25, fill="#2C2C2C", outline="") # Refined pill color
-        self.waveform_id = None
+
+        # Waveform lines are created once and only have their coordinates updated per frame
+        self._x = np.linspace(0, self.width, self.NUM_POINTS, endpoint=False)
+        flat = [0, self.height / 2] * self.NUM_POINTS
+        self.waveform_ids = [
+            self.canvas.create_line(*flat, fill="#00FF00", width=2, smooth=True, tags="waveform", state="hidden") # Bright green waveform
+            for _ in self.LINE_OFFSETS
+        ]
 
     def _create_rounded_rectangle_on_canvas(self, x1, y1, x2, y2, radius, **kwargs):
         """Helper to draw a rounded rectangle on the canvas."""
@@ -73,9 +87,12 @@ class RecordingOverlay(ctk.CTkToplevel):
         """Starts showing the overlay and waveform animation."""
         if not self.recording_active:
             self.recording_active = True
+            self.frame_times.clear() # frame_stats() then covers this recording only
             self.deiconify()  # Make the window visible
             self._fade_in()
-            self._animate_waveform()
+            self.canvas.itemconfigure("waveform", state="normal")
+            if self._animation_job is None:
+                self._animate_waveform()
 
     def hide_overlay(self):
         """Starts fading out the overlay."""
@@ -93,52 +110,78 @@ class RecordingOverlay(ctk.CTkToplevel):
 
     def _fade_out(self):
         """Gradually decreases the overlay's transparency."""
+        if self.recording_active:
+            return # Shown again while fading out
         if self.alpha > 0.0:
             self.alpha -= self.fade_speed
             if self.alpha < 0.0: self.alpha = 0.0
             self.attributes('-alpha', self.alpha)
             self.after(20, self._fade_out)
         else:
-            # Ensure waveform is cleared when fully faded out
-            if self.waveform_id: self.canvas.delete(self.waveform_id)
-            self.waveform_id = None
+            # Fully faded out: stop the waveform timer entirely until shown again
+            self._stop_animation()
+            self.canvas.itemconfigure("waveform", state="hidden")
             self.after(100, self.withdraw) # Add a small delay before withdrawing
 
+    def _stop_animation(self):
+        if self._animation_job is not None:
+            self.after_cancel(self._animation_job)
+            self._animation_job = None
+
+    def waveform_points(self, now=None):
+        """Computes the (lines, points) y coordinates of all waveform lines in one vectorized pass."""
+        levels = self.level_source() if self.level_source is not None else np.full(self.NUM_POINTS, 0.5)
+        return waveform_points(levels, time.time() if now is None else now, self.height, self.LINE_OFFSETS, self.NUM_POINTS)
+
     def _animate_waveform(self):
-        """Draws a simulated live red waveform animation."""
+        """Updates the waveform lines in place from the recorder's level history."""
+        self._animation_job = None
         if not self.recording_active and self.alpha <= 0.0:  # Stop animation if not active and faded
-            if self.waveform_id: self.canvas.delete(self.waveform_id)
-            self.waveform_id = None
             return
 
-        self.canvas.delete("waveform")  # Clear previous waveforms using a tag
-
-        points = []
-        center_y = self.height / 2
-        amplitude_base = self.height / 2.5 # Adjusted for new height
-        num_points = 60 # More points for smoother waveform
-        x_step = self.width / num_points
-        current_time = time.time() * 7 # Faster animation for more dynamism
-
-        # Draw multiple lines for a fuller, more organic waveform
-        for line_offset in [-0.8, -0.4, 0, 0.4, 0.8]: # Draw 5 slightly offset lines for more depth
-            points = []
-            amplitude_factor = 1.0 - abs(line_offset) * 0.2 # Reduce amplitude for outer lines
-            amplitude = amplitude_base * amplitude_factor
-
-            for i in range(num_points):
-                x = i * x_step
-                # More complex sine wave with multiple frequencies and a slight random component
-                y = center_y                     + amplitude * math.sin(i * 0.25 + current_time + line_offset * 2.5)                     + (amplitude / 2.5) * math.sin(i * 0.75 + current_time * 1.8 + line_offset * 3.5)                     + (amplitude / 5) * math.sin(i * 1.5 + current_time * 3.0 + line_offset * 5)
-                points.append((x, y))
-
-            # Draw the waveform as a line with a tag
-            if points:
-                self.canvas.create_line(points, fill="#00FF00", width=2, smooth=True, tags="waveform") # Bright green waveform # Bright green waveform
-
-        self.after(self.animation_speed, self._animate_waveform)
+        start = time.perf_counter()
+        ys = self.waveform_points()
+        for item, y in zip(self.waveform_ids, ys):
+            self.canvas.coords(item, np.column_stack((self._x, y)).ravel().tolist())
+        self.frame_times.append((time.perf_counter() - start) * 1000)
+
+        self._animation_job = self.after(self.animation_speed, self._animate_waveform)
+
+    def frame_stats(self):
+        """Returns render time statistics (ms) over recent frames, to track overlay CPU cost."""
+        if not self.frame_times:
+            return {"frames": 0}
+        times = np.array(list(self.frame_times)) # Copied in one step; the Tk thread keeps appending
+        return {
+            "frames": len(times),
+            "mean_ms": float(times.mean()),
+            "p95_ms": float(np.percentile(times, 95)),
+            "max_ms": float(times.max()),
+        }
 
     def destroy(self):
         """Clean up on destroy."""
         self.recording_active = False
-        super().destroy()
\ No newline at end of file
+        self._stop_animation()
+        super().destroy()
+
+
+def resample_levels(levels, num_points):
+    """Returns the mic level envelope resampled to one value per waveform point."""
+    levels = np.asarray(levels, dtype=np.float64)
+    if not len(levels):
+        return np.zeros(num_points)
+    return np.interp(np.linspace(0, len(levels) - 1, num_points), np.arange(len(levels)), levels)
+
+def waveform_points(levels, now, height, line_offsets=RecordingOverlay.LINE_OFFSETS, num_points=RecordingOverlay.NUM_POINTS):
+    """Returns the (lines, points) y coordinates of the waveform for a level history (0..1, oldest first)."""
+    current_time = now * 7 # Faster animation for more dynamism
+    envelope = 0.15 + 0.85 * resample_levels(levels, num_points) # Keep a faint idle ripple when silent
+    amplitude = (height / 2.5) * (1.0 - np.abs(line_offsets) * 0.2)[:, None] # Reduce amplitude for outer lines
+    offsets = line_offsets[:, None]
+    i = np.arange(num_points)[None, :]
+    # Sum of sines with multiple frequencies, shaped by the real level history
+    wave = (np.sin(i * 0.25 + current_time + offsets * 2.5)
+            + np.sin(i * 0.75 + current_time * 1.8 + offsets * 3.5) / 2.5
+            + np.sin(i * 1.5 + current_time * 3.0 + offsets * 5) / 5)
+    return height / 2 + amplitude * envelope[None, :] * wave
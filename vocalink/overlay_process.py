@@ -0,0 +1,135 @@
+import importlib.util
+import os
+import struct
+import subprocess
+import sys
+import threading
+from multiprocessing import shared_memory
+
+LEVEL_FORMAT = "d" # One float64 holding the current microphone level (0..1)
+
+class OverlayProcess:
+    """Long-lived animation.py overlay that is shown and hidden over its stdin pipe.
+
+    The process is started once and reused for every dictation. The microphone
+    level is published through a small shared memory block that the overlay
+    reads each frame, so it never opens a second input stream.
+
+    The overlay reports "ready" on stdout once its window exists; a process
+    that does not (e.g. because PySide6 is missing) marks the overlay
+    unavailable, and it is not started again. A crashed overlay is restarted
+    on a background thread at most max_restarts times; show() and hide()
+    never wait for it. Once the overlay is unavailable, on_unavailable() is
+    called so the caller can fall back to another overlay.
+    """
+
+    def __init__(self, ready_timeout=10.0, max_restarts=1, on_unavailable=None):
+        self._shm = shared_memory.SharedMemory(create=True, size=struct.calcsize(LEVEL_FORMAT))
+        self._lock = threading.Lock()
+        self.process = None
+        self.available = True # False once the overlay failed to start
+        self.ready_timeout = ready_timeout
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self.on_unavailable = on_unavailable
+        self._restarting = False
+        self._closed = False
+        self.set_level(0.0)
+
+    def start(self):
+        """Starts the overlay process (hidden) and waits until it is ready; raises RuntimeError if it cannot start."""
+        with self._lock:
+            if self.process and self.process.poll() is None:
+                return
+            if self._closed:
+                raise RuntimeError("The overlay was closed.")
+            if not self.available:
+                raise RuntimeError("The overlay failed to start earlier.")
+            if importlib.util.find_spec("PySide6") is None:
+                self.available = False
+                raise RuntimeError("PySide6 is not installed.")
+            process = subprocess.Popen(
+                [sys.executable, os.path.join(os.path.dirname(__file__), "animation.py"), "--ipc", self._shm.name],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                bufsize=1, # Line buffered, so each command is delivered immediately
+            )
+            if not self._wait_ready(process):
+                self.available = False
+                if process.poll() is None:
+                    process.terminate()
+                raise RuntimeError(f"The overlay process exited with code {process.poll()} before it was ready.")
+            self.process = process
+
+    def _wait_ready(self, process):
+        """Waits for the "ready" line, without blocking forever on a hung process."""
+        lines = []
+        reader = threading.Thread(target=lambda: lines.append(process.stdout.readline()), daemon=True)
+        reader.start()
+        reader.join(self.ready_timeout)
+        return bool(lines) and lines[0].strip() == "ready"
+
+    def show(self):
+        self._send("show")
+
+    def hide(self):
+        self._send("hide")
+
+    def set_level(self, level):
+        """Publishes the current microphone level; cheap enough to call from the audio callback."""
+        struct.pack_into(LEVEL_FORMAT, self._shm.buf, 0, level)
+
+    def close(self):
+        """Stops the overlay process and releases the shared memory."""
+        with self._lock:
+            self._closed = True # A restart still in progress must not start a new process
+        self._send("quit", restart=False)
+        if self.process:
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.terminate()
+            self.process = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def _send(self, command, restart=True):
+        process = self.process
+        if not process or process.poll() is not None:
+            if restart:
+                self._restart() # This command is dropped; the overlay is back for a later one
+            return
+        try:
+            process.stdin.write(command + "\n")
+            process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as e:
+            print(f"ERROR: Overlay process is not responding: {e}", flush=True)
+
+    def _restart(self):
+        """Restarts a crashed overlay on a background thread, or gives up once max_restarts is used."""
+        with self._lock:
+            if not self.available or self._restarting or self._closed:
+                return
+            give_up = self.restarts >= self.max_restarts
+            if not give_up:
+                self.restarts += 1
+                self._restarting = True
+        if give_up:
+            self._disable("the overlay process keeps exiting.")
+            return
+        threading.Thread(target=self._restart_in_background, daemon=True).start()
+
+    def _restart_in_background(self):
+        try:
+            self.start()
+        except RuntimeError as e:
+            self._disable(e)
+        finally:
+            self._restarting = False
+
+    def _disable(self, reason):
+        self.available = False
+        print(f"WARNING: Recording overlay disabled: {reason}", flush=True)
+        if self.on_unavailable:
+            self.on_unavailable()
@@ -0,0 +1,56 @@
+# Named decoding profiles, selected with AppConfig.decoding_profile.
+#
+# Load options decide how the model is loaded, so changing them loads (or
+# reuses from the cache) a differently configured model. Decode options only
+# affect each transcribe call and can change at any time.
+#
+# Latency and accuracy of each profile depend on the machine, the model size
+# and the speaker, so no figures are hard-coded here. Measure them on your own
+# recordings with the benchmark harness, which reports cold/warm latency, RTF,
+# peak RSS and WER per profile:
+#
+#     python benchmarks/bench_transcriber.py --corpus DIR --models base --profiles fastest,balanced,accurate
+
+LOAD_OPTIONS = ("compute_type", "cpu_threads", "num_workers")
+DECODE_OPTIONS = ("beam_size", "best_of", "temperature", "without_timestamps")
+
+DECODING_PROFILES = {
+    # Greedy decoding, no temperature fallback and no timestamp tokens
+    "fastest": {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": [0.0],
+        "without_timestamps": True,
+        "compute_type": "int8",
+        "cpu_threads": 0, # 0 lets CTranslate2 decide
+        "num_workers": 1,
+    },
+    # Small beam with a short fallback ladder for the occasional hard segment
+    "balanced": {
+        "beam_size": 3,
+        "best_of": 3,
+        "temperature": [0.0, 0.4, 0.8],
+        "without_timestamps": True,
+        "compute_type": "int8",
+        "cpu_threads": 0,
+        "num_workers": 1,
+    },
+    # faster-whisper's own decode defaults on the int8 model, as VocalInk decoded before profiles existed
+    "accurate": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": [0.0, 0.2, 0.4, 0.6, 0.8, 1.0],
+        "without_timestamps": False,
+        "compute_type": "int8",
+        "cpu_threads": 0,
+        "num_workers": 1,
+    },
+}
+DEFAULT_PROFILE = "accurate" # Faster profiles are opt-in until measured on real recordings
+
+def get_profile(name):
+    """Returns the settings of a decoding profile, falling back to the default for unknown names."""
+    if name not in DECODING_PROFILES:
+        print(f"WARNING: Unknown decoding profile '{name}', using '{DEFAULT_PROFILE}'.", flush=True)
+        name = DEFAULT_PROFILE
+    return DECODING_PROFILES[name]
@@ -0,0 +1,55 @@
+import time
+import threading
+from contextlib import contextmanager
+
+class StartupProfiler:
+    """Records how long each startup phase takes, for `vocalink --profile-startup`.
+
+    Phases are timed relative to the creation of the profiler. Events that
+    happen on other threads (tray icon shown, model loaded) can be added with
+    mark() and are printed as they arrive once the main report is out.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.phases = [] # (name, offset_ms, duration_ms)
+        self._reported = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """Times the enclosed block as a named phase."""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, begin, time.perf_counter() - begin)
+
+    def mark(self, name):
+        """Records an instantaneous event, such as the tray icon becoming visible."""
+        self._add(name, time.perf_counter(), 0.0)
+
+    def _add(self, name, begin, duration):
+        entry = (name, (begin - self.start) * 1000, duration * 1000)
+        with self._lock:
+            self.phases.append(entry)
+            late = self._reported
+        if self.enabled and late:
+            self._print(entry)
+
+    def report(self):
+        """Prints every phase recorded so far; later phases are printed as they happen."""
+        if not self.enabled:
+            return
+        with self._lock:
+            phases = list(self.phases)
+            self._reported = True
+        print(f"{'phase':<32} {'start ms':>10} {'took ms':>10}", flush=True)
+        for entry in phases:
+            self._print(entry)
+
+    @staticmethod
+    def _print(entry):
+        name, offset_ms, duration_ms = entry
+        print(f"{name:<32} {offset_ms:>10.1f} {duration_ms:>10.1f}", flush=True)
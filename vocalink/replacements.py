@@ -0,0 +1,86 @@
+import re
+import threading
+
+class WordReplacer:
+    """Applies a word replacement dictionary in a single pass over the text.
+
+    All rules are compiled into one regex shaped like a trie of the keys, so
+    matching costs one linear scan no matter how many rules there are. At each
+    position the longest matching key wins, and replacement text is never
+    matched again, so rules cannot interact.
+    """
+
+    def __init__(self, replacements, whole_words=False, ignore_case=False):
+        self.replacements = dict(replacements)
+        self.whole_words = whole_words
+        self.ignore_case = ignore_case
+        if ignore_case:
+            self._lookup = {old.casefold(): new for old, new in self.replacements.items() if old}
+        else:
+            self._lookup = {old: new for old, new in self.replacements.items() if old}
+        self._regex = None
+        if self._lookup:
+            pattern = _trie_pattern(_build_trie(old for old in self.replacements if old))
+            if whole_words:
+                pattern = rf"(?<!\w)(?:{pattern})(?!\w)"
+            self._regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+
+    def apply(self, text):
+        """Returns the text with every rule applied."""
+        if self._regex is None:
+            return text
+        return self._regex.sub(self._replace, text)
+
+    __call__ = apply
+
+    def _replace(self, match):
+        key = match.group(0)
+        # re.IGNORECASE also matches case variants like 'ſ' for 's'; casefold() maps most of them back to the key
+        return self._lookup.get(key.casefold() if self.ignore_case else key, key)
+
+
+def _build_trie(keys):
+    trie = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[""] = True # End of a key
+    return trie
+
+def _trie_pattern(trie):
+    """Turns a trie into a regex; optional groups are greedy, so longer keys are tried first.
+
+    The trie is walked with an explicit stack, so keys of any length do not hit the recursion limit.
+    """
+    patterns = {}
+    stack = [(trie, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for char, child in node.items() if char)
+            continue
+        alternatives = [re.escape(char) + patterns.pop(id(child)) for char, child in sorted(node.items()) if char]
+        if not alternatives:
+            patterns[id(node)] = ""
+            continue
+        pattern = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+        if "" in node:
+            pattern = "(?:" + pattern + ")?"
+        patterns[id(node)] = pattern
+    return patterns[id(trie)]
+
+_cache_lock = threading.Lock()
+_cached = None
+
+def compile_replacements(replacements, whole_words=False, ignore_case=False):
+    """Returns a WordReplacer for the rules, reusing the previous one while the rules and options are unchanged."""
+    global _cached
+    replacements = replacements or {}
+    with _cache_lock:
+        if (_cached is not None and _cached.whole_words == whole_words
+                and _cached.ignore_case == ignore_case and _cached.replacements == replacements):
+            return _cached
+        _cached = WordReplacer(replacements, whole_words=whole_words, ignore_case=ignore_case)
+        return _cached
@@ -0,0 +1,202 @@
+import io
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+import wave
+import numpy as np
+from vocalink.config import load_config, get_app_dir
+
+# Headless transcription server for `vocalink serve`. Nothing here imports a GUI
+# toolkit, the tray or PyAudio, so the process only holds the warm model.
+#
+# Protocol: every message, in both directions, is one line of JSON, optionally
+# followed by a binary payload of exactly header["length"] bytes. Requests:
+#   {"op": "ping"}                                    -> {"ok": true, "model": ...}
+#   {"op": "transcribe", "format": "pcm"|"wav", "length": N} + audio
+#                                                     -> {"text": ..., "audio_seconds": ..., "decode_ms": ...}
+#   {"op": "stream_start"}                            -> {"ok": true}
+#   {"op": "chunk", "format": "pcm", "length": N} + audio  (no reply; partials arrive as
+#                                                        {"partial": true, "committed": ..., "tentative": ...})
+#   {"op": "stream_end"}                              -> {"text": ..., "final": true}
+# "pcm" is 16 kHz mono 16-bit little-endian samples. Any request may carry
+# "word_replacements" to override the configured ones. Failures reply {"error": ...}.
+
+SOCKET_FILE = "vocalink.sock"
+SAMPLE_RATE = 16000
+
+def default_socket_path():
+    return os.path.join(get_app_dir(), SOCKET_FILE)
+
+def send_message(wfile, header, payload=b""):
+    """Writes one protocol message."""
+    if payload:
+        header = dict(header, length=len(payload))
+    wfile.write(json.dumps(header).encode("utf-8") + b"\n" + payload)
+    wfile.flush()
+
+def read_message(rfile):
+    """Reads one protocol message and returns (header, payload), or None once the peer has closed."""
+    line = rfile.readline()
+    if not line:
+        return None
+    header = json.loads(line)
+    length = header.get("length", 0)
+    payload = rfile.read(length) if length else b""
+    if len(payload) != length:
+        return None # Connection closed mid-payload
+    return header, payload
+
+def decode_audio(payload, audio_format="pcm"):
+    """Converts a request payload into 16 kHz mono float32 samples."""
+    if audio_format == "pcm":
+        return np.frombuffer(payload, dtype="<i2").astype(np.float32) / 32768.0
+    if audio_format == "wav":
+        with wave.open(io.BytesIO(payload), "rb") as wf:
+            if wf.getframerate() != SAMPLE_RATE or wf.getsampwidth() != 2:
+                raise ValueError("WAV audio must be 16 kHz 16-bit.")
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2").astype(np.float32) / 32768.0
+            channels = wf.getnchannels()
+        if channels > 1:
+            samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+        return samples
+    raise ValueError(f"Unsupported audio format '{audio_format}'.")
+
+
+class TranscriptionRequestHandler(socketserver.StreamRequestHandler):
+    """Serves one client connection; a connection can run many requests and one stream at a time."""
+
+    def setup(self):
+        super().setup()
+        self._write_lock = threading.Lock() # Partials are written from the streaming decode thread
+        self.session = None
+
+    def reply(self, header):
+        with self._write_lock:
+            try:
+                send_message(self.wfile, header)
+            except OSError:
+                pass # Client went away; the read loop will notice
+
+    def handle(self):
+        while True:
+            try:
+                message = read_message(self.rfile)
+            except ValueError as e:
+                self.reply({"error": f"Malformed request: {e}"})
+                return
+            if message is None:
+                return
+            header, payload = message
+            try:
+                self.dispatch(header, payload)
+            except Exception as e:
+                self.reply({"error": str(e)})
+
+    def dispatch(self, header, payload):
+        op = header.get("op")
+        transcriber = self.server.transcriber
+        word_replacements = header.get("word_replacements", self.server.word_replacements)
+        if op == "ping":
+            self.reply({"ok": True, "model": transcriber.model_size})
+        elif op == "transcribe":
+            from vocalink.tracing import DictationTrace
+            audio = decode_audio(payload, header.get("format", "pcm"))
+            trace = DictationTrace()
+            text = transcriber.transcribe(audio, word_replacements=word_replacements, trace=trace)
+            self.reply({"text": text, "audio_seconds": len(audio) / SAMPLE_RATE, "decode_ms": trace.stages["decode"]})
+        elif op == "stream_start":
+            from vocalink.streaming import StreamingTranscriber
+            if self.session is not None:
+                self.session.cancel()
+            self.session = StreamingTranscriber(transcriber, on_partial=self._on_partial)
+            self.reply({"ok": True})
+        elif op == "chunk":
+            if self.session is None:
+                raise ValueError("No stream in progress; send stream_start first.")
+            self.session.feed(decode_audio(payload, header.get("format", "pcm")))
+        elif op == "stream_end":
+            if self.session is None:
+                raise ValueError("No stream in progress; send stream_start first.")
+            session, self.session = self.session, None
+            self.reply({"text": session.finish(word_replacements=word_replacements), "final": True})
+        else:
+            raise ValueError(f"Unknown op '{op}'.")
+
+    def _on_partial(self, committed, tentative):
+        self.reply({"partial": True, "committed": committed, "tentative": tentative})
+
+    def finish(self):
+        if self.session is not None:
+            self.session.cancel() # Stop the decode thread of an abandoned stream
+            self.session = None
+        super().finish()
+
+
+class TranscriptionServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix domain socket server sharing one warm Transcriber between all clients."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, transcriber, word_replacements=None):
+        self.transcriber = transcriber
+        self.word_replacements = word_replacements
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, TranscriptionRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.remove(self.server_address)
+        except OSError:
+            pass
+
+
+def _remove_stale_socket(socket_path):
+    """Removes a socket file left behind by a server that is no longer running."""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.remove(socket_path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"Another server is already listening on {socket_path}.")
+
+def main(argv=None):
+    """Entry point for `vocalink serve`."""
+    import argparse
+    parser = argparse.ArgumentParser(prog="vocalink serve", description="Run the transcription engine headless on a Unix domain socket.")
+    parser.add_argument("--socket", default=None, help=f"Socket path (default: {SOCKET_FILE} in the app directory).")
+    parser.add_argument("--model", default=None, help="Model size to serve (default: model_size from the config).")
+    args = parser.parse_args(argv)
+    if not hasattr(socket, "AF_UNIX"):
+        raise SystemExit("vocalink serve needs Unix domain sockets, which this platform does not provide.")
+
+    start = time.perf_counter()
+    from vocalink.calibration import peak_rss_mb
+    from vocalink.models import ModelManager
+    from vocalink.transcriber import Transcriber
+    config = load_config()
+    transcriber = Transcriber(configured_model_size=args.model or config.model_size, language=config.transcription_language,
+                              model_manager=ModelManager(memory_budget_mb=config.model_cache_mb), profile=config.decoding_profile)
+    transcriber.whole_word_replacements = config.replacement_whole_words
+    transcriber.ignore_case_replacements = config.replacement_ignore_case
+    transcriber.model_manager.wait_active() # Load the model before accepting connections
+
+    socket_path = args.socket or default_socket_path()
+    server = TranscriptionServer(socket_path, transcriber, word_replacements=config.word_replacements)
+    rss = peak_rss_mb()
+    print(f"Serving model '{transcriber.model_size}' on {socket_path} "
+          f"(ready in {(time.perf_counter() - start) * 1000:.0f} ms, peak RSS {rss or 0:.0f} MB).", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,157 @@
+import threading
+import time
+from contextlib import nullcontext
+import numpy as np
+
+class StreamingTranscriber:
+    """Transcribes audio incrementally while it is still being recorded.
+
+    Audio is decoded in a sliding window every ``step_seconds``. Words that two
+    consecutive hypotheses agree on are committed and the audio behind them is
+    dropped from the window, so when recording stops only the uncommitted tail
+    has to be decoded.
+    """
+
+    def __init__(self, transcriber, on_partial=None, sample_rate=16000, step_seconds=1.0, max_window_seconds=15.0):
+        self.transcriber = transcriber
+        self.on_partial = on_partial
+        self.sample_rate = sample_rate
+        self.step_samples = int(step_seconds * sample_rate)
+        self.max_window_samples = int(max_window_seconds * sample_rate)
+
+        self.committed_words = []
+        self.tentative_words = []
+        self.decode_ms = 0.0 # Time spent in every window decode so far, including the tail
+
+        self._chunks = []  # Uncommitted audio, as float32 chunks
+        self._undecoded = 0  # Samples fed since the last decode
+        self._lock = threading.Lock()
+        self._decode_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._decode_loop, daemon=True)
+        self._thread.start()
+
+    def feed(self, data):
+        """Adds a chunk of int16 PCM bytes (or a float32 array) to the window."""
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            chunk = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+        else:
+            chunk = np.asarray(data, dtype=np.float32)
+        with self._lock:
+            self._chunks.append(chunk)
+            self._undecoded += len(chunk)
+            if self._undecoded >= self.step_samples:
+                self._wakeup.set()
+
+    def finish(self, word_replacements=None, trace=None):
+        """Stops streaming, decodes the remaining tail and returns the formatted transcript.
+
+        If a DictationTrace is given, the tail decode (the wait after release) is added to it as
+        tail_decode, and the total of all window decodes as decode, so its RTF is comparable to a
+        batch decode of the same audio.
+        """
+        with trace.span("tail_decode") if trace else nullcontext():
+            self._stopping = True
+            self._wakeup.set()
+            self._thread.join()
+            with self._decode_lock:
+                window = self._window()
+                if len(window):
+                    self.committed_words.extend(w.word for w in self._decode(window))
+                self.tentative_words = []
+        if trace:
+            trace.add("decode", self.decode_ms)
+            trace.attributes["streaming"] = True
+        with trace.span("replace") if trace else nullcontext():
+            return self.transcriber.format_text(["".join(self.committed_words)], word_replacements)
+
+    def cancel(self):
+        """Stops streaming without decoding the remaining audio.
+
+        Returns at once: it is called from the hotkey thread, which must not wait for a decode
+        in progress. The daemon decode thread exits after it.
+        """
+        self._stopping = True
+        self._wakeup.set()
+
+    @property
+    def committed_text(self):
+        return "".join(self.committed_words).strip()
+
+    @property
+    def tentative_text(self):
+        return "".join(w.word for w in self.tentative_words).strip()
+
+    def _decode_loop(self):
+        """Decodes the current window each time enough new audio has arrived."""
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stopping:
+                return
+            try:
+                with self._decode_lock:
+                    self._update()
+            except Exception as e:
+                print(f"ERROR: Streaming decode failed: {e}", flush=True)
+
+    def _window(self):
+        """Returns the uncommitted audio as one contiguous array."""
+        with self._lock:
+            if len(self._chunks) > 1:
+                self._chunks = [np.concatenate(self._chunks)]
+            self._undecoded = 0
+            return self._chunks[0] if self._chunks else np.zeros(0, dtype=np.float32)
+
+    def _decode(self, window):
+        """Decodes the window and returns its words, with times relative to the window start."""
+        prompt = "".join(self.committed_words[-30:]).strip() or None
+        start = time.perf_counter()
+        try:
+            segments = self.transcriber.transcribe_segments(window,
+                                                            word_timestamps=True,
+                                                            condition_on_previous_text=False,
+                                                            initial_prompt=prompt)
+        finally:
+            self.decode_ms += (time.perf_counter() - start) * 1000 # Callers hold _decode_lock
+        return [word for segment in segments for word in (segment.words or [])]
+
+    def _update(self):
+        """Decodes the window once and commits the words two hypotheses agree on."""
+        window = self._window()
+        if not len(window):
+            return
+        words = self._decode(window)
+
+        agreed = 0
+        while (agreed < len(words) and agreed < len(self.tentative_words)
+               and _normalize(words[agreed].word) == _normalize(self.tentative_words[agreed].word)):
+            agreed += 1
+
+        # Never let the window grow past its limit: force-commit everything that
+        # ends before the last step, which is the part least likely to change.
+        if len(window) > self.max_window_samples:
+            horizon = (len(window) - self.step_samples) / self.sample_rate
+            while agreed < len(words) and words[agreed].end <= horizon:
+                agreed += 1
+
+        if agreed:
+            self.committed_words.extend(w.word for w in words[:agreed])
+            self._drop(int(words[agreed - 1].end * self.sample_rate))
+        self.tentative_words = words[agreed:]
+
+        if self.on_partial and not self._stopping:
+            self.on_partial(self.committed_text, self.tentative_text)
+
+    def _drop(self, num_samples):
+        """Removes committed audio from the front of the window."""
+        with self._lock:
+            audio = np.concatenate(self._chunks) if self._chunks else np.zeros(0, dtype=np.float32)
+            audio = audio[num_samples:]
+            self._chunks = [audio] if len(audio) else []
+
+
+def _normalize(word):
+    """Normalizes a word for hypothesis comparison."""
+    return word.strip().lower().strip(".,!?;:\"'")
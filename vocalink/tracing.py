@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from vocalink.config import get_app_dir
+
+TRACE_FILE = "traces.jsonl"
+MAX_TRACES = 1000
+# Stages in pipeline order, as reported by `vocalink stats`
+STAGES = ["stream_open", "first_frame", "recording", "resample", "audio_ready", "vad", "queue_wait", "decode", "tail_decode", "replace", "paste", "release_to_paste"]
+
+class DictationTrace:
+    """Timing spans of one dictation, from hotkey press to paste.
+
+    Stage durations are stored in milliseconds under their stage name;
+    events such as the hotkey release are stored as offsets from the press.
+    """
+
+    def __init__(self):
+        self.timestamp = time.time()
+        self._start = time.perf_counter()
+        self.stages = {}
+        self.events = {"press": 0.0}
+        self.attributes = {}
+
+    def mark(self, name):
+        """Records an event at the current time, relative to the hotkey press."""
+        self.events[name] = (time.perf_counter() - self._start) * 1000
+
+    def add(self, stage, duration_ms):
+        """Records a stage duration measured elsewhere (e.g. by the recorder)."""
+        if duration_ms is not None:
+            self.stages[stage] = duration_ms
+
+    @contextmanager
+    def span(self, stage):
+        """Times the enclosed block as a stage."""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[stage] = (time.perf_counter() - begin) * 1000
+
+    def since(self, event):
+        """Milliseconds elapsed since a recorded event."""
+        return (time.perf_counter() - self._start) * 1000 - self.events[event]
+
+    @property
+    def rtf(self):
+        """Decode time divided by audio duration, once both are known."""
+        audio_seconds = self.attributes.get("audio_seconds")
+        if not audio_seconds or "decode" not in self.stages:
+            return None
+        return self.stages["decode"] / 1000 / audio_seconds
+
+    def to_dict(self):
+        return {"timestamp": self.timestamp, "stages": self.stages, "events": self.events, "rtf": self.rtf, **self.attributes}
+
+
+class TraceLog:
+    """Bounded JSONL log of dictation traces.
+
+    Traces are appended one per line; once the file holds twice max_entries
+    lines it is rewritten with only the newest max_entries, so appends stay
+    cheap and the file stays bounded.
+    """
+
+    def __init__(self, path=None, max_entries=MAX_TRACES):
+        self.path = path or os.path.join(get_app_dir(), TRACE_FILE)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._count = None
+
+    def append(self, trace):
+        record = trace.to_dict() if isinstance(trace, DictationTrace) else trace
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            if self._count is None:
+                self._count = len(self._read_lines())
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._count += 1
+            if self._count >= 2 * self.max_entries:
+                self._compact()
+
+    def read(self, last=None):
+        """Returns the most recent traces, oldest first."""
+        with self._lock:
+            lines = self._read_lines()
+        if last is not None:
+            lines = lines[-last:]
+        traces = []
+        for line in lines:
+            try:
+                traces.append(json.loads(line))
+            except ValueError:
+                continue # Skip a line truncated by a crash
+        return traces
+
+    def _read_lines(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return [line for line in f.read().splitlines() if line]
+        except FileNotFoundError:
+            return []
+
+    def _compact(self):
+        lines = self._read_lines()[-self.max_entries:]
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+        os.replace(tmp_path, self.path)
+        self._count = len(lines)
+
+
+def percentile(values, q):
+    """Returns the q-th percentile (0-100) of values using linear interpolation."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def summarize(traces):
+    """Returns {stage: {count, p50, p95, p99}} over the given traces."""
+    summary = {}
+    stages = STAGES + sorted({stage for trace in traces for stage in trace.get("stages", {})} - set(STAGES))
+    for stage in stages + ["rtf"]:
+        if stage == "rtf":
+            values = [trace["rtf"] for trace in traces if trace.get("rtf") is not None]
+        else:
+            values = [trace["stages"][stage] for trace in traces if stage in trace.get("stages", {})]
+        if values:
+            summary[stage] = {"count": len(values), "p50": percentile(values, 50),
+                              "p95": percentile(values, 95), "p99": percentile(values, 99)}
+    return summary
+
+def main(argv=None):
+    """Entry point for `vocalink stats`."""
+    import argparse
+    parser = argparse.ArgumentParser(prog="vocalink stats", description="Summarise per-stage dictation latency over recent sessions.")
+    parser.add_argument("--last", type=int, default=200, help="Number of most recent dictations to include.")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON.")
+    args = parser.parse_args(argv)
+    traces = TraceLog().read(last=args.last)
+    summary = summarize(traces)
+    if args.json:
+        print(json.dumps(summary, indent=4))
+        return
+    if not traces:
+        print("No dictation traces recorded yet.")
+        return
+    print(f"Last {len(traces)} dictations (ms, RTF for rtf):")
+    print(f"{'stage':<18} {'count':>6} {'p50':>10} {'p95':>10} {'p99':>10}")
+    for stage, row in summary.items():
+        print(f"{stage:<18} {row['count']:>6} {row['p50']:>10.1f} {row['p95']:>10.1f} {row['p99']:>10.1f}")
@@ -1,43 +1,116 @@
-
-from faster_whisper import WhisperModel
+from contextlib import nullcontext
+from vocalink.models import ModelManager
+from vocalink.calibration import calibrated_model_size
+from vocalink.replacements import compile_replacements
+from vocalink.profiles import DECODE_OPTIONS, DEFAULT_PROFILE, LOAD_OPTIONS, get_profile
 
 class Transcriber:
     """Transcribes audio using the faster-whisper library."""
 
-    def __init__(self, configured_model_size="auto", language="en"):
+    def __init__(self, configured_model_size="auto", language="en", model_manager=None, background=False, on_ready=None,
+                 profile=DEFAULT_PROFILE, compute_type=None, cpu_threads=None, language_cache=None, on_error=None):
         self.configured_model_size = configured_model_size # Store the configured size
-        self.language = language
+        self.language = language # Only used at decode time; changing it never reloads the model
+        # Detected language reused while language is "auto". Only the desktop app passes one: it serves a single
+        # speaker, while server clients and batch files must not inherit each other's language.
+        self.language_cache = language_cache
+        self.whole_word_replacements = False # Only replace whole words
+        self.ignore_case_replacements = False # Match replacement keys case-insensitively
+        self.model_manager = model_manager or ModelManager()
+        self.profile = profile # Name of the decoding profile, see vocalink.profiles
+        # Explicit load options that take precedence over the profile (e.g. threads per batch worker)
+        self._load_overrides = {key: value for key, value in (("compute_type", compute_type), ("cpu_threads", cpu_threads))
+                                if value is not None}
+        self.model_size = self._resolve_model_size(configured_model_size)
+        self.model_manager.activate(self.model_size, background=background, on_ready=on_ready, on_error=on_error,
+                                    **self._load_options())
+
+    def _load_options(self):
+        settings = get_profile(self.profile)
+        options = {key: settings[key] for key in LOAD_OPTIONS}
+        options.update(self._load_overrides)
+        return options
+
+    def decode_options(self):
+        """Returns the WhisperModel.transcribe options of the current decoding profile."""
+        settings = get_profile(self.profile)
+        return {key: settings[key] for key in DECODE_OPTIONS}
+
+    @staticmethod
+    def _resolve_model_size(configured_model_size):
         if configured_model_size == "auto":
-            self.model_size = "base" # Default to 'base' for auto
-        else:
-            self.model_size = configured_model_size
-        print(f"Initializing Whisper model '{self.model_size}'. This may involve a one-time download and will take a moment...", flush=True)
-        # Let WhisperModel handle caching in the default system location.
-        # This ensures the model is only downloaded once.
-        self.model = WhisperModel(self.model_size, device="cpu", compute_type="int8")
-        print("Model loaded successfully.", flush=True)
-
-    def transcribe(self, audio_path, word_replacements=None):
-        """Transcribes the audio file at the given path, applies word replacements, and formats sentences."""
-        if word_replacements is None:
-            word_replacements = {}
-
-        if self.language == "auto":
-            segments, _ = self.model.transcribe(audio_path, 
-                                                vad_filter=True, 
-                                                vad_parameters=dict(min_silence_duration_ms=500))
-        else:
-            segments, _ = self.model.transcribe(audio_path, language=self.language, 
-                                                vad_filter=True, 
-                                                vad_parameters=dict(min_silence_duration_ms=500))
-        
+            # Use the model picked by `vocalink calibrate` on this machine, or 'base' until then
+            return calibrated_model_size(default="base")
+        return configured_model_size
+
+    @property
+    def model(self):
+        """The active Whisper model, waiting for it if it is still loading."""
+        return self.model_manager.wait_active()
+
+    def set_model_size(self, configured_model_size, background=True, on_ready=None, on_error=None):
+        """Switches to another model; with background=True the current one keeps serving until it is ready."""
+        self.configured_model_size = configured_model_size
+        self.model_size = self._resolve_model_size(configured_model_size)
+        self.model_manager.activate(self.model_size, background=background, on_ready=on_ready, on_error=on_error,
+                                    **self._load_options())
+
+    def set_profile(self, profile, background=True, on_ready=None, on_error=None):
+        """Switches the decoding profile; the model is only reloaded if the profile loads it differently."""
+        self.profile = profile
+        self.model_manager.activate(self.model_size, background=background, on_ready=on_ready, on_error=on_error,
+                                    **self._load_options())
+
+    def transcribe_segments(self, audio, **options):
+        """Runs the model on a file path or float32 array and returns the decoded segments."""
+        if self.language != "auto" or "language" in options:
+            options.setdefault("language", self.language)
+            segments, _ = self.model.transcribe(audio, **options)
+            return list(segments)
+
+        if self.language_cache is None:
+            segments, _ = self.model.transcribe(audio, **options)
+            return list(segments)
+
+        # Reuse the last confident detection and skip Whisper's detection pass
+        cached = self.language_cache.get()
+        if cached is not None:
+            segments = list(self.model.transcribe(audio, language=cached, **options)[0])
+            if self.language_cache.confirms(segments):
+                return segments
+            self.language_cache.clear() # Probably a different language now; detect again
+
+        segments, info = self.model.transcribe(audio, **options)
+        segments = list(segments)
+        self.language_cache.update(info.language, info.language_probability)
+        return segments
+
+    def transcribe(self, audio, word_replacements=None, trace=None):
+        """Transcribes a file path or 16 kHz float32 array, applies word replacements, and formats sentences.
+
+        If a DictationTrace is given, the decode and replacement times are added to it.
+        """
+        with trace.span("decode") if trace else nullcontext():
+            segments = self.transcribe_segments(audio,
+                                                vad_filter=True,
+                                                vad_parameters=dict(min_silence_duration_ms=500),
+                                                **self.decode_options())
+        if trace:
+            trace.attributes["model"] = self.model_size
+            trace.attributes["profile"] = self.profile
+        with trace.span("replace") if trace else nullcontext():
+            return self.format_text([segment.text for segment in segments], word_replacements)
+
+    def format_text(self, texts, word_replacements=None):
+        """Applies word replacements to the given text pieces and joins them into sentences."""
+        # Compiled once per distinct set of rules and applied in a single pass per text piece
+        replace = compile_replacements(word_replacements,
+                                       whole_words=self.whole_word_replacements,
+                                       ignore_case=self.ignore_case_replacements)
+
         transcribed_text = []
-        for segment in segments:
-            text = segment.text
-            # Apply word replacements
-            for old, new in word_replacements.items():
-                text = text.replace(old, new)
-            transcribed_text.append(text.strip())
+        for text in texts:
+            transcribed_text.append(replace(text).strip())
 
         # Join segments and attempt basic sentence formatting (capitalization, punctuation)
         # faster-whisper often handles basic punctuation, but this adds a layer of formatting.
@@ -0,0 +1,46 @@
+import numpy as np
+
+class EnergyVAD:
+    """Finds the spoken part of a recording from short-term frame energy.
+
+    The recording is reshaped into fixed-size frames and reduced in one
+    vectorized pass, so it is cheap enough to run on every recording as it
+    stops. A frame counts as speech when it is louder than threshold_db (dBFS)
+    and also noise_margin_db above the recording's own noise floor; frames
+    louder than loud_db always count, so speech filling the whole recording is
+    not mistaken for noise.
+    """
+
+    def __init__(self, sample_rate=16000, channels=1, frame_ms=30, threshold_db=-50.0, noise_margin_db=10.0,
+                 loud_db=-30.0, padding_ms=250, min_speech_ms=200):
+        self.frame_ms = frame_ms
+        self.frame_samples = max(int(sample_rate * frame_ms / 1000), 1) * channels
+        self.threshold_db = threshold_db
+        self.noise_margin_db = noise_margin_db
+        self.loud_db = loud_db
+        self.padding_samples = int(sample_rate * padding_ms / 1000) * channels # Kept around speech for soft onsets
+        self.min_speech_ms = min_speech_ms
+        self.min_speech_samples = int(sample_rate * min_speech_ms / 1000) * channels
+
+    def frame_energies_db(self, samples):
+        """Returns the energy of each complete frame of int16 samples in dBFS."""
+        count = len(samples) // self.frame_samples
+        frames = samples[:count * self.frame_samples].reshape(count, self.frame_samples)
+        power = np.mean(np.square(frames, dtype=np.float32), axis=1) / (32768.0 ** 2)
+        return 10 * np.log10(power + 1e-10)
+
+    def speech_bounds(self, samples):
+        """Returns (start, end) sample indices around the speech, or None if there is too little of it."""
+        if len(samples) < self.min_speech_samples:
+            return None # Accidental tap; not worth looking at
+        energies = self.frame_energies_db(samples)
+        if not len(energies):
+            return None
+        noise_floor = np.percentile(energies, 10)
+        speech = energies > max(self.threshold_db, min(noise_floor + self.noise_margin_db, self.loud_db))
+        if np.count_nonzero(speech) * self.frame_ms < self.min_speech_ms:
+            return None
+        frames = np.flatnonzero(speech)
+        start = max(int(frames[0]) * self.frame_samples - self.padding_samples, 0)
+        end = min((int(frames[-1]) + 1) * self.frame_samples + self.padding_samples, len(samples))
+        return start, end
@@ -0,0 +1,106 @@
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+
+class TranscriptionJob:
+    """A captured recording waiting to be transcribed."""
+
+    def __init__(self, job_id, audio=None, session=None, word_replacements=None, trace=None):
+        self.job_id = job_id
+        self.audio = audio # Float32 audio to decode in one pass
+        self.session = session # Or a StreamingTranscriber that only needs finishing
+        self.word_replacements = word_replacements
+        self.trace = trace # Optional DictationTrace that decode timings are added to
+        self.text = None
+        self.error = None
+        self.enqueued_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def wait_ms(self):
+        """Time spent in the queue before decoding started."""
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.enqueued_at) * 1000
+
+    @property
+    def decode_ms(self):
+        """Time spent decoding."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at) * 1000
+
+
+class TranscriptionWorker:
+    """Transcribes queued recordings on a background thread.
+
+    Jobs are decoded one at a time in submission order, so results are
+    delivered to on_result in the same order the recordings were made, while
+    the caller is free to start the next recording immediately.
+    """
+
+    def __init__(self, transcriber, on_result, history_size=100):
+        self.transcriber = transcriber
+        self.on_result = on_result
+        self.completed = deque(maxlen=history_size) # Recently finished jobs, for stats
+        self._queue = queue.Queue()
+        self._ids = itertools.count(1)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, audio=None, session=None, word_replacements=None, trace=None):
+        """Queues a recording for transcription and returns its job without waiting."""
+        job = TranscriptionJob(next(self._ids), audio=audio, session=session, word_replacements=word_replacements, trace=trace)
+        self._queue.put(job)
+        return job
+
+    @property
+    def queue_depth(self):
+        """Number of jobs waiting or being decoded."""
+        return self._queue.unfinished_tasks
+
+    def stats(self):
+        """Returns queue depth and average wait/decode times over recent jobs."""
+        jobs = list(self.completed)
+        stats = {"queue_depth": self.queue_depth, "completed": len(jobs)}
+        if jobs:
+            stats["avg_wait_ms"] = sum(job.wait_ms for job in jobs) / len(jobs)
+            stats["avg_decode_ms"] = sum(job.decode_ms for job in jobs) / len(jobs)
+        return stats
+
+    def stop(self, timeout=None):
+        """Stops the worker after the jobs already queued have finished."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._process(job)
+            finally:
+                self._queue.task_done()
+
+    def _process(self, job):
+        job.started_at = time.perf_counter()
+        if job.trace is not None:
+            job.trace.add("queue_wait", job.wait_ms)
+        try:
+            if job.session is not None:
+                job.text = job.session.finish(word_replacements=job.word_replacements, trace=job.trace)
+            else:
+                job.text = self.transcriber.transcribe(job.audio, word_replacements=job.word_replacements, trace=job.trace)
+        except Exception as e:
+            job.error = e
+        job.finished_at = time.perf_counter()
+        self.completed.append(job)
+        try:
+            self.on_result(job)
+        except Exception as e:
+            print(f"ERROR: Transcription result handler failed: {e}", flush=True)
+        job.audio = job.session = None # Release the audio once the result is delivered